@@ -0,0 +1,37 @@
+"""add mission submission resource usage
+
+Revision ID: 30422c2689b4
+Revises: 64d5cb90fb93
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '30422c2689b4'
+down_revision: Union[str, None] = '64d5cb90fb93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('mission_submissions', sa.Column('cpu_time_ms', sa.Float(), nullable=True))
+    op.add_column('mission_submissions', sa.Column('wall_time_ms', sa.Float(), nullable=True))
+    op.add_column('mission_submissions', sa.Column('peak_memory_kb', sa.Integer(), nullable=True))
+    op.add_column('mission_submissions', sa.Column('test_case_timings', sa.JSON(), nullable=True))
+    op.add_column(
+        'mission_submissions',
+        sa.Column('verdict_cached', sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('mission_submissions', 'verdict_cached')
+    op.drop_column('mission_submissions', 'test_case_timings')
+    op.drop_column('mission_submissions', 'peak_memory_kb')
+    op.drop_column('mission_submissions', 'wall_time_ms')
+    op.drop_column('mission_submissions', 'cpu_time_ms')
@@ -0,0 +1,54 @@
+"""add composite lookup indexes
+
+Revision ID: 5d2f8c1e7a94
+Revises: 9b1e4d7c2a53
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8c1e7a94'
+down_revision: Union[str, None] = '9b1e4d7c2a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 사용자별로 한 행만 있어야 하는 조합은 유니크 인덱스로 만듭니다.
+UNIQUE_INDEXES = [
+    ('ix_enrollments_user_id_course_id', 'enrollments', ['user_id', 'course_id']),
+    ('ix_lesson_progress_user_id_lesson_id', 'lesson_progress', ['user_id', 'lesson_id']),
+    ('ix_certificates_user_id_course_id', 'certificates', ['user_id', 'course_id']),
+]
+
+
+def _check_duplicates(table: str, columns) -> None:
+    # 중복 행을 임의로 지우지 않고, 정리가 필요하다는 것을 알리고 멈춥니다.
+    column_list = ', '.join(columns)
+    duplicate = op.get_bind().execute(sa.text(
+        f'SELECT {column_list} FROM {table} GROUP BY {column_list} HAVING COUNT(*) > 1 LIMIT 1'
+    )).first()
+    if duplicate is not None:
+        raise RuntimeError(
+            f'{table} has duplicate rows for ({column_list}) = {tuple(duplicate)}; '
+            'remove them before creating the unique index'
+        )
+
+
+def upgrade() -> None:
+    for name, table, columns in UNIQUE_INDEXES:
+        _check_duplicates(table, columns)
+        op.create_index(name, table, columns, unique=True)
+    op.create_index(
+        'ix_payments_user_id_created_at', 'payments', ['user_id', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payments_user_id_created_at', table_name='payments')
+    for name, table, _ in reversed(UNIQUE_INDEXES):
+        op.drop_index(name, table_name=table)
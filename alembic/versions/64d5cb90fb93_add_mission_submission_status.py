@@ -0,0 +1,29 @@
+"""add mission submission status
+
+Revision ID: 64d5cb90fb93
+Revises: 6fa96a78ff2c
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '64d5cb90fb93'
+down_revision: Union[str, None] = '6fa96a78ff2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'mission_submissions',
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='completed'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('mission_submissions', 'status')
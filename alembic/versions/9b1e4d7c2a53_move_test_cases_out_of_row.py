@@ -0,0 +1,113 @@
+"""move test cases out of row
+
+Revision ID: 9b1e4d7c2a53
+Revises: 30422c2689b4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e4d7c2a53'
+down_revision: Union[str, None] = '30422c2689b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+code_submission_missions = sa.table(
+    'code_submission_missions',
+    sa.column('id', sa.Integer),
+    sa.column('test_cases', sa.JSON),
+    sa.column('test_cases_hash', sa.String),
+    sa.column('test_case_count', sa.Integer),
+)
+
+mission_test_cases = sa.table(
+    'mission_test_cases',
+    sa.column('suite_hash', sa.String),
+    sa.column('position', sa.Integer),
+    sa.column('input', sa.String),
+    sa.column('expected_output', sa.String),
+)
+
+
+def _suite_hash(test_cases) -> str:
+    # app.core.verdict_cache.test_cases_version 과 같은 방식으로 계산해야 채점 캐시 키가 이어집니다.
+    payload = json.dumps(test_cases, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.create_table(
+        'mission_test_cases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('suite_hash', sa.String(length=64), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('input', sa.String(), nullable=False),
+        sa.Column('expected_output', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('suite_hash', 'position'),
+    )
+    op.create_index(op.f('ix_mission_test_cases_id'), 'mission_test_cases', ['id'], unique=False)
+    op.add_column('code_submission_missions', sa.Column('test_cases_hash', sa.String(length=64), nullable=True))
+    op.add_column(
+        'code_submission_missions',
+        sa.Column('test_case_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    conn = op.get_bind()
+    stored = set()
+    for row in conn.execute(sa.select(code_submission_missions.c.id, code_submission_missions.c.test_cases)):
+        test_cases = [
+            {"input": str(case["input"]), "expected_output": str(case["expected_output"])}
+            for case in row.test_cases or []
+        ]
+        suite_hash = _suite_hash(test_cases)
+        if suite_hash not in stored and test_cases:
+            conn.execute(
+                mission_test_cases.insert(),
+                [
+                    {"suite_hash": suite_hash, "position": position, **case}
+                    for position, case in enumerate(test_cases)
+                ],
+            )
+        stored.add(suite_hash)
+        conn.execute(
+            code_submission_missions.update()
+            .where(code_submission_missions.c.id == row.id)
+            .values(test_cases_hash=suite_hash, test_case_count=len(test_cases))
+        )
+
+    with op.batch_alter_table('code_submission_missions') as batch_op:
+        batch_op.alter_column('test_cases_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.drop_column('test_cases')
+
+
+def downgrade() -> None:
+    op.add_column('code_submission_missions', sa.Column('test_cases', sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    for row in conn.execute(sa.select(code_submission_missions.c.id, code_submission_missions.c.test_cases_hash)):
+        cases = conn.execute(
+            sa.select(mission_test_cases.c.input, mission_test_cases.c.expected_output)
+            .where(mission_test_cases.c.suite_hash == row.test_cases_hash)
+            .order_by(mission_test_cases.c.position)
+        )
+        conn.execute(
+            code_submission_missions.update()
+            .where(code_submission_missions.c.id == row.id)
+            .values(test_cases=[{"input": case.input, "expected_output": case.expected_output} for case in cases])
+        )
+
+    with op.batch_alter_table('code_submission_missions') as batch_op:
+        batch_op.alter_column('test_cases', existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column('test_case_count')
+        batch_op.drop_column('test_cases_hash')
+    op.drop_index(op.f('ix_mission_test_cases_id'), table_name='mission_test_cases')
+    op.drop_table('mission_test_cases')
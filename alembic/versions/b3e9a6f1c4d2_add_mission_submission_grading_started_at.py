@@ -0,0 +1,29 @@
+"""add mission submission grading_started_at
+
+Revision ID: b3e9a6f1c4d2
+Revises: 5d2f8c1e7a94
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e9a6f1c4d2'
+down_revision: Union[str, None] = '5d2f8c1e7a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'mission_submissions',
+        sa.Column('grading_started_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('mission_submissions', 'grading_started_at')
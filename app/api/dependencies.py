@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from typing import Annotated, Optional
@@ -8,7 +8,12 @@ from ..db.session import get_async_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..schemas import user_schema
 from ..core.security import is_token_blacklisted
+from ..core.principal_cache import principal_cache
+from ..core.token_versions import token_versions
+from ..core.session_store import session_store
+from ..core.token_cache import verified_tokens
 from sqlalchemy.future import select
+import hmac
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
@@ -19,31 +24,37 @@ async def get_current_user(
     token: str = Depends(security.oauth2_scheme),
     db: AsyncSession = Depends(get_async_db),
 ):
-    logger.debug(f"Received token: {token}")
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="유효하지 않은 인증 정보입니다.",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, config.settings.SECRET_KEY, algorithms=[config.settings.ALGORITHM]
-        )
-        logger.debug(f"Decoded payload: {payload}")
+        payload = verified_tokens.decode(token)
         username: Optional[str] = payload.get("sub")
         jti: Optional[str] = payload.get("jti")
         if username is None:
             logger.error("Username not found in token")
             raise credentials_exception
-        if jti is not None and is_token_blacklisted(jti):
+        if jti is not None and await is_token_blacklisted(jti):
             logger.error("Token is blacklisted")
             raise credentials_exception
         token_data = user_schema.TokenData(username=username)
     except JWTError as e:
         logger.error(f"JWT Error: {str(e)}")
         raise credentials_exception
+    if not await _token_version_is_current(payload):
+        logger.error("Token version is outdated")
+        raise credentials_exception
+    if "sid" in payload and await session_store.is_revoked(payload["sid"]):
+        logger.error("Token session is revoked")
+        raise credentials_exception
+
+    user = await principal_cache.get(token_data.username)
+    if user is not None:
+        return user
 
-    logger.debug(f"Looking up user: {username}")
+    logger.debug("Looking up user: %s", username)
     async with db as session:
         query = select(User).filter(User.username == token_data.username)
         result = await session.execute(query)
@@ -52,7 +63,8 @@ async def get_current_user(
     if user is None:
         logger.error(f"User not found: {username}")
         raise credentials_exception
-    logger.debug(f"User authenticated: {username}")
+    await principal_cache.set(user)
+    logger.debug("User authenticated: %s", username)
     return user
 
 
@@ -65,10 +77,78 @@ async def get_current_active_user(
     return current_user
 
 
-async def admin_required(current_user: User = Depends(get_current_active_user)) -> User:
+async def _token_version_is_current(payload: dict) -> bool:
+    if "uid" not in payload or "ver" not in payload:
+        return True
+    return payload["ver"] >= await token_versions.get(payload["uid"])
+
+
+async def get_current_principal(
+    token: str = Depends(security.oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> user_schema.Principal:
+    """토큰 클레임만으로 인증 주체를 만듭니다.
+
+    id, 권한, 활성 여부만 필요한 엔드포인트에서 사용합니다. 클레임이 없는 이전 형식의 토큰은
+    ``get_current_user`` 로 사용자를 읽어 만듭니다.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="유효하지 않은 인증 정보입니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = verified_tokens.decode(token)
+    except JWTError as e:
+        logger.error(f"JWT Error: {str(e)}")
+        raise credentials_exception
+
+    if not {"sub", "uid", "role", "active", "ver"} <= payload.keys():
+        user = await get_current_user(token, db)
+        return user_schema.Principal(
+            id=user.id, username=user.username, role=user.role, is_active=user.is_active
+        )
+
+    jti: Optional[str] = payload.get("jti")
+    if jti is not None and await is_token_blacklisted(jti):
+        logger.error("Token is blacklisted")
+        raise credentials_exception
+    if not await _token_version_is_current(payload):
+        logger.error("Token version is outdated")
+        raise credentials_exception
+    if "sid" in payload and await session_store.is_revoked(payload["sid"]):
+        logger.error("Token session is revoked")
+        raise credentials_exception
+    return user_schema.Principal(
+        id=payload["uid"],
+        username=payload["sub"],
+        role=payload["role"],
+        is_active=payload["active"],
+        session_id=payload.get("sid"),
+    )
+
+
+async def get_current_active_principal(
+    principal: Annotated[user_schema.Principal, Depends(get_current_principal)]
+) -> user_schema.Principal:
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="비활성화된 사용자입니다.")
+    return principal
+
+
+async def admin_required(
+    current_user: user_schema.Principal = Depends(get_current_active_principal),
+) -> user_schema.Principal:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+async def internal_key_required(x_internal_key: Optional[str] = Header(None)) -> None:
+    """내부 서비스 전용 엔드포인트를 INTERNAL_API_KEY 로 보호합니다."""
+    expected = config.settings.INTERNAL_API_KEY
+    if not expected or x_internal_key is None or not hmac.compare_digest(x_internal_key, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid internal API key")
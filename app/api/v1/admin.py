@@ -3,10 +3,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ...schemas import user as user_schema
 from ...schemas import courses as course_schema
+from ...schemas import mission as mission_schema
 from ...models.user import User
-from ...db.session import get_async_db
+from ...db.session import engine, get_async_db, get_async_read_db, read_engine, replica_router
 from ...api.dependencies import admin_required
 from ...services.admin_service import AdminService
+from ...core.grader import grader
+from ...core.verdict_cache import verdict_cache
+from ...core.password_hasher import password_hasher
+from ...core.login_limiter import login_limiter
+from ...core.principal_cache import principal_cache
+from ...core.token_blacklist import token_blacklist
+from ...core.token_cache import verified_tokens
+from ...db.engine import pool_stats
+from ...db.query_stats import route_query_metrics
+from ...db.slow_query_log import slow_query_log
 
 router = APIRouter(
     prefix="/admin",
@@ -16,7 +27,7 @@ router = APIRouter(
 
 @router.get("/users", response_model=List[user_schema.User])
 async def get_all_users(
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_async_read_db),
     admin_service: AdminService = Depends()
 ):
     return await admin_service.get_all_users(db)
@@ -46,6 +57,14 @@ async def delete_user(
 ):
     await admin_service.delete_user(db, user_id)
 
+@router.post("/users/{user_id}/revoke-tokens", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_user_tokens(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    admin_service: AdminService = Depends()
+):
+    await admin_service.revoke_user_tokens(db, user_id)
+
 @router.post("/courses", response_model=course_schema.CourseInDB)
 async def create_course(
     course: course_schema.CourseCreate,
@@ -70,3 +89,38 @@ async def delete_course(
     admin_service: AdminService = Depends()
 ):
     await admin_service.delete_course(db, course_id)
+
+@router.get("/missions/grading-cost", response_model=List[mission_schema.MissionGradingCost])
+async def get_mission_grading_costs(
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db),
+    admin_service: AdminService = Depends()
+):
+    return await admin_service.get_mission_grading_costs(db, limit)
+
+@router.get("/grader/stats")
+async def get_grader_stats():
+    return {"pool": grader.stats(), "verdict_cache": verdict_cache.stats()}
+
+@router.get("/auth/stats")
+async def get_auth_stats():
+    return {
+        "password_hasher": password_hasher.stats(),
+        "login_limiter": login_limiter.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_blacklist": token_blacklist.stats(),
+        "verified_tokens": verified_tokens.stats(),
+    }
+
+@router.get("/db/stats")
+async def get_db_stats():
+    return {
+        "primary": pool_stats(engine),
+        "replica": pool_stats(read_engine) if read_engine is not None else None,
+        "routing": replica_router.stats(),
+        "slow_queries": slow_query_log.stats(),
+    }
+
+@router.get("/db/queries")
+async def get_query_stats():
+    return route_query_metrics.snapshot()
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from ...schemas import user as user_schema
 from ...models.user import User
 from ...db.session import get_async_db
+from ...api.dependencies import get_current_active_principal
 from ...services.auth_service import AuthService
 from ...services.user_service import UserService
 
@@ -20,13 +22,19 @@ async def register(
 
 @router.post("/token", response_model=user_schema.TokenPair)
 async def login_for_access_token(
+    request: Request,
+    background_tasks: BackgroundTasks,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_async_db),
     auth_service: AuthService = Depends()
 ):
-    return await auth_service.authenticate_user(db, form_data.username, form_data.password)
+    client_ip = request.client.host if request.client else None
+    return await auth_service.authenticate_user(
+        db, form_data.username, form_data.password, background_tasks, client_ip,
+        request.headers.get("user-agent"),
+    )
 
-@router.post("/refresh", response_model=user_schema.Token)
+@router.post("/refresh", response_model=user_schema.TokenPair)
 async def refresh_access_token(
     refresh_token: str,
     db: AsyncSession = Depends(get_async_db),
@@ -35,5 +43,33 @@ async def refresh_access_token(
     return await auth_service.refresh_token(db, refresh_token)
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout(token: str = Depends(oauth2_scheme)):
-    return {"msg": "로그아웃 성공"}
\ No newline at end of file
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    auth_service: AuthService = Depends()
+):
+    await auth_service.logout(token)
+    return {"msg": "로그아웃 성공"}
+
+@router.post("/logout-all", status_code=status.HTTP_200_OK)
+async def logout_all(
+    current_user: user_schema.Principal = Depends(get_current_active_principal),
+    auth_service: AuthService = Depends()
+):
+    await auth_service.logout_all(current_user.id)
+    return {"msg": "모든 기기에서 로그아웃되었습니다."}
+
+@router.get("/sessions", response_model=List[user_schema.SessionInfo])
+async def list_sessions(
+    current_user: user_schema.Principal = Depends(get_current_active_principal),
+    auth_service: AuthService = Depends()
+):
+    return await auth_service.list_sessions(current_user.id, current_user.session_id)
+
+@router.delete("/sessions/{session_id}", status_code=status.HTTP_200_OK)
+async def revoke_session(
+    session_id: str,
+    current_user: user_schema.Principal = Depends(get_current_active_principal),
+    auth_service: AuthService = Depends()
+):
+    await auth_service.revoke_session(current_user.id, session_id)
+    return {"msg": "세션이 종료되었습니다."}
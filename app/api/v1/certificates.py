@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from ...db.session import get_async_db
-from ...models.user import User
-from ...api.dependencies import get_current_active_user
+from ...schemas.user import Principal
+from ...api.dependencies import get_current_active_principal
 from ...services.certificate_service import CertificateService
 from ...schemas import certificates as cert_schema
 
@@ -13,7 +13,7 @@ async def issue_certificate(
     course_id: int,
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     certificate_service: CertificateService = Depends()
 ):
     return await certificate_service.issue_certificate(db, current_user.id, course_id)
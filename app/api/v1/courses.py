@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from ...db.session import get_async_db
-from ...models.user import User
-from ...api.dependencies import get_current_active_user
+from ...db.session import get_async_db, get_async_read_db
+from ...schemas.user import Principal
+from ...api.dependencies import get_current_active_principal
 from ...services.course_service import CourseService
 from ...schemas import courses as course_schema
 from typing import List
@@ -11,15 +11,15 @@ router = APIRouter(prefix="/courses", tags=["courses"])
 
 @router.get("/", response_model=List[course_schema.CourseInDB])
 async def get_all_courses(
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_async_read_db),
     course_service: CourseService = Depends()
 ):
     return await course_service.get_all_courses(db)
 
 @router.get("/roadmap", response_model=List[course_schema.CourseRoadmap])
 async def get_course_roadmap(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal),
+    db: AsyncSession = Depends(get_async_read_db),
     course_service: CourseService = Depends()
 ):
     return await course_service.get_course_roadmap(db, current_user.id)
@@ -27,7 +27,7 @@ async def get_course_roadmap(
 @router.post("/{course_id}/enroll", response_model=course_schema.Enrollment)
 async def enroll_course(
     course_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_async_db),
     course_service: CourseService = Depends()
 ):
@@ -37,7 +37,7 @@ async def enroll_course(
 async def create_course(
     course: course_schema.CourseCreate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     course_service: CourseService = Depends()
 ):
     if current_user.role != "ADMIN":
@@ -57,7 +57,7 @@ async def add_lesson_to_course(
     course_id: int,
     lesson: course_schema.LessonCreate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     course_service: CourseService = Depends()
 ):
     if current_user.role != "ADMIN":
@@ -70,7 +70,7 @@ async def update_lesson(
     lesson_id: int,
     lesson_update: course_schema.LessonUpdate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     course_service: CourseService = Depends()
 ):
     if current_user.role != "ADMIN":
@@ -82,7 +82,7 @@ async def delete_lesson(
     course_id: int,
     lesson_id: int,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     course_service: CourseService = Depends()
 ):
     if current_user.role != "ADMIN":
@@ -95,7 +95,7 @@ async def update_lesson_progress(
     lesson_id: int,
     progress: course_schema.LessonProgressUpdate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     course_service: CourseService = Depends()
 ):
     return await course_service.update_lesson_progress(db, lesson_id, current_user.id, progress)
@@ -105,7 +105,7 @@ async def get_lesson_progress(
     course_id: int,
     lesson_id: int,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     course_service: CourseService = Depends()
 ):
     return await course_service.get_lesson_progress(db, lesson_id, current_user.id)
@@ -115,7 +115,7 @@ async def get_lesson(
     course_id: int,
     lesson_id: int,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     course_service: CourseService = Depends()
 ):
     return await course_service.get_lesson(db, course_id, lesson_id)
\ No newline at end of file
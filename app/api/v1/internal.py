@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from ...schemas import user as user_schema
+from ...db.session import get_async_db
+from ...api.dependencies import internal_key_required
+from ...services.auth_service import AuthService
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(internal_key_required)],
+)
+
+@router.post("/tokens/introspect", response_model=List[user_schema.TokenIntrospection])
+async def introspect_tokens(
+    request: user_schema.TokenIntrospectionRequest,
+    db: AsyncSession = Depends(get_async_db),
+    auth_service: AuthService = Depends()
+):
+    return await auth_service.introspect_tokens(db, request.tokens)
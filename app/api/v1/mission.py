@@ -1,21 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ...schemas import mission as mission_schema
-from ...models.user import User
-from ...db.session import get_async_db
-from ...api.dependencies import get_current_active_user
+from ...schemas.user import Principal
+from ...db.session import get_async_db, get_async_read_db
+from ...api.dependencies import get_current_active_principal
 from ...services.mission_service import MissionService
+from ...services.mission_catalog import etag_matches
 
 router = APIRouter(prefix="/missions", tags=["missions"])
 
 @router.get("/", response_model=List[mission_schema.MissionInDB])
 async def get_missions(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_read_db),
+    mission_service: MissionService = Depends()
+):
+    page = await mission_service.get_mission_catalog_page(db, skip, limit)
+    headers = {"ETag": page.etag, "X-Total-Count": str(page.total), "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), page.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
+@router.post(
+    "/submissions/batch",
+    response_model=mission_schema.ExamSubmissionResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def submit_exam(
+    exam: mission_schema.ExamSubmissionCreate,
     db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal),
     mission_service: MissionService = Depends()
 ):
-    missions = await mission_service.get_missions(db)
-    return [mission_schema.MissionInDB.from_orm(mission) for mission in missions]
+    return await mission_service.submit_exam(db, current_user.id, exam)
+
+@router.get("/submissions/{submission_id}", response_model=mission_schema.MissionSubmissionStatus)
+async def get_submission_status(
+    submission_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal),
+    mission_service: MissionService = Depends()
+):
+    return await mission_service.get_submission_status(db, submission_id, current_user.id)
+
+@router.get("/submissions/{submission_id}/wait", response_model=mission_schema.MissionSubmissionStatus)
+async def wait_for_submission(
+    submission_id: int,
+    timeout: float = Query(30.0, gt=0, le=60),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal),
+    mission_service: MissionService = Depends()
+):
+    return await mission_service.get_submission_status(db, submission_id, current_user.id, wait=timeout)
 
 @router.get("/{mission_id}", response_model=mission_schema.MissionInDB)
 async def retrieve_mission(
@@ -31,16 +70,30 @@ async def submit_mission(
     mission_id: int,
     submission: mission_schema.MissionSubmissionCreate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     mission_service: MissionService = Depends()
 ):
     return await mission_service.submit_mission(db, mission_id, current_user.id, submission)
 
+@router.post(
+    "/{mission_id}/submit/async",
+    response_model=mission_schema.MissionSubmissionStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_mission_async(
+    mission_id: int,
+    submission: mission_schema.MissionSubmissionCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal),
+    mission_service: MissionService = Depends()
+):
+    return await mission_service.enqueue_code_submission(db, mission_id, current_user.id, submission)
+
 @router.post("/", response_model=mission_schema.MissionInDB)
 async def create_mission(
     mission: mission_schema.MissionCreate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     mission_service: MissionService = Depends()
 ):
     if current_user.role != "ADMIN":
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from ...db.session import get_async_db
-from ...models.user import User
-from ...api.dependencies import get_current_active_user
+from ...schemas.user import Principal
+from ...api.dependencies import get_current_active_principal
 from ...services.payment_service import PaymentService
 from ...schemas import payment as payment_schema
 from typing import List
@@ -21,7 +21,7 @@ async def prepare_payment(
 async def confirm_payment(
     verification: payment_schema.PaymentConfirmRequest,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     payment_service: PaymentService = Depends()
 ):
     return await payment_service.confirm_payment(db, current_user.id, verification)
@@ -29,7 +29,7 @@ async def confirm_payment(
 @router.get("/history", response_model=List[payment_schema.Payment])
 async def get_payment_history(
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     payment_service: PaymentService = Depends()
 ):
     return await payment_service.get_payment_history(db, current_user.id)
@@ -38,7 +38,7 @@ async def get_payment_history(
 async def refund_payment(
     payment_id: int,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     payment_service: PaymentService = Depends()
 ):
     return await payment_service.refund_payment(db, current_user.id, payment_id)
@@ -48,7 +48,7 @@ async def apply_coupon(
     course_id: int,
     coupon_code: str,
     db: AsyncSession = Depends(get_async_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     payment_service: PaymentService = Depends()
 ):
     return await payment_service.apply_coupon_to_course(db, course_id, coupon_code)
\ No newline at end of file
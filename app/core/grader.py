@@ -0,0 +1,778 @@
+import asyncio
+import json
+import logging
+import marshal
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from io import StringIO
+from types import CodeType
+from typing import AsyncIterable, AsyncIterator, List, Optional, Set, Tuple, Union
+
+from fastapi import HTTPException, status
+
+from .config import settings
+
+try:
+    import resource
+except ImportError:  # Windows 등 resource 모듈이 없는 환경
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스 자체가 멈췄을 때 부모가 추가로 기다려 주는 시간(초)
+HARD_TIMEOUT_GRACE = 5.0
+
+# 워커를 다시 띄우지 못하면 이 간격(초)부터 두 배씩 늘려 가며 재시도합니다.
+RESPAWN_BACKOFF_INITIAL = 0.5
+RESPAWN_BACKOFF_MAX = 30.0
+
+# 빈 워커를 기다리는 동안 풀에 살아 있는 워커가 남았는지 확인하는 간격(초)
+IDLE_WAIT_CHECK_INTERVAL = 1.0
+
+# 순차 채점 시 워커에 한 번에 보내는 테스트 케이스 수
+SERIAL_BATCH_SIZE = 32
+
+# 워커가 뜰 때 미리 불러 두는 표준 라이브러리. 제출 코드의 import 비용을 없애 줍니다.
+WARM_MODULES = ("math", "re", "collections", "itertools", "functools", "heapq", "bisect", "string")
+
+# 제출 코드를 실행한 프로세스가 보내는 결과의 크기 상한. 출력은 잘라서 보내고, 넘는 응답은 버립니다.
+MAX_OUTPUT_CHARS = 64 * 1024
+MAX_RESULT_BYTES = 1024 * 1024
+
+# fork 를 쓸 수 있으면 작업마다 준비된 워커를 복제해 채점하므로, 제출 코드가 바꾼 상태가 워커에 남지 않습니다.
+FORK_PER_JOB = hasattr(os, "fork")
+
+
+class GradingTimeout(BaseException):
+    """테스트 케이스 시간 초과.
+
+    제출 코드의 ``except Exception`` 으로 삼켜지지 않도록 BaseException 을 상속합니다.
+    """
+
+
+@dataclass
+class GradingResult:
+    is_correct: bool
+    output: str
+    # 시간 초과나 워커 장애처럼 서버 부하에 따라 달라질 수 있는 결과는 캐시하지 않습니다.
+    cacheable: bool = True
+    # 자원 사용량: 모든 테스트 케이스의 CPU/벽시계 시간 합(초)과 최대 RSS(KB)
+    cpu_time: float = 0.0
+    wall_time: float = 0.0
+    peak_rss_kb: int = 0
+    test_case_timings: List[dict] = field(default_factory=list)
+
+
+_RESULT_FIELDS = {
+    "is_correct", "output", "cacheable", "cpu_time", "wall_time", "peak_rss_kb",
+    "test_case_timings",
+}
+
+
+def _dump_result(result: GradingResult) -> dict:
+    payload = asdict(result)
+    payload["output"] = payload["output"][:MAX_OUTPUT_CHARS]
+    return payload
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+def _load_result(payload, max_test_cases: int) -> GradingResult:
+    """제출 코드를 실행한 프로세스가 보낸 JSON 결과를 검사해 GradingResult 로 만듭니다.
+
+    이런 프로세스가 보낸 데이터는 unpickle 하지 않고, 형식이나 크기가 맞지 않으면 ValueError 를 던집니다.
+    """
+    if not isinstance(payload, dict) or set(payload) != _RESULT_FIELDS:
+        raise ValueError("unexpected grading result fields")
+    if not isinstance(payload["is_correct"], bool) or not isinstance(payload["cacheable"], bool):
+        raise ValueError("invalid grading verdict")
+    if not isinstance(payload["output"], str) or len(payload["output"]) > MAX_OUTPUT_CHARS:
+        raise ValueError("invalid grading output")
+    if not all(_is_number(payload[key]) for key in ("cpu_time", "wall_time", "peak_rss_kb")):
+        raise ValueError("invalid resource usage")
+    timings = payload["test_case_timings"]
+    if not isinstance(timings, list) or len(timings) > max_test_cases:
+        raise ValueError("invalid test case timings")
+    for timing in timings:
+        if (
+            not isinstance(timing, dict)
+            or set(timing) != {"index", "cpu_ms", "wall_ms"}
+            or not isinstance(timing["index"], int)
+            or not all(_is_number(timing[key]) for key in timing)
+        ):
+            raise ValueError("invalid test case timing")
+    return GradingResult(**{**payload, "peak_rss_kb": int(payload["peak_rss_kb"])})
+
+
+def _raise_wall_timeout(signum, frame):
+    raise GradingTimeout("wall-clock time limit exceeded")
+
+
+def _raise_cpu_timeout(signum, frame):
+    raise GradingTimeout("CPU time limit exceeded")
+
+
+def _current_rss_kb() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() // 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _reset_peak_rss() -> None:
+    # 리눅스에서는 clear_refs 에 5 를 쓰면 VmHWM(최대 RSS)이 현재 값으로 초기화됩니다.
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _current_address_space() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[0])
+        return pages * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    """워커 프로세스 초기화: 환경 변수를 비우고 시그널 핸들러와 메모리 제한을 설정합니다."""
+    # spawn 된 워커는 부모의 환경 변수(SECRET_KEY, DB 접속 정보 등)를 물려받으므로 제출 코드가 보기 전에 지웁니다.
+    os.environ.clear()
+    signal.signal(signal.SIGALRM, _raise_wall_timeout)
+    if hasattr(signal, "SIGPROF"):
+        signal.signal(signal.SIGPROF, _raise_cpu_timeout)
+
+    if resource is not None and memory_limit_mb:
+        # 인터프리터가 이미 사용 중인 주소 공간 위에 제출 코드용 한도를 더합니다.
+        limit = memory_limit_mb * 1024 * 1024
+        baseline = _current_address_space()
+        if baseline is not None:
+            limit += baseline
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        # hard 한도도 같이 낮춰야 제출 코드가 setrlimit 으로 한도를 다시 올리지 못합니다.
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _run_test_case(code: CodeType, stdin: str, wall_time_limit: float, cpu_time_limit: float) -> str:
+    """컴파일된 제출 코드를 한 번 실행하고 표준 출력을 반환합니다. 워커 프로세스에서만 호출됩니다."""
+    old_stdin, old_stdout = sys.stdin, sys.stdout
+    sys.stdin = StringIO(stdin)
+    sys.stdout = captured = StringIO()
+    try:
+        signal.setitimer(signal.ITIMER_REAL, wall_time_limit)
+        if hasattr(signal, "ITIMER_PROF"):
+            signal.setitimer(signal.ITIMER_PROF, cpu_time_limit)
+        exec(code, {"__name__": "__main__"})
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        if hasattr(signal, "ITIMER_PROF"):
+            signal.setitimer(signal.ITIMER_PROF, 0)
+        sys.stdin, sys.stdout = old_stdin, old_stdout
+    return captured.getvalue()
+
+
+def _grade_submission(compiled: bytes, test_cases: List[dict], wall_time_limit: float, cpu_time_limit: float, fail_fast: bool, cpu_budget: float = 0) -> GradingResult:
+    # 부모 프로세스에서 한 번 컴파일한 코드 객체를 그대로 재사용합니다.
+    code = marshal.loads(compiled)
+    result = GradingResult(True, "")
+    _reset_peak_rss()
+
+    for index, test_case in enumerate(test_cases):
+        cpu_limit = cpu_time_limit
+        if cpu_budget:
+            remaining = cpu_budget - result.cpu_time
+            if remaining <= 0:
+                result.is_correct = False
+                result.output = "Error occurred: CPU budget exceeded"
+                result.cacheable = False
+                break
+            cpu_limit = min(cpu_limit, remaining)
+
+        error = None
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        try:
+            actual = _run_test_case(code, test_case["input"], wall_time_limit, cpu_limit).strip()
+        except GradingTimeout as e:
+            error = f"Error occurred: {e}"
+            result.cacheable = False
+        except MemoryError:
+            error = "Error occurred: memory limit exceeded"
+            result.cacheable = False
+        except BaseException as e:
+            error = f"Error occurred: {str(e)}"
+        cpu_time = time.process_time() - cpu_started
+        wall_time = time.perf_counter() - wall_started
+
+        result.cpu_time += cpu_time
+        result.wall_time += wall_time
+        result.test_case_timings.append(
+            {"index": index, "cpu_ms": round(cpu_time * 1000, 3), "wall_ms": round(wall_time * 1000, 3)}
+        )
+
+        if error is not None:
+            result.is_correct = False
+            result.output = error
+            break
+        if actual != test_case["expected_output"].strip():
+            result.is_correct = False
+            result.output += f"Test case failed. Input: {test_case['input']}, Expected: {test_case['expected_output']}, Got: {actual}\n"
+            if fail_fast:
+                break
+
+    result.peak_rss_kb = _peak_rss_kb()
+    return result
+
+
+def _run_isolated(conn, job: tuple) -> GradingResult:
+    """준비된 워커를 fork 한 자식 프로세스에서 작업 하나를 채점합니다.
+
+    제출 코드가 builtins, sys.modules, 모듈 전역 같은 인터프리터 상태를 바꿔도 자식과 함께 사라지므로
+    같은 워커가 맡는 다음 제출에는 영향을 주지 않습니다. 자식은 제출 코드가 결과 파이프에 직접 쓸 수
+    있으므로 결과는 JSON 으로만 받고 ``_load_result`` 로 검사합니다.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        # 제출 코드가 부모와의 파이프에 직접 쓰지 못하도록 자식 쪽 사본을 닫습니다.
+        conn.close()
+        try:
+            payload = json.dumps(_dump_result(_grade_submission(*job))).encode("utf-8")
+            with os.fdopen(write_fd, "wb") as f:
+                f.write(payload)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as f:
+        payload = f.read(MAX_RESULT_BYTES + 1)
+    # 상한을 넘겨 쓰다 막힌 자식도 기다리지 않도록 먼저 종료합니다. 이미 끝난 자식에는 영향이 없습니다.
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    os.waitpid(pid, 0)
+    try:
+        if len(payload) > MAX_RESULT_BYTES:
+            raise ValueError("grading result too large")
+        return _load_result(json.loads(payload), len(job[1]))
+    except Exception:
+        # 제출 코드가 os._exit 로 자식을 먼저 끝냈거나 결과 파이프에 다른 데이터를 쓴 경우
+        return GradingResult(False, "Error occurred: grader process terminated", cacheable=False)
+
+
+def _worker_main(conn, memory_limit_mb: int) -> None:
+    """워커 프로세스 진입점. 준비를 마치면 작업을 하나씩 받아 채점 결과와 현재 RSS 를 JSON 으로 돌려줍니다."""
+    if hasattr(os, "setsid"):
+        # 새 프로세스 그룹을 만들어, 부모가 워커를 죽일 때 채점 중인 자식도 함께 종료되게 합니다.
+        os.setsid()
+    for module in WARM_MODULES:
+        __import__(module)
+    _init_worker(memory_limit_mb)
+    conn.send("ready")
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        result = _run_isolated(conn, job) if FORK_PER_JOB else _grade_submission(*job)
+        message = {"result": _dump_result(result), "rss_kb": _current_rss_kb()}
+        conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def _discard_spawned(future) -> None:
+    # 풀이 멈춘 뒤에 뜬 워커는 쓰지 않고 바로 종료합니다.
+    if not future.cancelled() and future.exception() is None:
+        future.result().kill()
+
+
+class _Worker:
+    def __init__(self, ctx, memory_limit_mb: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        self.rss_kb = 0
+
+    def wait_ready(self, timeout: float) -> bool:
+        return self.conn.poll(timeout) and self.conn.recv() == "ready"
+
+    def run(self, job: tuple, timeout: float) -> Optional[GradingResult]:
+        """작업을 보내고 결과를 기다립니다. 시간 안에 답이 없으면 None 을 반환합니다. (블로킹)
+
+        워커는 제출 코드를 실행했을 수 있으므로 응답은 크기를 제한해 JSON 으로만 읽고, 형식이 틀리면
+        ValueError 를 던집니다.
+        """
+        self.conn.send(job)
+        if not self.conn.poll(timeout):
+            return None
+        message = json.loads(self.conn.recv_bytes(MAX_RESULT_BYTES))
+        if (
+            not isinstance(message, dict)
+            or set(message) != {"result", "rss_kb"}
+            or not isinstance(message["rss_kb"], int)
+        ):
+            raise ValueError("unexpected grader worker response")
+        result = _load_result(message["result"], len(job[1]))
+        self.rss_kb = message["rss_kb"]
+        self.jobs += 1
+        return result
+
+    def _kill_group(self) -> None:
+        # 워커가 fork 한 채점 프로세스까지 프로세스 그룹째 종료합니다.
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self.process.kill()
+        self.process.join()
+
+    def kill(self) -> None:
+        self._kill_group()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self._kill_group()
+        self.conn.close()
+
+
+class GraderMetrics:
+    def __init__(self):
+        self.jobs = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycled = 0
+        self.respawn_failures = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.execution_total = 0.0
+        self.execution_max = 0.0
+
+    def record(self, queue_wait: float, execution: float) -> None:
+        self.jobs += 1
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self.execution_total += execution
+        self.execution_max = max(self.execution_max, execution)
+
+    def snapshot(self) -> dict:
+        jobs = self.jobs or 1
+        return {
+            "jobs": self.jobs,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "recycled": self.recycled,
+            "respawn_failures": self.respawn_failures,
+            "queue_wait_avg_ms": round(self.queue_wait_total / jobs * 1000, 2),
+            "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+            "execution_avg_ms": round(self.execution_total / jobs * 1000, 2),
+            "execution_max_ms": round(self.execution_max * 1000, 2),
+        }
+
+
+class CodeGrader:
+    """제출 코드를 미리 띄워 둔 워커 프로세스 풀에서 채점합니다.
+
+    이벤트 루프와 전역 ``sys.stdout`` 을 건드리지 않으므로, 느린 제출이 다른 요청을 막거나
+    동시 제출끼리 출력이 섞이지 않습니다. 워커는 ``start`` 에서 미리 띄워 표준 라이브러리를
+    불러 두고, 작업마다 fork 한 자식에서 제출 코드를 실행해 제출끼리 인터프리터 상태를 공유하지 않게
+    합니다. ``max_jobs_per_worker`` 건을 처리하거나 RSS 가 ``max_worker_rss_mb`` 를 넘으면
+    새 워커로 교체합니다. ``parallel`` 이 켜져 있으면 서로 독립적인 테스트 케이스를 여러 워커에
+    나눠 실행합니다. 워커를 다시 띄우지 못해 남은 워커가 없으면 채점 요청을 503 으로 거절합니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        wall_time_limit: float,
+        cpu_time_limit: float,
+        memory_limit_mb: int,
+        parallel: bool = True,
+        max_jobs_per_worker: int = 0,
+        max_worker_rss_mb: int = 0,
+        cpu_budget: float = 0,
+    ):
+        self.max_workers = max_workers
+        self.wall_time_limit = wall_time_limit
+        self.cpu_time_limit = cpu_time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.parallel = parallel
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_worker_rss_mb = max_worker_rss_mb
+        self.cpu_budget = cpu_budget
+        self.metrics = GraderMetrics()
+        self._ctx = multiprocessing.get_context("spawn")
+        self._io: Optional[ThreadPoolExecutor] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[_Worker] = []
+        self._start_lock: Optional[asyncio.Lock] = None
+        # 연속으로 워커를 띄우지 못한 횟수와 진행 중인 교체 작업
+        self._spawn_failures = 0
+        self._respawns: Set[asyncio.Task] = set()
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx, self.memory_limit_mb)
+        if not worker.wait_ready(30):
+            worker.kill()
+            raise RuntimeError("grader worker failed to start")
+        return worker
+
+    async def start(self) -> None:
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            loop = asyncio.get_running_loop()
+            # 파이프 입출력은 블로킹이므로 워커 수만큼의 전용 스레드에서 처리합니다.
+            self._io = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="grader-io")
+            spawned = await asyncio.gather(
+                *[loop.run_in_executor(self._io, self._spawn) for _ in range(self.max_workers)],
+                return_exceptions=True,
+            )
+            workers = [worker for worker in spawned if isinstance(worker, _Worker)]
+            if not workers:
+                logger.error("Failed to start grader workers: %r", spawned[0])
+                self._io.shutdown(wait=False)
+                self._io = None
+                raise self._unavailable()
+            self._idle = asyncio.Queue()
+            for worker in workers:
+                self._workers.append(worker)
+                self._idle.put_nowait(worker)
+            # 일부만 떴으면 나머지는 백그라운드에서 다시 띄웁니다.
+            for error in spawned:
+                if not isinstance(error, _Worker):
+                    logger.error("Failed to start grader worker: %r", error)
+                    self._spawn_failures += 1
+                    self._schedule(self._respawn())
+
+    async def stop(self) -> None:
+        if self._idle is None:
+            return
+        self._idle = None
+        # 백오프 중인 재시작은 더 기다리지 않고 끝냅니다.
+        respawns = list(self._respawns)
+        for task in respawns:
+            task.cancel()
+        await asyncio.gather(*respawns, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        workers, self._workers = self._workers, []
+        await asyncio.gather(*[loop.run_in_executor(self._io, worker.stop) for worker in workers])
+        self._io.shutdown(wait=False)
+        self._io = None
+
+    def _should_recycle(self, worker: _Worker) -> bool:
+        if not FORK_PER_JOB:
+            # fork 가 없으면 제출 코드가 워커 상태를 바꿨을 수 있으므로 작업마다 교체합니다.
+            return True
+        if self.max_jobs_per_worker and worker.jobs >= self.max_jobs_per_worker:
+            return True
+        return bool(self.max_worker_rss_mb) and worker.rss_kb > self.max_worker_rss_mb * 1024
+
+    async def _replace(self, worker: _Worker, kill: bool) -> None:
+        loop = asyncio.get_running_loop()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        if self._io is None:
+            worker.kill()
+            return
+        try:
+            await loop.run_in_executor(self._io, worker.kill if kill else worker.stop)
+        except Exception:
+            logger.exception("Failed to stop grader worker")
+        await self._respawn()
+
+    async def _respawn(self) -> None:
+        # 새 워커를 띄우지 못하면 풀이 줄어든 채로 두지 않고, 간격을 늘려 가며 멈출 때까지 재시도합니다.
+        loop = asyncio.get_running_loop()
+        delay = RESPAWN_BACKOFF_INITIAL
+        while self._idle is not None:
+            spawn = loop.run_in_executor(self._io, self._spawn)
+            try:
+                new_worker = await asyncio.shield(spawn)
+            except asyncio.CancelledError:
+                spawn.add_done_callback(_discard_spawned)
+                raise
+            except Exception:
+                self._spawn_failures += 1
+                self.metrics.respawn_failures += 1
+                logger.exception("Failed to respawn grader worker, retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RESPAWN_BACKOFF_MAX)
+                continue
+            self._spawn_failures = 0
+            if self._idle is None:
+                new_worker.stop()
+                return
+            self._workers.append(new_worker)
+            self._idle.put_nowait(new_worker)
+            return
+
+    def _schedule(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self._respawns.add(task)
+        task.add_done_callback(self._respawns.discard)
+
+    def _unavailable(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="채점 서버를 일시적으로 사용할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": "1"},
+        )
+
+    async def _acquire(self) -> _Worker:
+        # 살아 있는 워커가 하나도 없고 다시 띄우는 것도 실패하고 있으면 빈 대기열을 기다리지 않고 거절합니다.
+        while True:
+            if self._idle is None or (not self._workers and self._spawn_failures):
+                raise self._unavailable()
+            try:
+                return await asyncio.wait_for(self._idle.get(), IDLE_WAIT_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                continue
+
+    async def grade(self, test_cases: Union[List[dict], AsyncIterable[dict]], submitted_code: str, fail_fast: bool = False) -> GradingResult:
+        """제출 코드를 채점합니다.
+
+        ``test_cases`` 는 리스트나 비동기 이터러블 모두 받으며, 필요한 만큼만 꺼내 워커에 보냅니다.
+        ``fail_fast`` 가 참이면 첫 번째 실패에서 나머지 테스트 케이스를 실행하지 않습니다.
+        """
+        try:
+            code = compile(submitted_code, "<submission>", "exec")
+        except (SyntaxError, ValueError) as e:
+            return GradingResult(False, f"Error occurred: {str(e)}")
+        compiled = marshal.dumps(code)
+
+        if self._idle is None:
+            await self.start()
+        cases = _iterate(test_cases)
+        try:
+            if self.parallel:
+                return await self._grade_parallel(compiled, cases, fail_fast)
+            return await self._grade_serial(compiled, cases, fail_fast)
+        finally:
+            await cases.aclose()
+
+    async def _grade_parallel(self, compiled: bytes, test_cases: AsyncIterator[dict], fail_fast: bool) -> GradingResult:
+        # 워커 수만큼만 먼저 꺼내 두고, 하나가 끝날 때마다 다음 케이스를 읽습니다.
+        results: List[Tuple[int, GradingResult]] = []
+        pending = {}
+        exhausted = False
+        over_budget = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_workers:
+                    try:
+                        test_case = await test_cases.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.ensure_future(self._run(compiled, [test_case], fail_fast, self.cpu_budget))
+                    pending[task] = len(results) + len(pending)
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results.append((pending.pop(task), task.result()))
+                if fail_fast and any(not task.result().is_correct for task in done):
+                    break
+                if self.cpu_budget and (pending or not exhausted):
+                    if sum(result.cpu_time for _, result in results) >= self.cpu_budget:
+                        over_budget = True
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+        return _merge(sorted(results, key=lambda item: item[0]), over_budget)
+
+    async def _grade_serial(self, compiled: bytes, test_cases: AsyncIterator[dict], fail_fast: bool) -> GradingResult:
+        results: List[Tuple[int, GradingResult]] = []
+        offset = 0
+        spent = 0.0
+        while True:
+            batch = []
+            async for test_case in test_cases:
+                batch.append(test_case)
+                if len(batch) >= SERIAL_BATCH_SIZE:
+                    break
+            if not batch:
+                break
+            budget = 0
+            if self.cpu_budget:
+                budget = self.cpu_budget - spent
+                if budget <= 0:
+                    return _merge(results, over_budget=True)
+            result = await self._run(compiled, batch, fail_fast, budget)
+            results.append((offset, result))
+            offset += len(batch)
+            spent += result.cpu_time
+            # 워커가 배치를 다 돌지 않았다면 오류나 fail_fast 로 멈춘 것이므로 더 보내지 않습니다.
+            if len(result.test_case_timings) < len(batch):
+                break
+        return _merge(results)
+
+    async def _run(self, compiled: bytes, test_cases: List[dict], fail_fast: bool, cpu_budget: float = 0) -> GradingResult:
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+        # 워커가 빌 때까지 여기서 기다려야 아래 시간 제한이 대기 시간이 아닌 실행 시간에만 적용됩니다.
+        worker = await self._acquire()
+        started_at = time.perf_counter()
+
+        job = (compiled, test_cases, self.wall_time_limit, self.cpu_time_limit, fail_fast, cpu_budget)
+        hard_timeout = self.wall_time_limit * max(len(test_cases), 1) + HARD_TIMEOUT_GRACE
+        try:
+            future = loop.run_in_executor(self._io, worker.run, job, hard_timeout)
+        except Exception:
+            logger.exception("Failed to dispatch grading job")
+            return self._crashed(worker)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # fail_fast 로 취소되더라도 워커는 실행 중인 작업을 마친 뒤 풀로 돌아가야 합니다.
+            future.add_done_callback(lambda f: self._finish_job(worker, f, queued_at, started_at))
+            raise
+        except Exception:
+            # 워커와 주고받다 난 예외는 종류와 관계없이 _finish_job 에서 충돌로 처리합니다.
+            pass
+        return self._finish_job(worker, future, queued_at, started_at)
+
+    def _crashed(self, worker: _Worker) -> GradingResult:
+        # 상태를 알 수 없는 워커는 풀에 돌려놓지 않고 새 프로세스로 교체합니다.
+        self.metrics.crashes += 1
+        self._schedule(self._replace(worker, kill=True))
+        return GradingResult(False, "Error occurred: grader process terminated", cacheable=False)
+
+    def _finish_job(self, worker: _Worker, future: asyncio.Future, queued_at: float, started_at: float) -> GradingResult:
+        """끝난 작업의 결과를 돌려주고 워커를 풀에 되돌리거나 교체합니다. 예외를 던지지 않습니다."""
+        try:
+            return self._collect(worker, future, queued_at, started_at)
+        except Exception:
+            logger.exception("Failed to finish grading job")
+            return self._crashed(worker)
+
+    def _collect(
+        self, worker: _Worker, future: asyncio.Future, queued_at: float, started_at: float
+    ) -> GradingResult:
+        error = future.exception() if not future.cancelled() else asyncio.CancelledError()
+        if error is not None:
+            # 제출 코드가 os._exit 등으로 워커를 죽였거나 메모리 부족으로 종료된 경우가 대부분이고,
+            # 그 밖의 예외(깨진 응답 등)는 원인을 알 수 있게 남깁니다.
+            if not isinstance(error, (EOFError, OSError)):
+                logger.warning("Grader worker failed: %r", error)
+            return self._crashed(worker)
+
+        self.metrics.record(started_at - queued_at, time.perf_counter() - started_at)
+        result = future.result()
+        if result is None:
+            # 시그널 타이머로도 멈추지 않은 워커는 강제로 종료하고 새로 띄웁니다.
+            self.metrics.timeouts += 1
+            self._schedule(self._replace(worker, kill=True))
+            return GradingResult(
+                False,
+                "Error occurred: time limit exceeded",
+                cacheable=False,
+                wall_time=time.perf_counter() - started_at,
+            )
+
+        if self._should_recycle(worker):
+            self.metrics.recycled += 1
+            self._schedule(self._replace(worker, kill=False))
+        elif self._idle is not None:
+            self._idle.put_nowait(worker)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "idle_workers": self._idle.qsize() if self._idle is not None else 0,
+            **self.metrics.snapshot(),
+        }
+
+
+async def _iterate(test_cases: Union[List[dict], AsyncIterable[dict]]) -> AsyncIterator[dict]:
+    if isinstance(test_cases, list):
+        for test_case in test_cases:
+            yield test_case
+        return
+    try:
+        async for test_case in test_cases:
+            yield test_case
+    finally:
+        # 이 제너레이터만 닫으면 안쪽 스트림(DB 커서)은 GC 때까지 열려 있으므로 직접 닫습니다.
+        aclose = getattr(test_cases, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def _merge(results: List[Tuple[int, GradingResult]], over_budget: bool = False) -> GradingResult:
+    """(시작 인덱스, 결과) 목록을 하나의 채점 결과로 합칩니다."""
+    merged = GradingResult(True, "")
+    outputs = []
+    for offset, result in results:
+        merged.is_correct = merged.is_correct and result.is_correct
+        merged.cacheable = merged.cacheable and result.cacheable
+        merged.cpu_time += result.cpu_time
+        merged.wall_time += result.wall_time
+        merged.peak_rss_kb = max(merged.peak_rss_kb, result.peak_rss_kb)
+        for timing in result.test_case_timings:
+            merged.test_case_timings.append({**timing, "index": timing["index"] + offset})
+        if result.output:
+            outputs.append(result.output.rstrip("\n"))
+    if over_budget:
+        merged.is_correct = False
+        merged.cacheable = False
+        outputs.append("Error occurred: CPU budget exceeded")
+    merged.output = "".join(f"{output}\n" for output in outputs)
+    return merged
+
+
+grader = CodeGrader(
+    max_workers=settings.GRADER_MAX_WORKERS,
+    wall_time_limit=settings.GRADER_WALL_TIME_LIMIT,
+    cpu_time_limit=settings.GRADER_CPU_TIME_LIMIT,
+    memory_limit_mb=settings.GRADER_MEMORY_LIMIT_MB,
+    parallel=settings.GRADER_PARALLEL_TEST_CASES,
+    max_jobs_per_worker=settings.GRADER_MAX_JOBS_PER_WORKER,
+    max_worker_rss_mb=settings.GRADER_MAX_WORKER_RSS_MB,
+    cpu_budget=settings.GRADER_SUBMISSION_CPU_BUDGET,
+)
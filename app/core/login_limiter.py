@@ -0,0 +1,132 @@
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Optional
+
+from fastapi import HTTPException, status
+
+from .config import settings
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowLimiter:
+    """키마다 최근 ``window`` 초 동안의 시도 횟수를 ``limit`` 으로 제한합니다.
+
+    REDIS_URL 이 있으면 정렬 집합으로 워커 간에 창을 공유하고, Redis 에 닿지 못하면 프로세스 내 창을 씁니다.
+    """
+
+    def __init__(self, name: str, limit: int, window: float, max_keys: int = 100000):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def _hit_local(self, key: str, now: float) -> Optional[float]:
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        self._hits.move_to_end(key)
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+        if len(hits) >= self.limit:
+            return hits[0] + self.window - now
+        hits.append(now)
+        return None
+
+    async def hit(self, key: str) -> Optional[float]:
+        """시도 한 번을 기록합니다. 한도를 넘었다면 기록하지 않고 다시 시도할 수 있을 때까지의 초를 반환합니다."""
+        now = time.time()
+        redis = get_redis()
+        if redis is None:
+            return self._hit_local(key, now)
+
+        redis_key = f"login-limit:{self.name}:{key}"
+        member = f"{now}:{uuid.uuid4().hex}"
+        try:
+            # 정리, 기록, 개수 확인을 한 트랜잭션으로 묶어 워커 사이의 경합에도 한도를 넘지 않게 합니다.
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(redis_key, 0, now - self.window)
+                pipe.zadd(redis_key, {member: now})
+                pipe.zcard(redis_key)
+                pipe.zrange(redis_key, 0, 0, withscores=True)
+                pipe.expire(redis_key, int(self.window) + 1)
+                _, _, count, oldest, _ = await pipe.execute()
+            if count > self.limit:
+                await redis.zrem(redis_key, member)
+                return oldest[0][1] + self.window - now if oldest else self.window
+            return None
+        except Exception:
+            logger.warning("Login limiter lookup failed, using local window", exc_info=True)
+            return self._hit_local(key, now)
+
+    async def reset(self, key: str) -> None:
+        self._hits.pop(key, None)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.delete(f"login-limit:{self.name}:{key}")
+            except Exception:
+                logger.warning("Login limiter reset failed", exc_info=True)
+
+    def clear(self) -> None:
+        self._hits.clear()
+
+
+class LoginLimiter:
+    """로그인 시도를 사용자 이름과 클라이언트 IP 별로 제한합니다.
+
+    bcrypt 검증 전에 확인하므로, 한도를 넘은 요청은 해시 계산 없이 429 로 거절됩니다.
+    """
+
+    def __init__(self, username_limit: int, ip_limit: int, window: float):
+        self.by_username = SlidingWindowLimiter("username", username_limit, window)
+        self.by_ip = SlidingWindowLimiter("ip", ip_limit, window)
+        self.allowed = 0
+        self.blocked_username = 0
+        self.blocked_ip = 0
+
+    async def check(self, username: str, client_ip: Optional[str] = None) -> None:
+        retry_after = None
+        if client_ip:
+            retry_after = await self.by_ip.hit(client_ip)
+            if retry_after is not None:
+                self.blocked_ip += 1
+        if retry_after is None:
+            retry_after = await self.by_username.hit(username.lower())
+            if retry_after is not None:
+                self.blocked_username += 1
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": str(max(int(retry_after) + 1, 1))},
+            )
+        self.allowed += 1
+
+    async def reset(self, username: str) -> None:
+        """로그인에 성공하면 해당 사용자 이름의 시도 기록을 지웁니다."""
+        await self.by_username.reset(username.lower())
+
+    def clear(self) -> None:
+        self.by_username.clear()
+        self.by_ip.clear()
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "blocked_username": self.blocked_username,
+            "blocked_ip": self.blocked_ip,
+        }
+
+
+login_limiter = LoginLimiter(
+    username_limit=settings.LOGIN_RATE_LIMIT_PER_USERNAME,
+    ip_limit=settings.LOGIN_RATE_LIMIT_PER_IP,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW,
+)
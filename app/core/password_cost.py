@@ -0,0 +1,102 @@
+"""bcrypt 작업 계수(rounds) 보정.
+
+서버에서 해시 한 번이 목표 시간 안에 끝나는 가장 큰 rounds 를 골라 ``pwd_context`` 에 적용합니다.
+명령줄에서 실행하면 측정 결과만 출력하므로 BCRYPT_ROUNDS 로 고정해 쓸 수 있습니다.
+
+    python -m app.core.password_cost --target-ms 250
+"""
+import argparse
+import logging
+import time
+
+from .config import settings
+from .redis_client import get_redis
+from .security import pwd_context
+
+logger = logging.getLogger(__name__)
+
+ROUNDS_KEY_PREFIX = "bcrypt-rounds"
+
+
+def rounds_key(target_ms: float, min_rounds: int, max_rounds: int) -> str:
+    # 보정 조건이 바뀌면 이전 결과를 쓰지 않도록 조건을 키에 넣습니다.
+    return f"{ROUNDS_KEY_PREFIX}:{target_ms:g}:{min_rounds}:{max_rounds}"
+
+
+def measure_bcrypt(rounds: int, samples: int = 3) -> float:
+    """주어진 rounds 로 해시 한 번에 걸리는 시간(초). 가장 빠른 측정값을 씁니다."""
+    handler = pwd_context.handler("bcrypt").using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        handler.hash("calibration-password")
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    # rounds 가 1 늘 때마다 계산량이 두 배가 되므로 최소값에서 한 번만 측정해 추정합니다.
+    elapsed = measure_bcrypt(min_rounds)
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed * 2 * 1000 <= target_ms:
+        elapsed *= 2
+        rounds += 1
+    return rounds
+
+
+def apply_bcrypt_rounds(rounds: int) -> None:
+    """새 해시에 쓸 rounds 를 바꿉니다. 이전 rounds 의 해시는 로그인할 때 다시 해시됩니다."""
+    pwd_context.update(bcrypt__rounds=rounds)
+
+
+def current_bcrypt_rounds() -> int:
+    return pwd_context.handler("bcrypt").default_rounds
+
+
+async def configure_password_cost() -> int:
+    """설정에 따라 bcrypt rounds 를 정하고 적용합니다.
+
+    BCRYPT_ROUNDS 가 있으면 그대로 쓰고, 없으면 BCRYPT_CALIBRATE_ON_STARTUP 일 때 보정합니다.
+    워커마다 다른 값을 고르면 로그인마다 서로의 해시를 다시 만들게 되므로, Redis 가 있으면 먼저 정해진
+    값을 모든 워커가 따릅니다. 공유한 값은 BCRYPT_CALIBRATION_TTL 이 지나면 사라져, 서버 사양이 바뀐
+    뒤에는 다음 시작에서 다시 보정합니다.
+    """
+    if settings.BCRYPT_ROUNDS:
+        apply_bcrypt_rounds(settings.BCRYPT_ROUNDS)
+        return settings.BCRYPT_ROUNDS
+    if not settings.BCRYPT_CALIBRATE_ON_STARTUP:
+        return current_bcrypt_rounds()
+
+    key = rounds_key(
+        settings.BCRYPT_TARGET_MS, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS
+    )
+    redis = get_redis()
+    if redis is not None:
+        shared = await redis.get(key)
+        if shared is not None:
+            apply_bcrypt_rounds(int(shared))
+            return int(shared)
+
+    rounds = calibrate_bcrypt_rounds(
+        settings.BCRYPT_TARGET_MS, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS
+    )
+    if redis is not None:
+        await redis.set(key, rounds, nx=True, ex=settings.BCRYPT_CALIBRATION_TTL)
+        # 그 사이 다른 워커가 먼저 정한 값이 있으면 그 값을 따릅니다.
+        shared = await redis.get(key)
+        if shared is not None:
+            rounds = int(shared)
+    apply_bcrypt_rounds(rounds)
+    logger.info("Using bcrypt rounds=%s", rounds)
+    return rounds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="bcrypt rounds 보정")
+    parser.add_argument("--target-ms", type=float, default=settings.BCRYPT_TARGET_MS)
+    parser.add_argument("--min-rounds", type=int, default=settings.BCRYPT_MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=settings.BCRYPT_MAX_ROUNDS)
+    args = parser.parse_args()
+
+    rounds = calibrate_bcrypt_rounds(args.target_ms, args.min_rounds, args.max_rounds)
+    print(f"BCRYPT_ROUNDS={rounds}  # ~{measure_bcrypt(rounds, samples=1) * 1000:.0f} ms per hash")
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from .config import settings
+
+T = TypeVar("T")
+
+
+class HasherMetrics:
+    def __init__(self):
+        self.jobs = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.execution_total = 0.0
+        self.execution_max = 0.0
+
+    def record(self, queue_wait: float, execution: float) -> None:
+        self.jobs += 1
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self.execution_total += execution
+        self.execution_max = max(self.execution_max, execution)
+
+    def snapshot(self) -> dict:
+        jobs = self.jobs or 1
+        return {
+            "jobs": self.jobs,
+            "rejected": self.rejected,
+            "queue_wait_avg_ms": round(self.queue_wait_total / jobs * 1000, 2),
+            "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+            "execution_avg_ms": round(self.execution_total / jobs * 1000, 2),
+            "execution_max_ms": round(self.execution_max * 1000, 2),
+        }
+
+
+class PasswordHasher:
+    """bcrypt 해시/검증을 전용 스레드 풀에서 실행합니다.
+
+    bcrypt 는 GIL 을 풀고 계산하므로 이벤트 루프를 막지 않고, 동시에 도는 해시 수는 ``max_workers`` 로
+    제한됩니다. 실행 중이거나 기다리는 작업이 ``max_pending`` 에 이르면 더 쌓지 않고 503 으로 거절합니다.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.metrics = HasherMetrics()
+        self._pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _timed(self, func: Callable[..., T], queued_at: float, *args) -> T:
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.metrics.record(started_at - queued_at, time.perf_counter() - started_at)
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_pending:
+            self.metrics.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="요청이 많아 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": "1"},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, func, time.perf_counter(), *args)
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        return {"pending": self._pending, "workers": self.max_workers, **self.metrics.snapshot()}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,141 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from .config import settings
+from .redis_client import get_redis, publish, subscribe
+from ..models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "principals"
+
+# 인증이 끝난 뒤의 요청 처리에는 쓰이지 않으므로 캐시 계층(특히 공유 Redis)에 복사하지 않습니다.
+EXCLUDED_COLUMNS = frozenset({"hashed_password"})
+
+
+def _dump_user(user: User) -> dict:
+    values = {}
+    for attr in inspect(User).column_attrs:
+        if attr.key in EXCLUDED_COLUMNS:
+            continue
+        value = getattr(user, attr.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, UserRole):
+            value = value.value
+        values[attr.key] = value
+    return values
+
+
+def _load_user(values: dict) -> User:
+    """캐시된 컬럼 값으로 세션에 속하지 않은(detached) User 객체를 만듭니다.
+
+    제외된 컬럼은 로드되지 않은 상태로 남으므로, 접근하면 조용히 None 이 아니라 오류가 납니다.
+    """
+    # 제외 목록이 생기기 전에 Redis 에 저장된 항목에도 남아 있지 않게 합니다.
+    values = {key: value for key, value in values.items() if key not in EXCLUDED_COLUMNS}
+    for attr in inspect(User).column_attrs:
+        value = values.get(attr.key)
+        if value is None:
+            continue
+        if isinstance(attr.columns[0].type, DateTime):
+            values[attr.key] = datetime.fromisoformat(value)
+        elif attr.key == "role":
+            values[attr.key] = UserRole(value)
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+class PrincipalCache:
+    """인증된 사용자 정보 캐시 (username 기준).
+
+    워커마다 TTL/LRU 캐시를 두고, REDIS_URL 이 있으면 워커 간에 공유되는 두 번째 계층을 씁니다.
+    사용자 정보가 바뀌면 ``invalidate`` 로 모든 워커의 항목을 지웁니다.
+    """
+
+    def __init__(self, max_size: int, ttl: int, prefix: str = "principal:"):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    def _remember(self, username: str, values: dict) -> None:
+        self._entries[username] = (time.monotonic() + self.ttl, values)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, username: str) -> Optional[User]:
+        entry = self._entries.get(username)
+        if entry is not None:
+            expires_at, values = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(username)
+                self.hits += 1
+                return _load_user(values)
+            del self._entries[username]
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(self.prefix + username)
+            except Exception:
+                logger.warning("Principal cache lookup failed", exc_info=True)
+                raw = None
+            if raw is not None:
+                values = json.loads(raw)
+                self._remember(username, values)
+                self.hits += 1
+                return _load_user(values)
+
+        self.misses += 1
+        return None
+
+    async def set(self, user: User) -> None:
+        values = _dump_user(user)
+        self._remember(user.username, values)
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.set(self.prefix + user.username, json.dumps(values), ex=self.ttl)
+            except Exception:
+                logger.warning("Principal cache store failed", exc_info=True)
+
+    async def invalidate(self, username: str) -> None:
+        self._entries.pop(username, None)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.delete(self.prefix + username)
+            except Exception:
+                logger.warning("Principal cache invalidation failed", exc_info=True)
+        await publish(CHANNEL, username)
+
+    async def _on_message(self, username: str) -> None:
+        self._entries.pop(username, None)
+
+    def start_sync(self) -> None:
+        subscribe(CHANNEL, self._on_message)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+import redis.asyncio as aioredis
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[aioredis.Redis] = None
+_listeners: List[asyncio.Task] = []
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """REDIS_URL 이 설정된 경우 공유 비동기 Redis 클라이언트를 반환합니다.
+
+    설정되지 않았다면 None 을 반환하며, 호출하는 쪽은 프로세스 내 저장소로 대신합니다.
+    """
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    if _client is None:
+        _client = aioredis.from_url(settings.REDIS_URL, max_connections=settings.REDIS_MAX_CONNECTIONS)
+    return _client
+
+
+async def publish(channel: str, message: str) -> None:
+    """다른 워커에 알림을 보냅니다. Redis 가 없거나 실패하면 조용히 넘어갑니다."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.publish(channel, message)
+    except Exception:
+        logger.warning("Failed to publish to %s", channel, exc_info=True)
+
+
+async def _listen(
+    channel: str,
+    handler: Callable[[str], Awaitable[None]],
+    on_subscribe: Optional[Callable[[], Awaitable[None]]] = None,
+    on_lost: Optional[Callable[[], None]] = None,
+) -> None:
+    while True:
+        try:
+            pubsub = get_redis().pubsub()
+            await pubsub.subscribe(channel)
+            try:
+                # 구독이 끊긴 동안 놓친 메시지는 다시 받을 수 없으므로, 구독할 때마다 상태를 새로 맞출 기회를 줍니다.
+                if on_subscribe is not None:
+                    await on_subscribe()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    data = message["data"]
+                    await handler(data.decode() if isinstance(data, bytes) else data)
+            finally:
+                if on_lost is not None:
+                    on_lost()
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Lost subscription to %s, retrying", channel, exc_info=True)
+            await asyncio.sleep(1)
+
+
+def subscribe(
+    channel: str,
+    handler: Callable[[str], Awaitable[None]],
+    on_subscribe: Optional[Callable[[], Awaitable[None]]] = None,
+    on_lost: Optional[Callable[[], None]] = None,
+) -> None:
+    """채널 메시지를 받을 때마다 ``handler`` 를 호출하는 백그라운드 작업을 시작합니다.
+
+    ``on_subscribe`` 는 (재)구독에 성공할 때마다, ``on_lost`` 는 구독이 끊길 때마다 호출됩니다.
+    """
+    if get_redis() is None:
+        return
+    _listeners.append(asyncio.create_task(_listen(channel, handler, on_subscribe, on_lost)))
+
+
+async def close_redis() -> None:
+    global _client
+    for task in _listeners:
+        task.cancel()
+    await asyncio.gather(*_listeners, return_exceptions=True)
+    _listeners.clear()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
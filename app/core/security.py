@@ -1,23 +1,23 @@
 from datetime import datetime, timedelta
-from typing import Union, Any, Optional
+from typing import Union, Any, Iterable, Optional, Set
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.config import settings
-import redis
+from ..core.token_blacklist import token_blacklist
+from ..core.password_hasher import password_hasher
+from ..core.token_cache import verified_tokens
 from ..db.session import get_async_db
-from ..models.user import User
+from ..models.user import User, UserRole
 from sqlalchemy import select
 import logging
+import uuid
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-# Redis 클라이언트 설정
-redis_client = redis.Redis(host="localhost", port=6379, db=0)
-
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
@@ -29,8 +29,32 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    # bcrypt 는 수백 ms 가 걸리므로 이벤트 루프가 아닌 해시 전용 스레드 풀에서 실행합니다.
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """현재 설정과 다른 rounds 로 만든 해시인지 확인합니다."""
+    return pwd_context.needs_update(hashed_password)
+
+
+def principal_claims(user: User, token_version: int = 0) -> dict:
+    """토큰만으로 권한을 확인할 수 있도록 액세스 토큰에 넣을 사용자 정보."""
+    return {
+        "uid": user.id,
+        "role": UserRole(user.role).value,
+        "active": bool(user.is_active),
+        "ver": token_version,
+    }
+
+
 def create_access_token(
-    subject: str, expires_delta: Optional[timedelta] = None
+    subject: str, expires_delta: Optional[timedelta] = None, claims: Optional[dict] = None
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -38,20 +62,24 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": subject}
+    to_encode = {**(claims or {}), "exp": expire, "sub": subject, "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
 
-def blacklist_token(jti: str):
-    # 토큰의 jti를 블랙리스트에 추가 (예: 1시간 유효)
-    redis_client.set(jti, "blacklisted", ex=3600)
+async def blacklist_token(jti: str, expires_in: int = 3600):
+    # 토큰의 jti를 블랙리스트에 추가 (토큰이 만료될 때까지 유효)
+    await token_blacklist.revoke(jti, expires_in)
 
 
-def is_token_blacklisted(jti: str) -> bool:
-    return redis_client.exists(jti) == 1
+async def is_token_blacklisted(jti: str) -> bool:
+    return await token_blacklist.is_revoked(jti)
+
+
+async def blacklisted_jtis(jtis: Iterable[str]) -> Set[str]:
+    return await token_blacklist.revoked_among(jtis)
 
 async def verify_token(token: str, db: AsyncSession) -> User:
     credentials_exception = HTTPException(
@@ -60,7 +88,7 @@ async def verify_token(token: str, db: AsyncSession) -> User:
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = verified_tokens.decode(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -76,7 +104,7 @@ async def verify_token(token: str, db: AsyncSession) -> User:
 
 def decode_access_token(token: str):
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = verified_tokens.decode(token)
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=401, detail="Could not validate credentials")
@@ -87,13 +115,13 @@ def decode_access_token(token: str):
 
 
 def create_refresh_token(
-    subject: str, expires_delta: Optional[timedelta] = None
+    subject: str, expires_delta: Optional[timedelta] = None, claims: Optional[dict] = None
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode = {"exp": expire, "sub": subject, "type": "refresh"}
+    to_encode = {**(claims or {}), "exp": expire, "sub": subject, "type": "refresh"}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -102,7 +130,7 @@ def create_refresh_token(
 
 def decode_token(token: str):
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = verified_tokens.decode(token)
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -120,17 +148,13 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        logger.debug(f"Received token: {token}")
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        logger.debug(f"Decoded payload: {payload}")
+        payload = verified_tokens.decode(token)
         username: Optional[str] = payload.get("sub")
         jti: Optional[str] = payload.get("jti")
         if username is None:
             logger.error("Username not found in token")
             raise credentials_exception
-        if jti is not None and is_token_blacklisted(jti):
+        if jti is not None and await is_token_blacklisted(jti):
             logger.error("Token is blacklisted")
             raise credentials_exception
         token_data = user_schema.TokenData(username=username)
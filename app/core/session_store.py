@@ -0,0 +1,240 @@
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from .config import settings
+from .redis_client import get_redis
+from .token_blacklist import token_blacklist
+from .token_versions import token_versions
+
+logger = logging.getLogger(__name__)
+
+# 저장된 refresh jti 가 기대값과 같을 때만 새 값으로 바꿉니다.
+_ROTATE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'refresh_jti') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'refresh_jti', ARGV[2], 'last_used_at', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+
+@dataclass
+class SessionRecord:
+    id: str
+    user_id: int
+    refresh_jti: str
+    ver: int
+    created_at: float
+    last_used_at: float
+    ip: Optional[str] = None
+    user_agent: Optional[str] = None
+
+    def to_mapping(self) -> Dict[str, str]:
+        return {
+            "user_id": str(self.user_id),
+            "refresh_jti": self.refresh_jti,
+            "ver": str(self.ver),
+            "created_at": str(self.created_at),
+            "last_used_at": str(self.last_used_at),
+            "ip": self.ip or "",
+            "user_agent": self.user_agent or "",
+        }
+
+    @classmethod
+    def from_mapping(cls, session_id: str, values: dict) -> "SessionRecord":
+        values = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in values.items()
+        }
+        return cls(
+            id=session_id,
+            user_id=int(values["user_id"]),
+            refresh_jti=values["refresh_jti"],
+            ver=int(values["ver"]),
+            created_at=float(values["created_at"]),
+            last_used_at=float(values["last_used_at"]),
+            ip=values.get("ip") or None,
+            user_agent=values.get("user_agent") or None,
+        )
+
+
+class SessionStore:
+    """로그인 세션과 refresh 토큰 저장소.
+
+    세션마다 현재 유효한 refresh 토큰의 jti 를 기억해 두고, 토큰을 쓸 때마다 새 jti 로 교체합니다.
+    이미 교체된 토큰이 다시 들어오면 탈취로 보고 세션을 끝냅니다. 세션에는 발급 당시 토큰 버전이 들어
+    있어, '모든 기기에서 로그아웃'은 토큰 버전을 한 번 올리는 것으로 끝납니다. 세션 하나를 끝낼 때는
+    그 세션의 액세스 토큰도 거부되도록 sid 를 토큰 블랙리스트에 올립니다.
+    REDIS_URL 이 있으면 Redis 해시(``session:{id}``)와 사용자별 집합에 두고, 없으면 프로세스 안에 둡니다.
+    """
+
+    def __init__(self, ttl: int, prefix: str = "session:"):
+        self.ttl = ttl
+        self.prefix = prefix
+        self._sessions: Dict[str, SessionRecord] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._user_sessions: Dict[int, Set[str]] = {}
+
+    def _user_key(self, user_id: int) -> str:
+        return f"user-sessions:{user_id}"
+
+    async def create(self, user_id: int, ip: Optional[str] = None, user_agent: Optional[str] = None) -> SessionRecord:
+        now = time.time()
+        record = SessionRecord(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            refresh_jti=uuid.uuid4().hex,
+            ver=await token_versions.get(user_id, fresh=True),
+            created_at=now,
+            last_used_at=now,
+            ip=ip,
+            user_agent=user_agent[:200] if user_agent else None,
+        )
+        redis = get_redis()
+        if redis is None:
+            self._sessions[record.id] = record
+            self._expires_at[record.id] = now + self.ttl
+            self._user_sessions.setdefault(user_id, set()).add(record.id)
+            return record
+
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.prefix + record.id, mapping=record.to_mapping())
+            pipe.expire(self.prefix + record.id, self.ttl)
+            pipe.sadd(self._user_key(user_id), record.id)
+            pipe.expire(self._user_key(user_id), self.ttl)
+            await pipe.execute()
+        return record
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        """유효한 세션을 반환합니다. 만료됐거나 토큰 버전이 올라간 세션은 None 입니다.
+
+        refresh 토큰은 오래 쓰이므로 로컬 사본이 아니라 Redis 의 토큰 버전과 비교합니다.
+        """
+        redis = get_redis()
+        if redis is None:
+            record = self._sessions.get(session_id)
+            if record is not None and self._expires_at[session_id] <= time.time():
+                self._forget(session_id)
+                record = None
+        else:
+            values = await redis.hgetall(self.prefix + session_id)
+            record = SessionRecord.from_mapping(session_id, values) if values else None
+        if record is None or record.ver < await token_versions.get(record.user_id, fresh=True):
+            return None
+        return record
+
+    async def rotate(self, session_id: str, refresh_jti: str) -> Optional[SessionRecord]:
+        """refresh 토큰을 교체하고 새 jti 가 담긴 세션을 반환합니다.
+
+        세션이 없거나 ``refresh_jti`` 가 이미 교체된 토큰이면 None 을 반환하며, 재사용된 경우 세션도 끝냅니다.
+        """
+        record = await self.get(session_id)
+        if record is None:
+            return None
+
+        new_jti = uuid.uuid4().hex
+        now = time.time()
+        redis = get_redis()
+        if redis is None:
+            rotated = record.refresh_jti == refresh_jti
+            if rotated:
+                record.refresh_jti = new_jti
+                record.last_used_at = now
+                self._expires_at[session_id] = now + self.ttl
+        else:
+            rotated = bool(await redis.eval(
+                _ROTATE_SCRIPT, 1, self.prefix + session_id, refresh_jti, new_jti, str(now), self.ttl
+            ))
+            if rotated:
+                record.refresh_jti = new_jti
+                record.last_used_at = now
+                await redis.expire(self._user_key(record.user_id), self.ttl)
+
+        if not rotated:
+            logger.warning("Refresh token reuse detected for session %s", session_id)
+            await self.revoke(record.user_id, session_id)
+            return None
+        return record
+
+    @staticmethod
+    def revocation_key(session_id: str) -> str:
+        # 블랙리스트의 jti 와 겹치지 않도록 접두사를 붙입니다.
+        return f"sid:{session_id}"
+
+    async def is_revoked(self, session_id: str) -> bool:
+        """끝난 세션인지 확인합니다. 블룸 필터를 거치므로 대부분의 요청은 Redis 를 읽지 않습니다."""
+        return await token_blacklist.is_revoked(self.revocation_key(session_id))
+
+    async def _revoke_access_tokens(self, session_id: str) -> None:
+        # 액세스 토큰의 jti 는 세션에 기록하지 않으므로, 마지막 토큰이 만료될 때까지 sid 를 거부합니다.
+        await token_blacklist.revoke(
+            self.revocation_key(session_id), settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+
+    def _forget(self, session_id: str) -> None:
+        record = self._sessions.pop(session_id, None)
+        self._expires_at.pop(session_id, None)
+        if record is not None:
+            self._user_sessions.get(record.user_id, set()).discard(session_id)
+
+    async def revoke(self, user_id: int, session_id: str) -> bool:
+        redis = get_redis()
+        if redis is None:
+            record = self._sessions.get(session_id)
+            if record is None or record.user_id != user_id:
+                return False
+            await self._revoke_access_tokens(session_id)
+            self._forget(session_id)
+            return True
+
+        # 블랙리스트에 올리지 못하면 세션을 남겨 두어 다시 시도할 수 있게 합니다.
+        if not await redis.sismember(self._user_key(user_id), session_id):
+            return False
+        await self._revoke_access_tokens(session_id)
+        removed = await redis.srem(self._user_key(user_id), session_id)
+        await redis.delete(self.prefix + session_id)
+        return bool(removed)
+
+    async def revoke_all(self, user_id: int) -> None:
+        """사용자의 모든 세션과 이미 발급된 액세스 토큰을 무효화합니다."""
+        await token_versions.bump(user_id)
+        redis = get_redis()
+        if redis is None:
+            for session_id in list(self._user_sessions.pop(user_id, set())):
+                self._sessions.pop(session_id, None)
+                self._expires_at.pop(session_id, None)
+            return
+        # 세션 해시는 버전 비교로 이미 무효이므로 색인만 지우고 나머지는 TTL 로 사라지게 둡니다.
+        await redis.delete(self._user_key(user_id))
+
+    async def list_sessions(self, user_id: int) -> List[SessionRecord]:
+        redis = get_redis()
+        if redis is None:
+            session_ids = list(self._user_sessions.get(user_id, set()))
+        else:
+            session_ids = [
+                session_id.decode() if isinstance(session_id, bytes) else session_id
+                for session_id in await redis.smembers(self._user_key(user_id))
+            ]
+
+        records = []
+        for session_id in session_ids:
+            record = await self.get(session_id)
+            if record is None:
+                if redis is not None:
+                    await redis.srem(self._user_key(user_id), session_id)
+                continue
+            records.append(record)
+        return sorted(records, key=lambda record: record.last_used_at, reverse=True)
+
+    def clear(self) -> None:
+        self._sessions.clear()
+        self._expires_at.clear()
+        self._user_sessions.clear()
+
+
+session_store = SessionStore(ttl=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60)
@@ -0,0 +1,171 @@
+import hashlib
+import logging
+import time
+from typing import Dict, Iterable, Set
+
+from fastapi import HTTPException, status
+
+from .config import settings
+from .redis_client import get_redis, publish, subscribe
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "token-blacklist"
+
+
+class BloomFilter:
+    """jti 가 '확실히 없음'을 빠르게 판단하기 위한 블룸 필터. 거짓 양성만 있고 거짓 음성은 없습니다."""
+
+    def __init__(self, size_bits: int, hash_count: int):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self._bits = bytearray((size_bits + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size_bits
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+
+
+class TokenBlacklist:
+    """로그아웃 등으로 폐기된 토큰(jti) 목록.
+
+    대부분의 토큰은 폐기되지 않았으므로 로컬 블룸 필터가 '없음'을 답하면 Redis 를 조회하지 않습니다.
+    다른 워커가 폐기한 jti 는 pub/sub 으로 받고, 구독할 때마다 Redis 에서 필터를 다시 채웁니다.
+    구독이 끊긴 뒤 다시 채우기 전까지는 놓친 폐기가 있을 수 있으므로 필터를 건너뛰고 Redis 를 조회합니다.
+    Redis 에 닿을 수 없을 때 ``fail_hard`` 가 참이면 토큰을 거부하고, 거짓이면 통과시킵니다.
+    REDIS_URL 이 없으면 프로세스 내 목록이 기준이 됩니다.
+    """
+
+    def __init__(self, bloom_size_bits: int, bloom_hash_count: int, fail_hard: bool, prefix: str = "blacklist:"):
+        self.prefix = prefix
+        self.fail_hard = fail_hard
+        self._bloom = BloomFilter(bloom_size_bits, bloom_hash_count)
+        self._local: Dict[str, float] = {}
+        self._filter_synced = False
+        self.filtered = 0
+        self.lookups = 0
+        self.errors = 0
+
+    def _filter_usable(self) -> bool:
+        # Redis 가 없으면 이 프로세스의 폐기만 있으므로 필터가 항상 최신입니다.
+        return self._filter_synced or get_redis() is None
+
+    async def revoke(self, jti: str, expires_in: int) -> None:
+        self._bloom.add(jti)
+        redis = get_redis()
+        if redis is None:
+            self._local[jti] = time.time() + expires_in
+            return
+        try:
+            await redis.set(self.prefix + jti, "blacklisted", ex=max(int(expires_in), 1))
+        except Exception:
+            # 다른 워커는 Redis 로만 폐기를 확인하므로, 저장하지 못했다면 로그아웃이 된 것처럼 답하지 않습니다.
+            self.errors += 1
+            logger.warning("Token blacklist store failed", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="토큰을 폐기하지 못했습니다. 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": "1"},
+            )
+        await publish(CHANNEL, jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        if self._filter_usable() and jti not in self._bloom:
+            self.filtered += 1
+            return False
+
+        self.lookups += 1
+        redis = get_redis()
+        if redis is None:
+            expires_at = self._local.get(jti)
+            if expires_at is not None and expires_at <= time.time():
+                del self._local[jti]
+                return False
+            return expires_at is not None
+        try:
+            return await redis.exists(self.prefix + jti) == 1
+        except Exception:
+            self.errors += 1
+            logger.warning("Token blacklist lookup failed", exc_info=True)
+            return self.fail_hard
+
+    async def revoked_among(self, jtis: Iterable[str]) -> Set[str]:
+        """여러 jti 중 폐기된 것을 반환합니다. 블룸 필터를 통과한 jti 만 한 번의 파이프라인으로 조회합니다."""
+        candidates = []
+        use_filter = self._filter_usable()
+        for jti in set(jtis):
+            if not use_filter or jti in self._bloom:
+                candidates.append(jti)
+            else:
+                self.filtered += 1
+        if not candidates:
+            return set()
+
+        self.lookups += len(candidates)
+        redis = get_redis()
+        if redis is None:
+            now = time.time()
+            return {jti for jti in candidates if self._local.get(jti, 0) > now}
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for jti in candidates:
+                    pipe.exists(self.prefix + jti)
+                found = await pipe.execute()
+        except Exception:
+            self.errors += 1
+            logger.warning("Token blacklist lookup failed", exc_info=True)
+            return set(candidates) if self.fail_hard else set()
+        return {jti for jti, exists in zip(candidates, found) if exists}
+
+    async def warm(self) -> None:
+        """Redis 에 남아 있는 폐기 토큰으로 블룸 필터를 채웁니다. 끝까지 채운 뒤에야 필터를 씁니다."""
+        redis = get_redis()
+        if redis is None:
+            return
+        async for key in redis.scan_iter(match=self.prefix + "*", count=1000):
+            key = key.decode() if isinstance(key, bytes) else key
+            self._bloom.add(key[len(self.prefix):])
+        self._filter_synced = True
+
+    async def _on_message(self, jti: str) -> None:
+        self._bloom.add(jti)
+
+    def _on_lost(self) -> None:
+        self._filter_synced = False
+
+    def start_sync(self) -> None:
+        # 구독한 뒤에 채워야 채우는 도중의 폐기도 pub/sub 으로 받을 수 있습니다.
+        subscribe(CHANNEL, self._on_message, on_subscribe=self.warm, on_lost=self._on_lost)
+
+    def clear(self) -> None:
+        self._bloom.clear()
+        self._local.clear()
+        self._filter_synced = False
+
+    def stats(self) -> dict:
+        return {
+            "filtered": self.filtered,
+            "lookups": self.lookups,
+            "errors": self.errors,
+            "filter_synced": self._filter_usable(),
+        }
+
+
+token_blacklist = TokenBlacklist(
+    bloom_size_bits=settings.TOKEN_BLACKLIST_BLOOM_BITS,
+    bloom_hash_count=settings.TOKEN_BLACKLIST_BLOOM_HASHES,
+    fail_hard=settings.TOKEN_BLACKLIST_FAIL_HARD,
+)
@@ -0,0 +1,58 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+from jose import jwt
+
+from .config import settings
+
+
+class VerifiedTokenCache:
+    """서명 검증을 마친 JWT 의 클레임 캐시.
+
+    같은 토큰이 반복해서 들어오면 파싱과 HMAC 검증을 다시 하지 않고, 토큰 다이제스트로 클레임을 찾습니다.
+    항목은 토큰의 ``exp`` 까지만 유효하므로 만료된 토큰은 다시 ``jwt.decode`` 를 거쳐 거부됩니다.
+    폐기(블랙리스트, 토큰 버전) 확인은 캐시와 상관없이 호출하는 쪽에서 매번 합니다.
+    """
+
+    def __init__(self, secret_key: str, algorithms: List[str], max_size: int):
+        self.secret_key = secret_key
+        self.algorithms = algorithms
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+
+    def decode(self, token: str) -> dict:
+        """``jwt.decode`` 와 같이 검증된 클레임을 반환하고, 실패하면 JWTError 를 던집니다."""
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, claims = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(claims)
+            del self._entries[key]
+
+        self.misses += 1
+        claims = jwt.decode(token, self.secret_key, algorithms=self.algorithms)
+        if "exp" in claims:
+            self._entries[key] = (float(claims["exp"]), claims)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return dict(claims)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+verified_tokens = VerifiedTokenCache(
+    secret_key=settings.SECRET_KEY,
+    algorithms=[settings.ALGORITHM],
+    max_size=settings.VERIFIED_TOKEN_CACHE_MAX_SIZE,
+)
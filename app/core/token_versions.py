@@ -0,0 +1,131 @@
+import logging
+from typing import Dict, Iterable
+
+from .redis_client import get_redis, publish, subscribe
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "token-versions"
+
+
+class TokenVersions:
+    """사용자별 토큰 버전 카운터.
+
+    액세스 토큰에는 발급 당시의 버전(``ver``)이 들어가며, 버전을 올리면 그 이전에 발급된 토큰은 모두
+    거부됩니다. REDIS_URL 이 있으면 Redis 가 기준값이 되고, 각 워커는 pub/sub 으로 갱신되는 로컬 사본을 읽습니다.
+    구독이 끊긴 동안에는 놓친 갱신이 있을 수 있으므로 로컬 사본을 쓰지 않고, 다시 구독하면 Redis 에서 새로 읽습니다.
+    """
+
+    def __init__(self, prefix: str = "token-version:"):
+        self.prefix = prefix
+        self._versions: Dict[int, int] = {}
+        self._synced = False
+        # 구독이 끊기거나 다시 맺어질 때마다 올려, 그 전에 시작한 조회 결과를 기억하지 않게 합니다.
+        self._generation = 0
+
+    def _cache_usable(self) -> bool:
+        # Redis 가 없으면 이 프로세스의 값이 기준값입니다.
+        return self._synced or get_redis() is None
+
+    def _remember(self, user_id: int, version: int, generation: int) -> int:
+        if self._synced and generation == self._generation:
+            # 조회하는 사이 pub/sub 으로 더 높은 버전을 받았을 수 있습니다.
+            version = max(self._versions.get(user_id, 0), version)
+            self._versions[user_id] = version
+        return version
+
+    async def get(self, user_id: int, fresh: bool = False) -> int:
+        """사용자의 토큰 버전을 반환합니다. ``fresh`` 가 참이면 로컬 사본을 건너뛰고 Redis 에서 읽습니다."""
+        if not fresh and self._cache_usable():
+            version = self._versions.get(user_id)
+            if version is not None:
+                return version
+
+        redis = get_redis()
+        if redis is None:
+            return self._versions.get(user_id, 0)
+        generation = self._generation
+        try:
+            raw = await redis.get(f"{self.prefix}{user_id}")
+        except Exception:
+            # 기준값을 읽지 못했으므로 기억하지 않고 다음 요청에서 다시 조회합니다.
+            logger.warning("Token version lookup failed", exc_info=True)
+            return 0
+        return self._remember(user_id, int(raw or 0), generation)
+
+    async def get_many(self, user_ids: Iterable[int]) -> Dict[int, int]:
+        """여러 사용자의 버전을 반환합니다. 로컬 사본에 없는 값은 MGET 한 번으로 읽습니다."""
+        versions = {}
+        missing = []
+        use_cache = self._cache_usable()
+        for user_id in set(user_ids):
+            version = self._versions.get(user_id) if use_cache else None
+            if version is None:
+                missing.append(user_id)
+            else:
+                versions[user_id] = version
+        if not missing:
+            return versions
+
+        redis = get_redis()
+        if redis is None:
+            versions.update(dict.fromkeys(missing, 0))
+            return versions
+        generation = self._generation
+        try:
+            raws = await redis.mget([f"{self.prefix}{user_id}" for user_id in missing])
+        except Exception:
+            logger.warning("Token version lookup failed", exc_info=True)
+            versions.update(dict.fromkeys(missing, 0))
+            return versions
+        for user_id, raw in zip(missing, raws):
+            versions[user_id] = self._remember(user_id, int(raw or 0), generation)
+        return versions
+
+    async def bump(self, user_id: int) -> int:
+        """사용자의 토큰 버전을 올려 이미 발급된 액세스 토큰을 무효화합니다."""
+        redis = get_redis()
+        if redis is not None:
+            version = await redis.incr(f"{self.prefix}{user_id}")
+        else:
+            version = self._versions.get(user_id, 0) + 1
+        self._versions[user_id] = version
+        await publish(CHANNEL, f"{user_id}:{version}")
+        return version
+
+    async def _on_message(self, message: str) -> None:
+        user_id, version = (int(value) for value in message.split(":", 1))
+        self._versions[user_id] = max(self._versions.get(user_id, 0), version)
+
+    async def resync(self) -> None:
+        """구독한 뒤 로컬 사본을 Redis 에서 다시 읽습니다. 끝까지 읽은 뒤에야 사본을 씁니다."""
+        redis = get_redis()
+        if redis is None:
+            return
+        self._generation += 1
+        generation = self._generation
+        user_ids = list(self._versions)
+        self._versions.clear()
+        raws = []
+        if user_ids:
+            raws = await redis.mget([f"{self.prefix}{user_id}" for user_id in user_ids])
+        if generation != self._generation:
+            return
+        for user_id, raw in zip(user_ids, raws):
+            self._versions[user_id] = max(self._versions.get(user_id, 0), int(raw or 0))
+        self._synced = True
+
+    def _on_lost(self) -> None:
+        self._synced = False
+        self._generation += 1
+
+    def start_sync(self) -> None:
+        # 구독한 뒤에 다시 읽어야 읽는 도중의 갱신도 pub/sub 으로 받을 수 있습니다.
+        subscribe(CHANNEL, self._on_message, on_subscribe=self.resync, on_lost=self._on_lost)
+
+    def clear(self) -> None:
+        self._versions.clear()
+        self._generation += 1
+
+
+token_versions = TokenVersions()
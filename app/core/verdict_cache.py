@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .config import settings
+from .grader import GradingResult
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_code(code: str) -> str:
+    # 줄바꿈 형식과 끝 공백만 정리합니다. 들여쓰기나 문자열 내용은 의미가 있으므로 건드리지 않습니다.
+    return code.replace("\r\n", "\n").replace("\r", "\n").rstrip()
+
+
+def test_cases_version(test_cases: List[dict]) -> str:
+    payload = json.dumps(test_cases, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def verdict_key(submitted_code: str, version: str) -> str:
+    code_hash = hashlib.sha256(normalize_code(submitted_code).encode("utf-8")).hexdigest()
+    return f"{version}:{code_hash}"
+
+
+class VerdictCache:
+    """동일한 제출 코드의 채점 결과 캐시.
+
+    키에 테스트 케이스 내용의 해시가 들어가므로, 관리자가 테스트 케이스를 바꾸면 이전 결과는
+    더 이상 조회되지 않고 LRU/TTL 로 자연스럽게 밀려납니다. REDIS_URL 이 있으면 워커 간에 공유됩니다.
+    """
+
+    def __init__(self, max_size: int, ttl: int, prefix: str = "verdict:"):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, GradingResult]]" = OrderedDict()
+
+    def _remember(self, key: str, result: GradingResult) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[GradingResult]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(self.prefix + key)
+            except Exception:
+                logger.warning("Verdict cache lookup failed", exc_info=True)
+                raw = None
+            if raw is not None:
+                result = GradingResult(**json.loads(raw))
+                self._remember(key, result)
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, result: GradingResult) -> None:
+        if not result.cacheable:
+            return
+        self._remember(key, result)
+
+        redis = get_redis()
+        if redis is not None:
+            payload = json.dumps({"is_correct": result.is_correct, "output": result.output})
+            try:
+                await redis.set(self.prefix + key, payload, ex=self.ttl)
+            except Exception:
+                logger.warning("Verdict cache store failed", exc_info=True)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+verdict_cache = VerdictCache(
+    max_size=settings.VERDICT_CACHE_MAX_SIZE,
+    ttl=settings.VERDICT_CACHE_TTL,
+)
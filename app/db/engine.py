@@ -0,0 +1,135 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 환경별 워커 하나당 기본 풀 크기. DB_POOL_SIZE / DB_MAX_OVERFLOW 로 덮어쓸 수 있습니다.
+POOL_PROFILES: Dict[str, Dict[str, int]] = {
+    "development": {"pool_size": 5, "max_overflow": 5},
+    "test": {"pool_size": 2, "max_overflow": 0},
+    "production": {"pool_size": 10, "max_overflow": 10},
+}
+
+
+class PoolMetrics:
+    def __init__(self, name: str, slow_checkout_ms: float):
+        self.name = name
+        self.slow_checkout_ms = slow_checkout_ms
+        self.checkouts = 0
+        self.slow_checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        if wait * 1000 >= self.slow_checkout_ms:
+            self.slow_checkouts += 1
+            logger.warning("Slow connection checkout from %s pool: %.1f ms", self.name, wait * 1000)
+
+    def snapshot(self) -> dict:
+        checkouts = self.checkouts or 1
+        return {
+            "checkouts": self.checkouts,
+            "slow_checkouts": self.slow_checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.wait_total / checkouts * 1000, 2),
+            "wait_max_ms": round(self.wait_max * 1000, 2),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """연결을 꺼낼 때까지 걸린 시간을 기록하는 커넥션 풀.
+
+    대기 시간에는 풀이 비어 기다린 시간과 새 연결을 만드는 시간이 모두 들어가며,
+    ``slow_checkout_ms`` 를 넘으면 경고를 남깁니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics("default", settings.DB_SLOW_CHECKOUT_MS)
+
+    def connect(self):
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record(time.perf_counter() - started_at)
+
+    def recreate(self):
+        # dispose() 뒤에도 같은 지표를 이어서 씁니다.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_options() -> Dict[str, int]:
+    """환경 프로필과 설정값으로 워커 하나의 풀 크기를 정합니다.
+
+    DB_MAX_CONNECTIONS 가 있으면 WEB_CONCURRENCY 개 워커가 나눠 쓰도록 넘치는 연결부터 줄입니다.
+    """
+    profile = POOL_PROFILES.get(settings.ENVIRONMENT, POOL_PROFILES["development"])
+    pool_size = settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else profile["pool_size"]
+    max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else profile["max_overflow"]
+    if settings.DB_MAX_CONNECTIONS:
+        per_worker = max(settings.DB_MAX_CONNECTIONS // max(settings.WEB_CONCURRENCY, 1), 1)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+    return {"pool_size": pool_size, "max_overflow": max_overflow}
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # 메모리 DB 는 연결마다 내용이 달라지므로 SQLAlchemy 기본 풀을 그대로 씁니다.
+        if parsed.database in (None, "", ":memory:"):
+            return options
+    else:
+        options["pool_pre_ping"] = True
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        **pool_options(),
+    )
+    if parsed.get_backend_name() == "postgresql" and parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)},
+        }
+    return options
+
+
+def create_engine_from_settings(url: str, name: str = "primary") -> AsyncEngine:
+    engine = create_async_engine(url, **engine_options(url))
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = PoolMetrics(name, settings.DB_SLOW_CHECKOUT_MS)
+    return engine
+
+
+def pool_stats(engine: AsyncEngine) -> Optional[dict]:
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **pool.metrics.snapshot(),
+    }
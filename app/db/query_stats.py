@@ -0,0 +1,158 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """한 요청(또는 ``count_queries`` 블록)에서 실행된 SQL 문 집계."""
+
+    def __init__(self, route: Optional[str] = None, scope: Optional[dict] = None):
+        self._route = route
+        self._scope = scope
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    @property
+    def route(self) -> Optional[str]:
+        # 라우팅은 미들웨어보다 뒤에서 일어나므로 필요할 때 scope 에서 경로 템플릿을 읽습니다.
+        if self._scope is not None:
+            route = self._scope.get("route")
+            path = route.path if route is not None else self._scope.get("path")
+            return f"{self._scope.get('method')} {path}"
+        return self._route
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """같은 문장이 ``threshold`` 번 이상 실행됐다면 N+1 로 의심합니다."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+class RouteQueryMetrics:
+    """라우트별 누적 쿼리 지표."""
+
+    def __init__(self, max_routes: int = 500):
+        self.max_routes = max_routes
+        self._routes: Dict[str, dict] = {}
+
+    def record(self, route: str, stats: QueryStats, suspected_n_plus_one: bool) -> None:
+        entry = self._routes.get(route)
+        if entry is None:
+            if len(self._routes) >= self.max_routes:
+                return
+            entry = self._routes[route] = {
+                "requests": 0, "queries": 0, "max_queries": 0, "db_time_ms": 0.0, "n_plus_one": 0,
+            }
+        entry["requests"] += 1
+        entry["queries"] += stats.count
+        entry["max_queries"] = max(entry["max_queries"], stats.count)
+        entry["db_time_ms"] += stats.duration * 1000
+        entry["n_plus_one"] += int(suspected_n_plus_one)
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {
+            route: {
+                **entry,
+                "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                "db_time_ms": round(entry["db_time_ms"], 2),
+            }
+            for route, entry in sorted(self._routes.items())
+        }
+
+    def clear(self) -> None:
+        self._routes.clear()
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+route_query_metrics = RouteQueryMetrics()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started_at")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # 실패한 문장은 after_cursor_execute 가 불리지 않으므로 여기서 시작 시각을 꺼내야 스택이 쌓이지 않습니다.
+    # 결과를 읽다가 난 오류는 statement 가 없고 시작 시각도 이미 꺼냈으므로 건너뜁니다.
+    conn = exception_context.connection
+    if conn is None or exception_context.statement is None:
+        return
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(exception_context.statement, duration)
+
+
+def current_route() -> Optional[str]:
+    stats = _current.get()
+    return stats.route if stats is not None else None
+
+
+@contextmanager
+def count_queries(route: Optional[str] = None, scope: Optional[dict] = None) -> Iterator[QueryStats]:
+    """블록 안에서 실행된 SQL 문을 셉니다."""
+    stats = QueryStats(route, scope)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """테스트용. 블록 안의 SQL 문이 ``max_queries`` 개를 넘으면 실패합니다."""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {count}x {statement}" for statement, count in stats.statements.most_common())
+        raise AssertionError(f"Expected at most {max_queries} queries, got {stats.count}:\n{statements}")
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """요청마다 SQL 문 수와 DB 시간을 세고, 같은 문장이 반복되면 N+1 로 의심해 경고합니다."""
+    with count_queries(scope=request.scope) as stats:
+        response = await call_next(request)
+
+    route_name = stats.route
+    repeated = stats.repeated(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        statement, count = repeated[0]
+        logger.warning("Suspected N+1 on %s: %d identical statements: %s", route_name, count, statement)
+    route_query_metrics.record(route_name, stats, bool(repeated))
+
+    if settings.QUERY_STATS_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.duration * 1000:.2f}"
+        if repeated:
+            response.headers["X-DB-N-Plus-One"] = str(repeated[0][1])
+    return response
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STICKY_COOKIE = "db_primary_until"
+
+# 복제본이 따라잡은 상태(받은 WAL 을 모두 재생)라면 마지막 재생 시각과 상관없이 지연은 0 입니다.
+_PG_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+# 요청마다 미들웨어가 넣는 상태. 요청 밖(백그라운드 작업 등)에서는 None 입니다.
+_request_state: ContextVar[Optional[dict]] = ContextVar("db_request_state", default=None)
+
+
+class PrimarySession(Session):
+    """주 DB 세션. 요청 안에서 커밋하면 이후 읽기를 잠시 주 DB 로 보냅니다."""
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_write(session: Session) -> None:
+    state = _request_state.get()
+    if state is not None:
+        state["wrote"] = True
+
+
+class ReplicaSession(Session):
+    """복제본 세션. 문장 실행이 DB 오류로 실패하면 복제본을 비정상으로 표시하고 같은 문장을 주 DB 세션에서
+    다시 실행합니다. 그 뒤로 이 세션의 문장은 모두 주 DB 에서 실행됩니다.
+    """
+
+    def _run(self, method: str, statement, *args, **kwargs):
+        primary = self.info.get("fallback")
+        if self.info.get("failed_over"):
+            return getattr(primary, method)(statement, *args, **kwargs)
+        try:
+            return getattr(super(), method)(statement, *args, **kwargs)
+        except DBAPIError:
+            if primary is None:
+                raise
+            self.rollback()
+            self.info["router"].fall_back()
+            self.info.update(failed_over=True, replica=False)
+            return getattr(primary, method)(statement, *args, **kwargs)
+
+    def execute(self, statement, *args, **kwargs):
+        return self._run("execute", statement, *args, **kwargs)
+
+    def scalar(self, statement, *args, **kwargs):
+        return self._run("scalar", statement, *args, **kwargs)
+
+    def scalars(self, statement, *args, **kwargs):
+        return self._run("scalars", statement, *args, **kwargs)
+
+
+def _sticky_to_primary() -> bool:
+    state = _request_state.get()
+    return state is not None and state["sticky"]
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """커밋한 클라이언트에게 쿠키를 주고, 쿠키가 유효한 동안에는 읽기도 주 DB 에서 합니다."""
+    try:
+        primary_until = float(request.cookies.get(STICKY_COOKIE, 0))
+    except ValueError:
+        primary_until = 0.0
+    state = {"wrote": False, "sticky": primary_until > time.time()}
+    token = _request_state.set(state)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_state.reset(token)
+    if state["wrote"]:
+        window = settings.READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            STICKY_COOKIE, str(int(time.time() + window)), max_age=int(window), httponly=True, samesite="lax"
+        )
+    return response
+
+
+class ReplicaRouter:
+    """읽기 전용 요청을 복제본으로 보낼지 정합니다.
+
+    복제본 상태와 지연은 ``check_interval`` 초마다 확인하며, 지연이 ``max_lag`` 를 넘거나 연결에 실패하면
+    다음 확인 때까지 주 DB 를 씁니다. 복제본이 설정되지 않았으면 항상 주 DB 입니다.
+    """
+
+    def __init__(self, engine: Optional[AsyncEngine], max_lag: float, check_interval: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.session_factory = (
+            sessionmaker(
+                engine,
+                class_=AsyncSession,
+                sync_session_class=ReplicaSession,
+                expire_on_commit=False,
+                info={"replica": True},
+            )
+            if engine is not None
+            else None
+        )
+        self.healthy = engine is not None
+        self.lag: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.failures = 0
+        self.fallbacks = 0
+        self._lock = asyncio.Lock()
+
+    async def check(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    lag = await conn.scalar(_PG_LAG_QUERY)
+                else:
+                    await conn.execute(text("SELECT 1"))
+                    lag = 0
+            self.lag = float(lag or 0)
+            self.healthy = True
+        except Exception:
+            self.failures += 1
+            self.healthy = False
+            logger.warning("Read replica health check failed, reading from primary", exc_info=True)
+        self.checked_at = time.monotonic()
+
+    def mark_unhealthy(self) -> None:
+        self.healthy = False
+        self.checked_at = time.monotonic()
+
+    def fall_back(self) -> None:
+        """복제본에서 실패한 읽기를 주 DB 에서 다시 실행할 때 호출됩니다."""
+        self.fallbacks += 1
+        self.mark_unhealthy()
+        logger.warning("Read replica query failed, retrying on primary", exc_info=True)
+
+    def _check_due(self) -> bool:
+        return self.checked_at is None or time.monotonic() - self.checked_at >= self.check_interval
+
+    async def use_replica(self) -> bool:
+        if self.engine is None or _sticky_to_primary():
+            return False
+        if self._check_due():
+            async with self._lock:
+                if self._check_due():
+                    await self.check()
+        return self.healthy and self.lag is not None and self.lag <= self.max_lag
+
+    @asynccontextmanager
+    async def session_for_read(self, primary: AsyncSession) -> AsyncIterator[AsyncSession]:
+        if not await self.use_replica():
+            self.primary_reads += 1
+            yield primary
+            return
+
+        self.replica_reads += 1
+        async with self.session_factory(info={"router": self, "fallback": primary.sync_session}) as session:
+            try:
+                yield session
+            except DBAPIError:
+                # 결과를 읽는 도중처럼 문장 실행 밖에서 실패해도 다음 확인 때까지 주 DB 로 보냅니다.
+                self.mark_unhealthy()
+                raise
+
+    def stats(self) -> dict:
+        return {
+            "configured": self.engine is not None,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "failures": self.failures,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    return bool(db.info.get("replica"))
@@ -1,22 +1,35 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.engine import create_engine_from_settings
+from app.db.routing import PrimarySession, ReplicaRouter
 
-# 비동기 엔진 생성
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    pool_recycle=3600,
-    echo=True
+# 비동기 엔진 생성 (풀 크기와 타임아웃은 설정에서 정함)
+engine = create_engine_from_settings(settings.DATABASE_URL)
+
+# 읽기 전용 복제본 (DATABASE_REPLICA_URL 이 없으면 모든 요청이 주 DB 로 감)
+read_engine = (
+    create_engine_from_settings(settings.DATABASE_REPLICA_URL, name="replica")
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+replica_router = ReplicaRouter(
+    read_engine,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_HEALTH_CHECK_INTERVAL,
 )
 
 # 비동기 세션 팩토리 생성
 AsyncSessionLocal = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+    engine, class_=AsyncSession, sync_session_class=PrimarySession, expire_on_commit=False
 )
 
 async def get_async_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_async_read_db(db: AsyncSession = Depends(get_async_db)):
+    """읽기만 하는 엔드포인트용 세션. 복제본이 건강하고 최근에 쓴 적이 없으면 복제본을 씁니다."""
+    async with replica_router.session_for_read(db) as session:
+        yield session
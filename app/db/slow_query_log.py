@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.query_stats import current_route
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def redact(value: Any) -> Any:
+    """숫자와 불리언, NULL 만 남기고 나머지 값은 타입과 길이만 기록합니다."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def calling_service() -> Optional[str]:
+    """쿼리를 실행한 서비스 메서드 이름을 찾습니다.
+
+    비동기 세션은 쿼리를 자식 greenlet 에서 실행하므로, 현재 스택에서 찾지 못하면 부모 greenlet 의
+    스택(``await session.execute`` 를 호출한 코루틴들)을 이어서 살펴봅니다.
+    """
+    frame = sys._getframe(1)
+    current = getcurrent()
+    while True:
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith("app.services."):
+                owner = frame.f_locals.get("self")
+                if owner is not None:
+                    return f"{type(owner).__name__}.{frame.f_code.co_name}"
+                return f"{module}.{frame.f_code.co_name}"
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return None
+        frame = current.gr_frame
+
+
+class SlowQueryLog:
+    """``threshold_ms`` 를 넘은 SQL 문을 구조화된 로그로 남깁니다.
+
+    요청 경로에서는 항목을 큐에 넣기만 하고, EXPLAIN 실행과 로그 기록은 백그라운드 작업이 맡습니다.
+    큐가 가득 차면 항목을 버리고 ``dropped`` 만 셉니다. ``start`` 전에는 아무것도 기록하지 않습니다.
+    """
+
+    def __init__(self, threshold_ms: Optional[float], explain: bool, queue_size: int):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.queue_size = queue_size
+        self.recorded = 0
+        self.dropped = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, engine: Engine, statement: str, parameters: Any, duration: float, error: Optional[str] = None) -> None:
+        if self._queue is None:
+            return
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "duration_ms": round(duration * 1000, 2),
+            "statement": statement,
+            "parameters": redact(parameters),
+            "service": calling_service(),
+            "route": current_route(),
+        }
+        if error is not None:
+            entry["error"] = error
+        try:
+            # 원래 파라미터는 EXPLAIN 에만 쓰고 로그에는 남기지 않습니다.
+            self._queue.put_nowait((engine, statement, parameters, entry))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _explain(self, engine: Engine, statement: str, parameters: Any) -> Optional[str]:
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        if engine.dialect.name == "postgresql":
+            prefix = "EXPLAIN (ANALYZE off) "
+        elif engine.dialect.name == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            prefix = "EXPLAIN "
+        async with AsyncEngine(engine).connect() as conn:
+            conn = await conn.execution_options(slow_query_log=False)
+            result = await conn.exec_driver_sql(prefix + statement, parameters)
+            return "\n".join(str(row[-1]) for row in result)
+
+    async def _write(self) -> None:
+        while True:
+            engine, statement, parameters, entry = await self._queue.get()
+            try:
+                if self.explain:
+                    try:
+                        entry["plan"] = await self._explain(engine, statement, parameters)
+                    except Exception as e:
+                        entry["plan_error"] = str(e)
+                logger.warning("Slow query %s", json.dumps(entry, ensure_ascii=False, default=str))
+                self.recorded += 1
+            except Exception:
+                logger.exception("Failed to write slow query log entry")
+            finally:
+                self._queue.task_done()
+
+    def start(self) -> None:
+        if self.threshold_ms is None or self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._write())
+
+    async def drain(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        await self.drain()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    queue_size=settings.SLOW_QUERY_LOG_QUEUE_SIZE,
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if slow_query_log._queue is not None:
+        conn.info.setdefault("slow_query_started_at", []).append(time.perf_counter())
+
+
+def _finish(conn, statement: str, parameters: Any, executemany: bool, error: Optional[str] = None) -> None:
+    started = conn.info.get("slow_query_started_at")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    if (
+        duration * 1000 >= slow_query_log.threshold_ms
+        and not executemany
+        and conn.get_execution_options().get("slow_query_log", True)
+    ):
+        slow_query_log.record(conn.engine, statement, parameters, duration, error)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish(conn, statement, parameters, executemany)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # 실패한 문장(문장 시간 제한에 걸린 쿼리 등)도 시작 시각을 꺼내고, 느렸다면 오류와 함께 기록합니다.
+    # 결과를 읽다가 난 오류는 statement 가 없고 시작 시각도 이미 꺼냈으므로 건너뜁니다.
+    conn = exception_context.connection
+    if conn is None or exception_context.statement is None:
+        return
+    context = exception_context.execution_context
+    _finish(
+        conn,
+        exception_context.statement,
+        exception_context.parameters,
+        bool(context is not None and context.executemany),
+        error=type(exception_context.original_exception).__name__,
+    )
@@ -4,11 +4,25 @@ from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.db.base import Base
-from app.db.session import engine
-from app.api.v1 import auth, users, admin, courses, payment, mission, certificates
+from app.db.session import engine, AsyncSessionLocal
+from app.db.routing import read_your_writes_middleware
+from app.db.query_stats import query_stats_middleware
+from app.db.slow_query_log import slow_query_log
+from app.api.v1 import auth, users, admin, courses, payment, mission, certificates, internal
 from dotenv import load_dotenv
 import logging
 from app.core.config import settings
+from app.core.grader import grader
+from app.core.redis_client import close_redis
+from app.services.mission_service import MissionService
+from app.services.submission_queue import submission_queue
+from app.services.answer_key_index import answer_key_index
+from app.services.mission_catalog import mission_catalog
+from app.core.principal_cache import principal_cache
+from app.core.token_versions import token_versions
+from app.core.token_blacklist import token_blacklist
+from app.core.password_hasher import password_hasher
+from app.core.password_cost import configure_password_cost
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
@@ -20,8 +34,41 @@ load_dotenv()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 시작 시 실행할 코드
+    slow_query_log.start()
+    await grader.start()
+    try:
+        await configure_password_cost()
+    except Exception:
+        logger.warning("Failed to configure bcrypt rounds", exc_info=True)
+    try:
+        async with AsyncSessionLocal() as db:
+            await answer_key_index.warm(db)
+    except Exception:
+        # DB 가 아직 준비되지 않았다면 색인은 조회 시점에 채워집니다.
+        logger.warning("Failed to warm answer key index", exc_info=True)
+    answer_key_index.start_sync()
+    mission_catalog.start_sync()
+    principal_cache.start_sync()
+    token_versions.start_sync()
+    # 블룸 필터는 구독할 때마다 다시 채워지며, 채워지기 전에는 Redis 를 직접 조회합니다.
+    token_blacklist.start_sync()
+    submission_queue.start(
+        MissionService().process_queued_submission, settings.SUBMISSION_QUEUE_WORKERS
+    )
+    try:
+        async with AsyncSessionLocal() as db:
+            requeued = await MissionService().requeue_pending_submissions(db)
+        if requeued:
+            logger.info("Requeued %d pending code submissions", requeued)
+    except Exception:
+        logger.warning("Failed to requeue pending code submissions", exc_info=True)
     yield
     # 종료 시 실행할 코드
+    await submission_queue.stop()
+    await grader.stop()
+    password_hasher.shutdown()
+    await slow_query_log.stop()
+    await close_redis()
 
 app = FastAPI(
     lifespan=lifespan,
@@ -56,10 +103,13 @@ app.include_router(courses.router, prefix="")
 app.include_router(payment.router, prefix="")
 app.include_router(mission.router, prefix="")
 app.include_router(certificates.router, prefix="")
+app.include_router(internal.router, prefix="")
 
 
 
 
+app.middleware("http")(read_your_writes_middleware)
+app.middleware("http")(query_stats_middleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # 실제 배포 시에는 구체적인 origin을 지정하세요
@@ -1,4 +1,4 @@
-from sqlalchemy import Float, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Float, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..db.base import Base
 from typing import List, Optional
@@ -58,6 +58,7 @@ class LessonStep(Base):
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (Index("ix_enrollments_user_id_course_id", "user_id", "course_id", unique=True),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
@@ -70,6 +71,7 @@ class Enrollment(Base):
 
 class LessonProgress(Base):
     __tablename__ = "lesson_progress"
+    __table_args__ = (Index("ix_lesson_progress_user_id_lesson_id", "user_id", "lesson_id", unique=True),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
@@ -83,6 +85,7 @@ class LessonProgress(Base):
 
 class Certificate(Base):
     __tablename__ = "certificates"
+    __table_args__ = (Index("ix_certificates_user_id_course_id", "user_id", "course_id", unique=True),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Boolean, ForeignKey, JSON, DateTime
+from sqlalchemy import Integer, String, Boolean, ForeignKey, JSON, DateTime, Float, UniqueConstraint, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from ..db.base import Base
@@ -37,11 +37,24 @@ class CodeSubmissionMission(Base):
     mission_id: Mapped[int] = mapped_column(Integer, ForeignKey("missions.id"), unique=True)
     problem_description: Mapped[str] = mapped_column(String, nullable=False)
     initial_code: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    test_cases: Mapped[List[dict]] = mapped_column(JSON, nullable=False)
+    # 테스트 케이스 본문은 mission_test_cases 에 내용 해시로 따로 보관하고, 여기에는 요약만 둡니다.
+    test_cases_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    test_case_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     mission: Mapped["Mission"] = relationship("Mission", back_populates="code_submission")
 
 
+class MissionTestCase(Base):
+    __tablename__ = "mission_test_cases"
+    __table_args__ = (UniqueConstraint("suite_hash", "position"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    suite_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    input: Mapped[str] = mapped_column(String, nullable=False)
+    expected_output: Mapped[str] = mapped_column(String, nullable=False)
+
+
 class MissionSubmission(Base):
     __tablename__ = "mission_submissions"
 
@@ -50,6 +63,15 @@ class MissionSubmission(Base):
     mission_id: Mapped[int] = mapped_column(Integer, ForeignKey("missions.id"))
     submitted_answer: Mapped[str] = mapped_column(String, nullable=False)
     is_correct: Mapped[bool] = mapped_column(Boolean, default=False)
+    status: Mapped[str] = mapped_column(String(20), default="completed", server_default="completed")
+    # 대기열 워커가 채점을 맡은 시각. 여러 워커가 같은 제출을 동시에 채점하지 않도록 씁니다.
+    grading_started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # 코드 채점 자원 사용량 (객관식 제출은 비어 있음)
+    cpu_time_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    wall_time_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    peak_memory_kb: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    test_case_timings: Mapped[Optional[List[dict]]] = mapped_column(JSON, nullable=True)
+    verdict_cached: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
     submitted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     user: Mapped["User"] = relationship("User", back_populates="missions_submissions")
@@ -1,4 +1,4 @@
-from sqlalchemy import Float, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Float, Integer, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..db.base import Base
 import enum
@@ -21,6 +21,7 @@ class PaymentStatus(enum.Enum):
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (Index("ix_payments_user_id_created_at", "user_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
@@ -1,13 +0,0 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
-from ..db.base_class import Base
-
-
-class Session(Base):
-    __tablename__ = "sessions"
-
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    expires_at = Column(DateTime)
-
-    user = relationship("User", back_populates="sessions")
\ No newline at end of file
@@ -10,10 +10,22 @@ class MultipleChoiceMissionSchema(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class MissionTestCaseSchema(BaseModel):
+    input: str
+    expected_output: str
+
+
+class CodeSubmissionMissionCreate(BaseModel):
+    problem_description: str
+    initial_code: Optional[str] = None
+    test_cases: List[MissionTestCaseSchema]
+
+
 class CodeSubmissionMissionSchema(BaseModel):
     problem_description: str
     initial_code: Optional[str] = None
-    test_cases: List[dict]
+    test_case_count: int
+    test_cases_hash: str
 
     model_config = {"from_attributes": True}
 
@@ -33,7 +45,7 @@ class MissionCreate(BaseModel):
     type: str
     exam_type: str
     multiple_choice: Optional[MultipleChoiceMissionSchema] = None
-    code_submission: Optional[CodeSubmissionMissionSchema] = None
+    code_submission: Optional[CodeSubmissionMissionCreate] = None
 
 
 class MissionInDB(MissionBase):
@@ -63,5 +75,47 @@ class MissionSubmissionInDB(MissionSubmissionBase):
     user_id: int
     mission_id: int
     is_correct: bool
+    status: str = "completed"
     submitted_at: datetime
     multiple_choice: Optional[MultipleChoiceSubmissionSchema] = None
+
+
+class ExamAnswer(BaseModel):
+    mission_id: int
+    selected_option: str = Field(..., pattern="^[A-E]$")
+
+
+class ExamSubmissionCreate(BaseModel):
+    answers: List[ExamAnswer] = Field(..., min_length=1, max_length=200)
+
+
+class ExamAnswerResult(BaseModel):
+    submission_id: int
+    mission_id: int
+    selected_option: str
+    is_correct: bool
+
+
+class ExamSubmissionResult(BaseModel):
+    total: int
+    correct: int
+    results: List[ExamAnswerResult]
+
+
+class MissionSubmissionStatus(BaseModel):
+    id: int
+    mission_id: int
+    status: str
+    is_correct: Optional[bool] = None
+    submitted_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class MissionGradingCost(BaseModel):
+    mission_id: int
+    submissions: int
+    avg_cpu_time_ms: float
+    max_cpu_time_ms: float
+    avg_wall_time_ms: float
+    max_peak_memory_kb: Optional[int] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from ..models.user import UserRole
 from datetime import datetime
 
@@ -71,6 +71,15 @@ class TokenData(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class Principal(BaseModel):
+    """액세스 토큰 클레임만으로 만든 인증 주체. 사용자 행을 읽지 않습니다."""
+    id: int
+    username: str
+    role: UserRole
+    is_active: bool
+    session_id: Optional[str] = None
+
+
 class Certificate(BaseModel):
     id: int
     course_id: int
@@ -92,6 +101,28 @@ class TokenPair(Token):
     refresh_token: str
 
 
+class TokenIntrospectionRequest(BaseModel):
+    tokens: List[str] = Field(..., min_length=1)
+
+
+class TokenIntrospection(BaseModel):
+    active: bool
+    sub: Optional[str] = None
+    uid: Optional[int] = None
+    role: Optional[UserRole] = None
+    exp: Optional[int] = None
+    sid: Optional[str] = None
+
+
+class SessionInfo(BaseModel):
+    id: str
+    created_at: datetime
+    last_used_at: datetime
+    ip: Optional[str] = None
+    user_agent: Optional[str] = None
+    current: bool = False
+
+
 user_schema = {
     "UserBase": UserBase,
     "UserCreate": UserCreate,
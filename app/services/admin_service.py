@@ -1,11 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from ..models.user import User
 from ..models.courses import Course
+from ..models.mission import MissionSubmission
 from ..schemas import user as user_schema
 from ..schemas import courses as course_schema
+from ..schemas import mission as mission_schema
 from fastapi import HTTPException
 from typing import List
+from ..core.principal_cache import principal_cache
+from ..core.token_versions import token_versions
 
 
 class AdminService:
@@ -26,6 +30,7 @@ class AdminService:
         for key, value in user_data.items():
             setattr(user, key, value)
         await db.commit()
+        await principal_cache.invalidate(user.username)
         await db.refresh(user)
         return user
 
@@ -33,6 +38,13 @@ class AdminService:
         user = await self.get_user_by_id(db, user_id)
         await db.delete(user)
         await db.commit()
+        await principal_cache.invalidate(user.username)
+        await token_versions.bump(user.id)
+
+    async def revoke_user_tokens(self, db: AsyncSession, user_id: int) -> None:
+        """사용자의 토큰 버전을 올려 이미 발급된 액세스 토큰을 모두 무효화합니다."""
+        user = await self.get_user_by_id(db, user_id)
+        await token_versions.bump(user.id)
 
     async def create_course(self, db: AsyncSession, course: course_schema.CourseCreate) -> Course:
         new_course = Course(**course.model_dump())
@@ -61,3 +73,34 @@ class AdminService:
         await db.delete(course)
         await db.commit()
 
+    async def get_mission_grading_costs(self, db: AsyncSession, limit: int = 20) -> List[mission_schema.MissionGradingCost]:
+        # 캐시 적중은 코드를 실행하지 않았으므로 비용 집계에서 제외합니다.
+        avg_cpu = func.avg(MissionSubmission.cpu_time_ms)
+        result = await db.execute(
+            select(
+                MissionSubmission.mission_id,
+                func.count(MissionSubmission.id),
+                avg_cpu,
+                func.max(MissionSubmission.cpu_time_ms),
+                func.avg(MissionSubmission.wall_time_ms),
+                func.max(MissionSubmission.peak_memory_kb),
+            )
+            .where(
+                MissionSubmission.cpu_time_ms.is_not(None),
+                MissionSubmission.verdict_cached.is_(False),
+            )
+            .group_by(MissionSubmission.mission_id)
+            .order_by(avg_cpu.desc())
+            .limit(limit)
+        )
+        return [
+            mission_schema.MissionGradingCost(
+                mission_id=mission_id,
+                submissions=submissions,
+                avg_cpu_time_ms=avg_cpu_time_ms,
+                max_cpu_time_ms=max_cpu_time_ms,
+                avg_wall_time_ms=avg_wall_time_ms,
+                max_peak_memory_kb=max_peak_memory_kb,
+            )
+            for mission_id, submissions, avg_cpu_time_ms, max_cpu_time_ms, avg_wall_time_ms, max_peak_memory_kb in result.all()
+        ]
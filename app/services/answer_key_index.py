@@ -0,0 +1,112 @@
+import logging
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import redis_client
+from ..models.mission import Mission, MultipleChoiceMission
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "answer-keys"
+# 객관식이 아닌 미션임을 표시하는 값 (정답 보기는 A-E 이므로 겹치지 않음)
+NOT_MULTIPLE_CHOICE = 0xFF
+
+
+class AnswerKeyIndex:
+    """객관식 미션의 정답 색인.
+
+    mission_id 를 위치로 쓰는 bytearray 에 정답 보기 한 글자를 담습니다. 0 은 아직 모르는 미션,
+    0xFF 는 객관식이 아닌 미션입니다. 모르는 미션은 DB 에서 정답 컬럼만 읽어 채우고, 미션이
+    생성/수정되면 Redis pub/sub 으로 다른 워커에도 알립니다.
+    """
+
+    def __init__(self):
+        self._answers = bytearray()
+
+    def __len__(self) -> int:
+        return sum(1 for value in self._answers if value and value != NOT_MULTIPLE_CHOICE)
+
+    def _store(self, mission_id: int, value: int) -> None:
+        if mission_id >= len(self._answers):
+            self._answers.extend(bytes(mission_id + 1 - len(self._answers)))
+        self._answers[mission_id] = value
+
+    def _lookup(self, mission_id: int) -> int:
+        if 0 <= mission_id < len(self._answers):
+            return self._answers[mission_id]
+        return 0
+
+    def set(self, mission_id: int, correct_answer: Optional[str]) -> None:
+        self._store(mission_id, ord(correct_answer) if correct_answer else NOT_MULTIPLE_CHOICE)
+
+    def discard(self, mission_id: int) -> None:
+        if 0 <= mission_id < len(self._answers):
+            self._answers[mission_id] = 0
+
+    def clear(self) -> None:
+        self._answers = bytearray()
+
+    async def warm(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(MultipleChoiceMission.mission_id, MultipleChoiceMission.correct_answer)
+            .join(Mission, Mission.id == MultipleChoiceMission.mission_id)
+            .where(Mission.type == "multiple_choice")
+        )
+        answers = bytearray()
+        for mission_id, correct_answer in result.all():
+            if mission_id >= len(answers):
+                answers.extend(bytes(mission_id + 1 - len(answers)))
+            answers[mission_id] = ord(correct_answer)
+        self._answers = answers
+
+    async def get_many(self, db: AsyncSession, mission_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        """미션별 정답을 반환합니다. 객관식이 아니거나 없는 미션은 None 입니다.
+
+        색인에 없는 미션만 한 번의 쿼리로 DB 에서 읽어 채웁니다.
+        """
+        answers: Dict[int, Optional[str]] = {}
+        unknown = []
+        for mission_id in mission_ids:
+            value = self._lookup(mission_id)
+            if value == 0:
+                unknown.append(mission_id)
+            else:
+                answers[mission_id] = None if value == NOT_MULTIPLE_CHOICE else chr(value)
+
+        if unknown:
+            result = await db.execute(
+                select(Mission.id, Mission.type, MultipleChoiceMission.correct_answer)
+                .outerjoin(MultipleChoiceMission, MultipleChoiceMission.mission_id == Mission.id)
+                .where(Mission.id.in_(unknown))
+            )
+            for mission_id, mission_type, correct_answer in result.all():
+                if mission_type != "multiple_choice":
+                    correct_answer = None
+                self.set(mission_id, correct_answer)
+                answers[mission_id] = correct_answer
+            for mission_id in unknown:
+                answers.setdefault(mission_id, None)
+        return answers
+
+    async def get(self, db: AsyncSession, mission_id: int) -> Optional[str]:
+        return (await self.get_many(db, [mission_id]))[mission_id]
+
+    async def publish(self, mission_id: int, correct_answer: Optional[str]) -> None:
+        """미션 생성/수정 후 호출합니다. 이 워커의 색인을 갱신하고 다른 워커에 알립니다."""
+        self.set(mission_id, correct_answer)
+        await redis_client.publish(CHANNEL, f"{mission_id}:{correct_answer or ''}")
+
+    async def _on_message(self, message: str) -> None:
+        try:
+            mission_id, correct_answer = message.split(":", 1)
+            self.set(int(mission_id), correct_answer or None)
+        except ValueError:
+            logger.warning("Ignoring malformed answer key message: %r", message)
+
+    def start_sync(self) -> None:
+        redis_client.subscribe(CHANNEL, self._on_message)
+
+
+answer_key_index = AnswerKeyIndex()
@@ -1,17 +1,39 @@
 from datetime import timedelta, datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from ..models.user import User
 from ..schemas import user as user_schema
 from ..core import config
-from ..core.security import verify_password, create_access_token, create_refresh_token, decode_token
-from fastapi import HTTPException, status
+from ..core.security import (
+    verify_password_async, get_password_hash_async, password_needs_rehash,
+    create_access_token, create_refresh_token, principal_claims, blacklist_token, blacklisted_jtis,
+)
+from ..core.token_cache import verified_tokens
+from fastapi import BackgroundTasks, HTTPException, status
+from typing import List, Optional
+from ..core.principal_cache import principal_cache
+from ..core.login_limiter import login_limiter
+from ..core.session_store import SessionRecord, session_store
+from ..core.token_versions import token_versions
+from ..db.session import AsyncSessionLocal
+from jose import JWTError
 
 class AuthService:
-    async def authenticate_user(self, db: AsyncSession, username: str, password: str) -> user_schema.TokenPair:
+    async def authenticate_user(
+        self,
+        db: AsyncSession,
+        username: str,
+        password: str,
+        background_tasks: Optional[BackgroundTasks] = None,
+        client_ip: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> user_schema.TokenPair:
+        # 한도를 넘은 시도는 DB 조회와 bcrypt 검증 전에 거절합니다.
+        await login_limiter.check(username, client_ip)
+
         result = await db.execute(select(User).where(User.username == username))
         user = result.scalar_one_or_none()
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="사용자 이름이나 비밀번호가 틀렸습니다.",
@@ -20,36 +42,165 @@ class AuthService:
 
         user.last_login = datetime.utcnow()
         await db.commit()
+        await login_limiter.reset(username)
+
+        if background_tasks is not None and password_needs_rehash(user.hashed_password):
+            # 응답이 나간 뒤에 현재 rounds 로 다시 해시합니다.
+            background_tasks.add_task(self.rehash_password, user.id, user.hashed_password, password)
 
+        record = await session_store.create(user.id, client_ip, user_agent)
+        return await self._issue_tokens(user, record)
+
+    async def _issue_tokens(self, user: User, record: SessionRecord) -> user_schema.TokenPair:
         access_token_expires = timedelta(minutes=config.settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         refresh_token_expires = timedelta(days=config.settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        
+
         access_token = create_access_token(
-            subject=user.username, expires_delta=access_token_expires
+            subject=user.username,
+            expires_delta=access_token_expires,
+            claims={**principal_claims(user, record.ver), "sid": record.id},
         )
         refresh_token = create_refresh_token(
-            subject=user.username, expires_delta=refresh_token_expires
+            subject=user.username,
+            expires_delta=refresh_token_expires,
+            claims={"sid": record.id, "jti": record.refresh_jti},
         )
-        
         return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
-    async def refresh_token(self, db: AsyncSession, refresh_token: str) -> user_schema.Token:
+    async def refresh_token(self, db: AsyncSession, refresh_token: str) -> user_schema.TokenPair:
         try:
-            payload = decode_token(refresh_token)
-            username: str = payload.get("sub")
-            if username is None:
-                raise HTTPException(status_code=401, detail="Invalid refresh token")
-        except:
+            payload = verified_tokens.decode(refresh_token)
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+        if payload.get("type") != "refresh" or "sid" not in payload or "jti" not in payload:
             raise HTTPException(status_code=401, detail="Invalid refresh token")
 
-        result = await db.execute(select(User).where(User.username == username))
-        user = result.scalar_one_or_none()
-        if user is None:
+        # 쓸 때마다 새 refresh 토큰으로 바꾸고, 이미 바뀐 토큰이 다시 오면 세션을 끝냅니다.
+        record = await session_store.rotate(payload["sid"], payload["jti"])
+        if record is None:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+        user = await db.get(User, record.user_id)
+        if user is None or not user.is_active:
+            await session_store.revoke(record.user_id, record.id)
             raise HTTPException(status_code=401, detail="User not found")
 
-        access_token_expires = timedelta(minutes=config.settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            subject=user.username, expires_delta=access_token_expires
-        )
+        return await self._issue_tokens(user, record)
+
+    async def logout(self, access_token: str) -> None:
+        try:
+            payload = verified_tokens.decode(access_token)
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        if "sid" in payload and "uid" in payload:
+            await session_store.revoke(payload["uid"], payload["sid"])
+        jti = payload.get("jti")
+        if jti is None:
+            return
+        # 토큰이 만료될 때까지만 블랙리스트에 남겨 둡니다.
+        expires_in = int(payload["exp"] - datetime.utcnow().timestamp())
+        if expires_in > 0:
+            await blacklist_token(jti, expires_in)
 
-        return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    async def introspect_tokens(self, db: AsyncSession, tokens: List[str]) -> List[user_schema.TokenIntrospection]:
+        """여러 액세스 토큰을 한 번에 확인합니다.
+
+        블랙리스트는 파이프라인 한 번, 사용자는 ``IN`` 쿼리 한 번으로 확인하며 결과는 요청 순서를 따릅니다.
+        """
+        if len(tokens) > config.settings.INTROSPECTION_MAX_BATCH:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"A batch may contain at most {config.settings.INTROSPECTION_MAX_BATCH} tokens",
+            )
+
+        payloads: List[Optional[dict]] = []
+        for token in tokens:
+            try:
+                payload = verified_tokens.decode(token)
+            except JWTError:
+                payload = None
+            if payload is not None and (payload.get("type") == "refresh" or "sub" not in payload):
+                payload = None
+            payloads.append(payload)
+
+        valid = [payload for payload in payloads if payload is not None]
+        # 끝난 세션의 토큰도 같은 블랙리스트 조회로 걸러냅니다.
+        session_keys = {
+            payload["sid"]: session_store.revocation_key(payload["sid"])
+            for payload in valid if "sid" in payload
+        }
+        jtis = [payload["jti"] for payload in valid if "jti" in payload]
+        revoked = await blacklisted_jtis(jtis + list(session_keys.values()))
+        user_ids = {payload["uid"] for payload in valid if "uid" in payload}
+        usernames = {payload["sub"] for payload in valid if "uid" not in payload}
+
+        users = []
+        if user_ids or usernames:
+            result = await db.execute(
+                select(User).where(or_(User.id.in_(user_ids), User.username.in_(usernames)))
+            )
+            users = result.scalars().all()
+        by_id = {user.id: user for user in users}
+        by_username = {user.username: user for user in users}
+        versions = await token_versions.get_many(by_id)
+
+        results = []
+        for payload in payloads:
+            user = None
+            if (
+                payload is not None
+                and payload.get("jti") not in revoked
+                and session_keys.get(payload.get("sid")) not in revoked
+            ):
+                user = by_id.get(payload["uid"]) if "uid" in payload else by_username.get(payload["sub"])
+            if (
+                user is None
+                or not user.is_active
+                or ("ver" in payload and payload["ver"] < versions[user.id])
+            ):
+                results.append(user_schema.TokenIntrospection(active=False))
+                continue
+            results.append(user_schema.TokenIntrospection(
+                active=True,
+                sub=user.username,
+                uid=user.id,
+                role=user.role,
+                exp=payload["exp"],
+                sid=payload.get("sid"),
+            ))
+        return results
+
+    async def logout_all(self, user_id: int) -> None:
+        await session_store.revoke_all(user_id)
+
+    async def list_sessions(self, user_id: int, current_session_id: Optional[str] = None) -> List[user_schema.SessionInfo]:
+        return [
+            user_schema.SessionInfo(
+                id=record.id,
+                created_at=datetime.utcfromtimestamp(record.created_at),
+                last_used_at=datetime.utcfromtimestamp(record.last_used_at),
+                ip=record.ip,
+                user_agent=record.user_agent,
+                current=record.id == current_session_id,
+            )
+            for record in await session_store.list_sessions(user_id)
+        ]
+
+    async def revoke_session(self, user_id: int, session_id: str) -> None:
+        if not await session_store.revoke(user_id, session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+
+    async def rehash_password(self, user_id: int, old_hash: str, password: str, session_factory=AsyncSessionLocal) -> None:
+        new_hash = await get_password_hash_async(password)
+        async with session_factory() as db:
+            # 그 사이 비밀번호가 바뀌었다면 덮어쓰지 않습니다.
+            result = await db.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+                .returning(User.username)
+            )
+            username = result.scalar_one_or_none()
+            await db.commit()
+        if username is not None:
+            await principal_cache.invalidate(username)
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from ..models.courses import Certificate, Course
 from ..models.user import User
 from ..schemas import certificates as cert_schema
@@ -26,7 +27,12 @@ class CertificateService:
             certificate_number=str(uuid.uuid4()),
         )
         db.add(new_cert)
-        await db.commit()
+        try:
+            await db.commit()
+        except IntegrityError:
+            # 같은 과정의 수료증을 동시에 발급하면 확인을 통과한 뒤 유니크 인덱스에 걸릴 수 있습니다.
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Certificate already issued")
         await db.refresh(new_cert)
 
         course_query = select(Course).filter(Course.id == course_id)
@@ -48,22 +54,19 @@ class CertificateService:
         return new_cert
 
     async def verify_certificate(self, db: AsyncSession, certificate_number: str) -> cert_schema.CertificateVerification:
-        query = select(Certificate).filter(
-            Certificate.certificate_number == certificate_number
+        # 사용자와 과정을 함께 읽어 한 번의 쿼리로 끝냅니다.
+        query = (
+            select(Certificate, User, Course)
+            .outerjoin(User, User.id == Certificate.user_id)
+            .outerjoin(Course, Course.id == Certificate.course_id)
+            .filter(Certificate.certificate_number == certificate_number)
         )
         result = await db.execute(query)
-        certificate = result.scalar_one_or_none()
+        row = result.one_or_none()
 
-        if not certificate:
+        if not row:
             raise HTTPException(status_code=404, detail="Certificate not found")
-
-        user_query = select(User).filter(User.id == certificate.user_id)
-        user_result = await db.execute(user_query)
-        user = user_result.scalar_one_or_none()
-
-        course_query = select(Course).filter(Course.id == certificate.course_id)
-        course_result = await db.execute(course_query)
-        course = course_result.scalar_one_or_none()
+        certificate, user, course = row
 
         user_name = "Unknown"
         if user:
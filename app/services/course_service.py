@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from ..models.courses import Course, Enrollment, Lesson, LessonProgress
 from ..schemas import courses as course_schema
 from fastapi import HTTPException
@@ -54,7 +55,12 @@ class CourseService:
 
         new_enrollment = Enrollment(user_id=user_id, course_id=course_id)
         db.add(new_enrollment)
-        await db.commit()
+        try:
+            await db.commit()
+        except IntegrityError:
+            # 같은 과목을 동시에 등록하면 확인을 통과한 뒤 유니크 인덱스에 걸릴 수 있습니다.
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="이미 등록된 과목입니다.")
         await db.refresh(new_enrollment)
 
         return new_enrollment
@@ -138,6 +144,23 @@ class CourseService:
         await db.commit()
 
     async def update_lesson_progress(self, db: AsyncSession, lesson_id: int, user_id: int, progress: course_schema.LessonProgressUpdate) -> LessonProgress:
+        try:
+            lesson_progress = await self._save_lesson_progress(db, lesson_id, user_id, progress)
+        except IntegrityError:
+            # 같은 레슨의 첫 진도를 동시에 저장하면 한쪽이 유니크 인덱스에 걸리므로,
+            # 먼저 만들어진 행을 갱신합니다.
+            await db.rollback()
+            lesson_progress = await self._save_lesson_progress(db, lesson_id, user_id, progress)
+        await db.refresh(lesson_progress)
+        return lesson_progress
+
+    async def _save_lesson_progress(
+        self,
+        db: AsyncSession,
+        lesson_id: int,
+        user_id: int,
+        progress: course_schema.LessonProgressUpdate,
+    ) -> LessonProgress:
         lesson_progress_result = await db.execute(
             select(LessonProgress).where(
                 LessonProgress.lesson_id == lesson_id,
@@ -154,7 +177,6 @@ class CourseService:
         lesson_progress.is_completed = progress.is_completed
 
         await db.commit()
-        await db.refresh(lesson_progress)
         return lesson_progress
 
     async def get_lesson_progress(self, db: AsyncSession, lesson_id: int, user_id: int) -> LessonProgress:
@@ -0,0 +1,84 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from ..core import redis_client
+from ..core.config import settings
+
+CHANNEL = "mission-catalog"
+
+
+@dataclass
+class CatalogPage:
+    body: bytes
+    etag: str
+    total: int
+
+
+class MissionCatalogCache:
+    """직렬화가 끝난 미션 목록 페이지 캐시.
+
+    페이지마다 JSON 바이트와 내용 해시로 만든 ETag 를 보관합니다. 미션이 바뀌면 ``invalidate`` 로
+    세대를 올리고, Redis pub/sub 으로 다른 워커의 캐시도 비웁니다.
+    """
+
+    def __init__(self, max_pages: int = 64):
+        self.max_pages = max_pages
+        self.generation = 0
+        self.cleared_at = 0.0
+        self._pages: "OrderedDict[Tuple[int, int], CatalogPage]" = OrderedDict()
+
+    def get(self, skip: int, limit: int) -> Optional[CatalogPage]:
+        page = self._pages.get((skip, limit))
+        if page is not None:
+            self._pages.move_to_end((skip, limit))
+        return page
+
+    def settled(self, max_lag: float) -> bool:
+        """마지막 변경 뒤 ``max_lag`` 초가 지나 복제본도 변경을 반영했을 시점인지 확인합니다."""
+        return time.time() - self.cleared_at >= max_lag
+
+    def store(
+        self, generation: int, skip: int, limit: int, body: bytes, total: int, cacheable: bool = True
+    ) -> CatalogPage:
+        page = CatalogPage(body=body, etag=f'"{hashlib.sha1(body).hexdigest()}"', total=total)
+        # 조회하는 동안 미션이 바뀌었다면 낡은 페이지를 캐시에 넣지 않습니다.
+        if cacheable and generation == self.generation:
+            self._pages[(skip, limit)] = page
+            self._pages.move_to_end((skip, limit))
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.cleared_at = time.time()
+        self._pages.clear()
+
+    async def invalidate(self) -> None:
+        self.clear()
+        await redis_client.publish(CHANNEL, "invalidate")
+
+    async def _on_message(self, message: str) -> None:
+        self.clear()
+
+    def start_sync(self) -> None:
+        redis_client.subscribe(CHANNEL, self._on_message)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더에 ``etag`` 가 들어 있는지 확인합니다 (약한 비교)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+mission_catalog = MissionCatalogCache(max_pages=settings.MISSION_CATALOG_MAX_PAGES)
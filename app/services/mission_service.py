@@ -1,23 +1,72 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, func, update, or_, and_
 from sqlalchemy.orm import selectinload
 from ..models.mission import Mission, MultipleChoiceMission, CodeSubmissionMission, MissionSubmission
 from ..schemas import mission as mission_schema
 from fastapi import HTTPException
 from typing import List, Tuple
-import sys
-from io import StringIO
+from pydantic import TypeAdapter
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from ..core.config import settings
+from ..core.grader import grader, GradingResult
+from ..core.verdict_cache import verdict_cache, verdict_key
+from ..db.session import AsyncSessionLocal
+from ..db.routing import is_replica_session
+from .submission_queue import submission_queue, SubmissionJob
+from .answer_key_index import answer_key_index
+from .mission_catalog import mission_catalog, CatalogPage
+from .mission_test_cases import mission_test_cases
+
+logger = logging.getLogger(__name__)
+
+_mission_list_adapter = TypeAdapter(List[mission_schema.MissionInDB])
+
+# 아직 채점 결과가 없는 제출 상태
+_UNFINISHED = ("pending", "grading")
+
+
+def _claimable():
+    """대기 중이거나, 채점을 맡은 워커가 죽어 오래 ``grading`` 에 머문 제출."""
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.SUBMISSION_GRADING_STALE_SECONDS)
+    return or_(
+        MissionSubmission.status == "pending",
+        and_(
+            MissionSubmission.status == "grading",
+            MissionSubmission.grading_started_at < stale_before,
+        ),
+    )
 
 class MissionService:
-    async def get_missions(self, db: AsyncSession) -> List[Mission]:
+    async def get_missions(self, db: AsyncSession, skip: int = 0, limit: int = 50) -> List[Mission]:
         result = await db.execute(
             select(Mission).options(
                 selectinload(Mission.multiple_choice),
                 selectinload(Mission.code_submission)
             )
+            .order_by(Mission.id)
+            .offset(skip)
+            .limit(limit)
         )
         return result.scalars().all()
 
+    async def get_mission_catalog_page(self, db: AsyncSession, skip: int = 0, limit: int = 50) -> CatalogPage:
+        """미션 목록 한 페이지를 직렬화된 JSON 바이트로 반환합니다. 캐시에 있으면 DB 를 조회하지 않습니다."""
+        page = mission_catalog.get(skip, limit)
+        if page is not None:
+            return page
+
+        generation = mission_catalog.generation
+        missions = await self.get_missions(db, skip, limit)
+        total = await db.scalar(select(func.count(Mission.id)))
+        body = _mission_list_adapter.dump_json(
+            [mission_schema.MissionInDB.model_validate(mission) for mission in missions]
+        )
+        # 복제본은 방금 바뀐 미션을 아직 모를 수 있으므로, 변경 직후에는 복제본에서 읽은 페이지를 캐시하지 않습니다.
+        cacheable = not is_replica_session(db) or mission_catalog.settled(settings.REPLICA_MAX_LAG_SECONDS)
+        return mission_catalog.store(generation, skip, limit, body, total, cacheable)
+
     async def retrieve_mission(self, db: AsyncSession, mission_id: int) -> Mission:
         result = await db.execute(
             select(Mission)
@@ -30,26 +79,27 @@ class MissionService:
         return mission
 
     async def submit_mission(self, db: AsyncSession, mission_id: int, user_id: int, submission: mission_schema.MissionSubmissionCreate) -> MissionSubmission:
-        mission = await self.retrieve_mission(db, mission_id)
+        # 객관식은 정답 색인만으로 채점하므로 미션 전체를 불러오지 않습니다.
+        correct_answer = await answer_key_index.get(db, mission_id)
+        if correct_answer is not None:
+            return await self._submit_multiple_choice(db, mission_id, correct_answer, user_id, submission)
 
-        if mission.type == "multiple_choice":
-            return await self._submit_multiple_choice(db, mission, user_id, submission)
-        elif mission.type == "code_submission":
+        mission = await self.retrieve_mission(db, mission_id)
+        if mission.type == "code_submission":
             return await self._submit_code(db, mission, user_id, submission)
         else:
             raise HTTPException(status_code=400, detail="Invalid mission type")
 
-    async def _submit_multiple_choice(self, db: AsyncSession, mission: Mission, user_id: int, submission: mission_schema.MissionSubmissionCreate) -> MissionSubmission:
+    async def _submit_multiple_choice(self, db: AsyncSession, mission_id: int, correct_answer: str, user_id: int, submission: mission_schema.MissionSubmissionCreate) -> MissionSubmission:
         selected_option = submission.multiple_choice.selected_option if submission.multiple_choice else None
         if not selected_option:
             raise HTTPException(status_code=400, detail="Selected option is required")
 
-        correct_option = mission.multiple_choice.correct_answer
-        is_correct = selected_option == correct_option
+        is_correct = selected_option == correct_answer
 
         mission_submission = MissionSubmission(
             user_id=user_id,
-            mission_id=mission.id,
+            mission_id=mission_id,
             submitted_answer=selected_option,
             is_correct=is_correct,
         )
@@ -58,56 +108,221 @@ class MissionService:
         await db.refresh(mission_submission)
         return mission_submission
 
+    async def submit_exam(self, db: AsyncSession, user_id: int, exam: mission_schema.ExamSubmissionCreate) -> mission_schema.ExamSubmissionResult:
+        mission_ids = [answer.mission_id for answer in exam.answers]
+        if len(set(mission_ids)) != len(mission_ids):
+            raise HTTPException(status_code=400, detail="Each mission can only be answered once per exam")
+
+        # 정답 색인에 없는 미션만 정답 컬럼을 한 번에 불러옵니다.
+        answer_key = await answer_key_index.get_many(db, mission_ids)
+        missing = [mission_id for mission_id in mission_ids if answer_key[mission_id] is None]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Multiple choice missions not found: {missing}")
+
+        rows = [
+            {
+                "user_id": user_id,
+                "mission_id": answer.mission_id,
+                "submitted_answer": answer.selected_option,
+                "is_correct": answer.selected_option == answer_key[answer.mission_id],
+            }
+            for answer in exam.answers
+        ]
+        # 답안 전체를 하나의 다중 행 INSERT 로 저장합니다.
+        result = await db.execute(
+            insert(MissionSubmission).returning(MissionSubmission.id, sort_by_parameter_order=True),
+            rows,
+        )
+        submission_ids = result.scalars().all()
+        await db.commit()
+
+        results = [
+            mission_schema.ExamAnswerResult(
+                submission_id=submission_id,
+                mission_id=row["mission_id"],
+                selected_option=row["submitted_answer"],
+                is_correct=row["is_correct"],
+            )
+            for submission_id, row in zip(submission_ids, rows)
+        ]
+        return mission_schema.ExamSubmissionResult(
+            total=len(results),
+            correct=sum(1 for item in results if item.is_correct),
+            results=results,
+        )
+
     async def _submit_code(self, db: AsyncSession, mission: Mission, user_id: int, submission: mission_schema.MissionSubmissionCreate) -> MissionSubmission:
         submitted_code = submission.submitted_answer
         if not submitted_code:
             raise HTTPException(status_code=400, detail="No code submitted.")
 
-        is_correct, output = self._execute_and_grade_code(mission.code_submission, submitted_code)
+        result, cached = await self._execute_and_grade_code(db, mission.code_submission, submitted_code)
 
         mission_submission = MissionSubmission(
             user_id=user_id,
             mission_id=mission.id,
             submitted_answer=submitted_code,
-            is_correct=is_correct,
         )
+        self._record_grading(mission_submission, result, cached)
         db.add(mission_submission)
         await db.commit()
         await db.refresh(mission_submission)
         return mission_submission
 
-    def _execute_and_grade_code(self, code_mission: CodeSubmissionMission, submitted_code: str) -> Tuple[bool, str]:
-        old_stdout = sys.stdout
-        redirected_output = sys.stdout = StringIO()
-
-        is_correct = True
-        output = ""
+    async def enqueue_code_submission(self, db: AsyncSession, mission_id: int, user_id: int, submission: mission_schema.MissionSubmissionCreate) -> mission_schema.MissionSubmissionStatus:
+        mission = await self.retrieve_mission(db, mission_id)
+        if mission.type != "code_submission":
+            raise HTTPException(status_code=400, detail="Only code submission missions can be graded asynchronously")
+        if not submission.submitted_answer:
+            raise HTTPException(status_code=400, detail="No code submitted.")
 
+        submission_queue.reserve(user_id)
         try:
-            exec(submitted_code)
+            mission_submission = MissionSubmission(
+                user_id=user_id,
+                mission_id=mission.id,
+                submitted_answer=submission.submitted_answer,
+                is_correct=False,
+                status="pending",
+            )
+            db.add(mission_submission)
+            await db.commit()
+            await db.refresh(mission_submission)
+        except Exception:
+            submission_queue.release(user_id)
+            raise
 
-            for test_case in code_mission.test_cases:
-                sys.stdin = StringIO(test_case["input"])
+        submission_queue.put(SubmissionJob(submission_id=mission_submission.id, user_id=user_id))
+        return self._to_status(mission_submission)
 
-                exec(submitted_code)
+    async def get_submission_status(self, db: AsyncSession, submission_id: int, user_id: int, wait: float = 0) -> mission_schema.MissionSubmissionStatus:
+        current = self._to_status(await self._get_own_submission(db, submission_id, user_id))
+        if current.status not in _UNFINISHED or wait <= 0:
+            return current
 
-                result = redirected_output.getvalue().strip()
-                if result != test_case["expected_output"].strip():
-                    is_correct = False
-                    output += f"Test case failed. Input: {test_case['input']}, Expected: {test_case['expected_output']}, Got: {result}\n"
+        # 기다리는 동안 DB 커넥션을 붙잡지 않도록 트랜잭션을 먼저 끝냅니다.
+        await db.rollback()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + min(wait, settings.SUBMISSION_LONG_POLL_TIMEOUT)
+        while current.status in _UNFINISHED and loop.time() < deadline:
+            # 다른 워커가 채점하는 제출도 있으므로 최대 1초마다 DB 를 다시 확인합니다.
+            await submission_queue.wait(submission_id, min(deadline - loop.time(), 1.0))
+            current = self._to_status(await self._get_own_submission(db, submission_id, user_id))
+            await db.rollback()
+        return current
 
-                redirected_output.truncate(0)
-                redirected_output.seek(0)
+    async def requeue_pending_submissions(self, db: AsyncSession) -> int:
+        """재시작이나 장애로 대기열에서 사라진 제출을 다시 넣고, 넣은 건수를 반환합니다.
 
-        except Exception as e:
-            is_correct = False
-            output = f"Error occurred: {str(e)}"
+        워커마다 시작할 때 호출하므로 같은 제출이 여러 대기열에 들어갈 수 있지만, 실제 채점은
+        ``process_queued_submission`` 에서 제출을 먼저 차지한 워커 하나만 합니다.
+        """
+        result = await db.execute(
+            select(MissionSubmission.id, MissionSubmission.user_id)
+            .where(_claimable())
+            .order_by(MissionSubmission.id)
+        )
+        rows = result.all()
+        for submission_id, user_id in rows:
+            submission_queue.requeue(SubmissionJob(submission_id=submission_id, user_id=user_id))
+        return len(rows)
 
-        finally:
-            sys.stdout = old_stdout
-            sys.stdin = sys.__stdin__
+    async def _claim_submission(self, db: AsyncSession, submission_id: int) -> bool:
+        """조건부 UPDATE 로 제출을 ``grading`` 으로 바꿉니다. 다른 워커가 먼저 차지했다면 False 입니다."""
+        result = await db.execute(
+            update(MissionSubmission)
+            .where(MissionSubmission.id == submission_id, _claimable())
+            .values(status="grading", grading_started_at=datetime.utcnow())
+        )
+        await db.commit()
+        return result.rowcount == 1
 
-        return is_correct, output
+    async def process_queued_submission(self, submission_id: int) -> None:
+        async with AsyncSessionLocal() as db:
+            if not await self._claim_submission(db, submission_id):
+                return
+            try:
+                await self._grade_claimed_submission(db, submission_id)
+            except Exception:
+                # 실패한 제출이 grading 에 남으면 상태 조회가 제한 시간까지 기다리게 되므로 error 로 끝냅니다.
+                # 대기열 자리는 SubmissionQueue 워커가 finally 에서 돌려줍니다.
+                logger.exception("Failed to grade submission %s", submission_id)
+                await db.rollback()
+                await db.execute(
+                    update(MissionSubmission)
+                    .where(MissionSubmission.id == submission_id)
+                    .values(status="error", is_correct=False)
+                )
+                await db.commit()
+
+    async def _grade_claimed_submission(self, db: AsyncSession, submission_id: int) -> None:
+        result = await db.execute(
+            select(MissionSubmission).where(MissionSubmission.id == submission_id)
+        )
+        mission_submission = result.scalar_one()
+        result = await db.execute(
+            select(CodeSubmissionMission).where(
+                CodeSubmissionMission.mission_id == mission_submission.mission_id
+            )
+        )
+        code_mission = result.scalar_one_or_none()
+        if code_mission is None:
+            mission_submission.status = "error"
+        else:
+            result, cached = await self._execute_and_grade_code(
+                db, code_mission, mission_submission.submitted_answer
+            )
+            self._record_grading(mission_submission, result, cached)
+            mission_submission.status = "completed"
+        await db.commit()
+
+    async def _get_own_submission(self, db: AsyncSession, submission_id: int, user_id: int) -> MissionSubmission:
+        result = await db.execute(
+            select(MissionSubmission).where(
+                MissionSubmission.id == submission_id, MissionSubmission.user_id == user_id
+            ).execution_options(populate_existing=True)
+        )
+        mission_submission = result.scalar_one_or_none()
+        if not mission_submission:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        return mission_submission
+
+    def _to_status(self, mission_submission: MissionSubmission) -> mission_schema.MissionSubmissionStatus:
+        return mission_schema.MissionSubmissionStatus(
+            id=mission_submission.id,
+            mission_id=mission_submission.mission_id,
+            status=mission_submission.status,
+            is_correct=(
+                None if mission_submission.status in _UNFINISHED else mission_submission.is_correct
+            ),
+            submitted_at=mission_submission.submitted_at,
+        )
+
+    async def _execute_and_grade_code(self, db: AsyncSession, code_mission: CodeSubmissionMission, submitted_code: str) -> Tuple[GradingResult, bool]:
+        """채점 결과와 캐시 적중 여부를 반환합니다."""
+        key = verdict_key(submitted_code, code_mission.test_cases_hash)
+        result = await verdict_cache.get(key)
+        if result is not None:
+            return result, True
+
+        # 제출 기록에는 정답 여부만 남기므로 첫 실패에서 채점을 멈춥니다.
+        test_cases = mission_test_cases.stream(db, code_mission.test_cases_hash)
+        result = await grader.grade(test_cases, submitted_code, fail_fast=True)
+        await verdict_cache.set(key, result)
+        return result, False
+
+    def _record_grading(self, mission_submission: MissionSubmission, result: GradingResult, cached: bool) -> None:
+        mission_submission.is_correct = result.is_correct
+        mission_submission.verdict_cached = cached
+        if cached:
+            # 캐시된 결과는 코드를 다시 실행하지 않았으므로 자원을 쓰지 않은 것으로 기록합니다.
+            mission_submission.cpu_time_ms = 0.0
+            mission_submission.wall_time_ms = 0.0
+            return
+        mission_submission.cpu_time_ms = round(result.cpu_time * 1000, 3)
+        mission_submission.wall_time_ms = round(result.wall_time * 1000, 3)
+        mission_submission.peak_memory_kb = result.peak_rss_kb
+        mission_submission.test_case_timings = result.test_case_timings
 
     async def create_mission(self, db: AsyncSession, mission: mission_schema.MissionCreate) -> Mission:
         new_mission = Mission(
@@ -127,17 +342,26 @@ class MissionService:
             )
             db.add(multiple_choice)
         elif mission.type == "code_submission" and mission.code_submission:
+            test_cases = [test_case.model_dump() for test_case in mission.code_submission.test_cases]
             code_submission = CodeSubmissionMission(
                 mission_id=new_mission.id,
                 problem_description=mission.code_submission.problem_description,
                 initial_code=mission.code_submission.initial_code,
-                test_cases=mission.code_submission.test_cases,
+                test_cases_hash=await mission_test_cases.save(db, test_cases),
+                test_case_count=len(test_cases),
             )
             db.add(code_submission)
 
         await db.commit()
         await db.refresh(new_mission)
-        
+        await answer_key_index.publish(
+            new_mission.id,
+            mission.multiple_choice.correct_answer
+            if mission.type == "multiple_choice" and mission.multiple_choice
+            else None,
+        )
+        await mission_catalog.invalidate()
+
         result = await db.execute(
             select(Mission)
             .options(selectinload(Mission.multiple_choice), selectinload(Mission.code_submission))
@@ -0,0 +1,61 @@
+from typing import AsyncIterator, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.verdict_cache import test_cases_version
+from ..models.mission import MissionTestCase
+
+
+class MissionTestCaseStore:
+    """내용 해시로 주소가 매겨지는 테스트 케이스 저장소.
+
+    같은 테스트 케이스 묶음은 한 번만 저장되고, 채점할 때에만 ``stream`` 으로 몇 건씩 나눠 읽습니다.
+    """
+
+    def __init__(self, batch_size: int = 100):
+        self.batch_size = batch_size
+
+    async def save(self, db: AsyncSession, test_cases: List[dict]) -> str:
+        """테스트 케이스를 저장하고 내용 해시를 반환합니다. 커밋은 호출한 쪽에서 합니다."""
+        suite_hash = test_cases_version(test_cases)
+        exists = await db.scalar(
+            select(MissionTestCase.id).where(MissionTestCase.suite_hash == suite_hash).limit(1)
+        )
+        if exists is None and test_cases:
+            # 같은 묶음으로 미션을 동시에 만들면 한쪽이 유니크 제약에 걸립니다. 내용이 같으므로
+            # 세이브포인트만 되돌리고 먼저 저장된 행을 씁니다.
+            try:
+                async with db.begin_nested():
+                    await db.execute(
+                        insert(MissionTestCase),
+                        [
+                            {
+                                "suite_hash": suite_hash,
+                                "position": position,
+                                "input": test_case["input"],
+                                "expected_output": test_case["expected_output"],
+                            }
+                            for position, test_case in enumerate(test_cases)
+                        ],
+                    )
+            except IntegrityError:
+                pass
+        return suite_hash
+
+    async def stream(self, db: AsyncSession, suite_hash: str) -> AsyncIterator[dict]:
+        result = await db.stream(
+            select(MissionTestCase.input, MissionTestCase.expected_output)
+            .where(MissionTestCase.suite_hash == suite_hash)
+            .order_by(MissionTestCase.position)
+            .execution_options(yield_per=self.batch_size)
+        )
+        try:
+            async for row in result:
+                yield {"input": row.input, "expected_output": row.expected_output}
+        finally:
+            await result.close()
+
+
+mission_test_cases = MissionTestCaseStore()
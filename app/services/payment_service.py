@@ -98,7 +98,9 @@ class PaymentService:
         return new_payment
 
     async def get_payment_history(self, db: AsyncSession, user_id: int) -> List[Payment]:
-        result = await db.execute(select(Payment).where(Payment.user_id == user_id))
+        result = await db.execute(
+            select(Payment).where(Payment.user_id == user_id).order_by(Payment.created_at.desc())
+        )
         return result.scalars().all()
 
     async def refund_payment(self, db: AsyncSession, user_id: int, payment_id: int) -> Payment:
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SubmissionJob:
+    submission_id: int
+    user_id: int
+
+
+class SubmissionQueue:
+    """비동기 채점 대기열 (프로세스 내 구현).
+
+    사용자별로 작업을 나눠 담고 라운드 로빈으로 꺼내므로, 한 사용자가 제출을 몰아 보내도
+    다른 사용자의 작업이 밀리지 않습니다. 전체 깊이와 사용자별 대기 수에 상한을 둡니다.
+    """
+
+    def __init__(self, max_depth: int, max_per_user: int):
+        self.max_depth = max_depth
+        self.max_per_user = max_per_user
+        self._jobs: Dict[int, Deque[SubmissionJob]] = {}
+        self._turns: Deque[int] = deque()
+        self._reserved: Dict[int, int] = {}
+        self._depth = 0
+        self._not_empty: Optional[asyncio.Event] = None
+        self._done: Dict[int, asyncio.Event] = {}
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def reserve(self, user_id: int) -> None:
+        """작업 한 건의 자리를 미리 잡습니다. 자리가 없으면 HTTPException 을 던집니다."""
+        if self._depth >= self.max_depth:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="채점 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": "5"},
+            )
+        if self._reserved.get(user_id, 0) >= self.max_per_user:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="채점 대기 중인 제출이 너무 많습니다.",
+                headers={"Retry-After": "5"},
+            )
+        self._reserved[user_id] = self._reserved.get(user_id, 0) + 1
+        self._depth += 1
+
+    def release(self, user_id: int) -> None:
+        remaining = self._reserved.get(user_id, 0) - 1
+        if remaining > 0:
+            self._reserved[user_id] = remaining
+        else:
+            self._reserved.pop(user_id, None)
+        self._depth = max(self._depth - 1, 0)
+
+    def put(self, job: SubmissionJob) -> None:
+        """``reserve`` 로 자리를 잡은 작업을 대기열에 넣습니다."""
+        if job.user_id not in self._jobs:
+            self._jobs[job.user_id] = deque()
+            self._turns.append(job.user_id)
+        self._jobs[job.user_id].append(job)
+        self._done.setdefault(job.submission_id, asyncio.Event())
+        if self._not_empty is not None:
+            self._not_empty.set()
+
+    def requeue(self, job: SubmissionJob) -> None:
+        """재시작 전에 이미 받아 둔 작업을 다시 넣습니다. 한 번 받아 준 제출이므로 상한을 검사하지 않습니다."""
+        self._reserved[job.user_id] = self._reserved.get(job.user_id, 0) + 1
+        self._depth += 1
+        self.put(job)
+
+    def _pop(self) -> Optional[SubmissionJob]:
+        if not self._turns:
+            return None
+        user_id = self._turns.popleft()
+        jobs = self._jobs[user_id]
+        job = jobs.popleft()
+        if jobs:
+            self._turns.append(user_id)
+        else:
+            del self._jobs[user_id]
+        return job
+
+    async def wait(self, submission_id: int, timeout: float) -> bool:
+        """이 워커에서 처리 중인 제출의 채점이 끝날 때까지 최대 ``timeout`` 초 기다립니다.
+
+        다른 워커가 맡은 제출이라면 알림을 받을 수 없으므로 ``timeout`` 만큼 쉬고 False 를 반환합니다.
+        """
+        event = self._done.get(submission_id)
+        if event is None:
+            await asyncio.sleep(timeout)
+            return False
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _worker(self, handler: Callable[[int], Awaitable[None]]) -> None:
+        while True:
+            await self._not_empty.wait()
+            job = self._pop()
+            if job is None:
+                self._not_empty.clear()
+                continue
+            try:
+                await handler(job.submission_id)
+            except Exception:
+                logger.exception("Failed to grade submission %s", job.submission_id)
+            finally:
+                self.release(job.user_id)
+                event = self._done.pop(job.submission_id, None)
+                if event is not None:
+                    event.set()
+
+    def start(self, handler: Callable[[int], Awaitable[None]], concurrency: int) -> None:
+        # 이벤트 루프가 뜬 뒤에 Event 를 만들어야 실행 중인 루프에 묶입니다.
+        self._not_empty = asyncio.Event()
+        if self._turns:
+            self._not_empty.set()
+        for _ in range(concurrency):
+            self._workers.append(asyncio.create_task(self._worker(handler)))
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+
+submission_queue = SubmissionQueue(
+    max_depth=settings.SUBMISSION_QUEUE_MAX_DEPTH,
+    max_per_user=settings.SUBMISSION_QUEUE_MAX_PER_USER,
+)
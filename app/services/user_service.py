@@ -6,6 +6,8 @@ from ..schemas import user as user_schema
 from fastapi import HTTPException, status
 from ..core import security
 from ..core.config import settings
+from ..core.principal_cache import principal_cache
+from ..core.token_versions import token_versions
 import os
 from fastapi.responses import FileResponse
 
@@ -18,6 +20,7 @@ class UserService:
         stmt = update(User).where(User.id == current_user.id).values(**user_data)
         await db.execute(stmt)
         await db.commit()
+        await principal_cache.invalidate(current_user.username)
         await db.refresh(current_user)
         return current_user
 
@@ -27,6 +30,8 @@ class UserService:
         stmt = delete(User).where(User.id == current_user.id)
         await db.execute(stmt)
         await db.commit()
+        await principal_cache.invalidate(current_user.username)
+        await token_versions.bump(current_user.id)
 
     async def create_user(self, db: AsyncSession, user: user_schema.UserCreate) -> User:
         result = await db.execute(select(User).where(User.username == user.username))
@@ -34,7 +39,7 @@ class UserService:
         if db_user:
             raise HTTPException(status_code=400, detail="Username already registered")
 
-        hashed_password = security.get_password_hash(user.password)
+        hashed_password = await security.get_password_hash_async(user.password)
         email = user.email if user.email else f"{user.username}@example.com" 
         db_user = User(
             username=user.username,
@@ -0,0 +1,52 @@
+"""JWT 검증 캐시 마이크로벤치마크.
+
+같은 토큰을 반복해서 검증할 때 ``jwt.decode`` 와 ``VerifiedTokenCache.decode`` 의 비용을 비교합니다.
+
+    python benchmarks/bench_token_decode.py --iterations 20000
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 벤치마크만 돌릴 때에는 .env 없이도 설정을 불러올 수 있게 합니다.
+for name, value in {
+    "SECRET_KEY": "benchmark-secret",
+    "portone_store_id": "benchmark",
+    "portone_channel_group_id": "benchmark",
+    "portone_api_url": "http://localhost",
+}.items():
+    os.environ.setdefault(name, value)
+
+from jose import jwt  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.core.token_cache import VerifiedTokenCache  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    claims = {"uid": 1, "role": "STUDENT", "active": True, "ver": 0}
+    token = create_access_token("benchmark-user", timedelta(minutes=30), claims=claims)
+    cache = VerifiedTokenCache(settings.SECRET_KEY, [settings.ALGORITHM], max_size=1000)
+    cache.decode(token)
+
+    uncached = timeit.timeit(
+        lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]),
+        number=args.iterations,
+    )
+    cached = timeit.timeit(lambda: cache.decode(token), number=args.iterations)
+
+    print(f"jwt.decode            {uncached / args.iterations * 1e6:8.2f} us/op")
+    print(f"VerifiedTokenCache    {cached / args.iterations * 1e6:8.2f} us/op")
+    print(f"speedup               {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
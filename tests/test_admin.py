@@ -2,6 +2,8 @@ import pytest
 from httpx import AsyncClient
 import logging
 from app.models.user import User
+from app.models.mission import MissionSubmission
+from app.services.admin_service import AdminService
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -38,4 +40,20 @@ async def test_get_user_by_id(async_client: AsyncClient, admin_user: User, test_
     response = await async_client.get(f"/api/v1/admin/users/{user_id}", headers=headers)
     assert response.status_code == 200, f"Failed to get user: {response.text}"
     user = response.json()
-    assert user["id"] == user_id
\ No newline at end of file
+    assert user["id"] == user_id
+
+@pytest.mark.asyncio
+async def test_get_mission_grading_costs(db_session, test_user: User):
+    db_session.add_all([
+        MissionSubmission(user_id=test_user.id, mission_id=1, submitted_answer="a", cpu_time_ms=10.0, wall_time_ms=12.0, peak_memory_kb=1000),
+        MissionSubmission(user_id=test_user.id, mission_id=1, submitted_answer="b", cpu_time_ms=30.0, wall_time_ms=35.0, peak_memory_kb=3000),
+        MissionSubmission(user_id=test_user.id, mission_id=2, submitted_answer="c", cpu_time_ms=500.0, wall_time_ms=510.0, peak_memory_kb=2000),
+        MissionSubmission(user_id=test_user.id, mission_id=2, submitted_answer="c", cpu_time_ms=0.0, wall_time_ms=0.0, verdict_cached=True),
+    ])
+    await db_session.commit()
+
+    costs = await AdminService().get_mission_grading_costs(db_session)
+    assert [cost.mission_id for cost in costs] == [2, 1]
+    assert costs[0].submissions == 1
+    assert costs[1].avg_cpu_time_ms == 20.0
+    assert costs[1].max_peak_memory_kb == 3000
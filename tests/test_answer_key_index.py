@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.mission import Mission, MultipleChoiceMission, CodeSubmissionMission
+from app.services.answer_key_index import AnswerKeyIndex
+
+pytestmark = pytest.mark.asyncio
+
+
+async def create_missions(db_session: AsyncSession):
+    choice = Mission(course="TEST101", question="Q1", type="multiple_choice", exam_type="QUIZ")
+    code = Mission(course="TEST101", question="Q2", type="code_submission", exam_type="QUIZ")
+    db_session.add_all([choice, code])
+    await db_session.flush()
+    db_session.add(MultipleChoiceMission(mission_id=choice.id, options=["A", "B"], correct_answer="B"))
+    db_session.add(CodeSubmissionMission(mission_id=code.id, problem_description="p", test_cases_hash=""))
+    await db_session.commit()
+    return choice, code
+
+
+async def test_warm_loads_only_multiple_choice_answers(db_session: AsyncSession):
+    choice, code = await create_missions(db_session)
+    index = AnswerKeyIndex()
+    await index.warm(db_session)
+    assert len(index) == 1
+    assert await index.get(db_session, choice.id) == "B"
+
+
+async def test_unknown_missions_are_loaded_on_demand(db_session: AsyncSession):
+    choice, code = await create_missions(db_session)
+    index = AnswerKeyIndex()
+    answers = await index.get_many(db_session, [choice.id, code.id, 9999])
+    assert answers == {choice.id: "B", code.id: None, 9999: None}
+
+    # 존재하지 않는 미션은 기억하지 않아, 나중에 생성되면 다시 조회됩니다.
+    assert index._lookup(9999) == 0
+    assert index._lookup(code.id) != 0
+
+
+async def test_sync_message_updates_answer():
+    index = AnswerKeyIndex()
+    await index._on_message("7:C")
+    assert index._lookup(7) == ord("C")
+    await index.publish(7, "D")
+    assert index._lookup(7) == ord("D")
@@ -0,0 +1,111 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.models.courses import Certificate, Course, Enrollment, Lesson, LessonProgress
+from app.models.mission import MissionTestCase
+from app.models.user import User
+from app.schemas.courses import LessonProgressUpdate
+from app.services.certificate_service import CertificateService
+from app.services.course_service import CourseService
+from app.services.mission_test_cases import mission_test_cases
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def course(db_session: AsyncSession) -> Course:
+    course = Course(title="Python", description="basics", order=1)
+    db_session.add(course)
+    await db_session.commit()
+    return course
+
+
+def insert_before_commit(monkeypatch, db_session: AsyncSession, row_factory):
+    """확인 쿼리와 커밋 사이에 다른 요청이 같은 행을 먼저 저장한 상황을 만듭니다."""
+    other_sessions = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    commit = db_session.commit
+    state = {"inserted": False}
+
+    async def racing_commit():
+        if not state["inserted"]:
+            state["inserted"] = True
+            async with other_sessions() as other:
+                other.add(row_factory())
+                await other.commit()
+        await commit()
+
+    monkeypatch.setattr(db_session, "commit", racing_commit)
+
+
+async def count(db_session: AsyncSession, model, *conditions) -> int:
+    return await db_session.scalar(select(func.count()).select_from(model).where(*conditions))
+
+
+async def test_concurrent_enrollment_returns_conflict(
+    monkeypatch, db_session: AsyncSession, test_user: User, course: Course
+):
+    # 충돌 후 롤백으로 객체가 만료되므로 id 를 미리 꺼내 둡니다.
+    user_id, course_id = test_user.id, course.id
+    insert_before_commit(
+        monkeypatch, db_session, lambda: Enrollment(user_id=user_id, course_id=course_id)
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await CourseService().enroll_course(db_session, user_id, course_id)
+    assert exc_info.value.status_code == 409
+    assert await count(db_session, Enrollment, Enrollment.user_id == user_id) == 1
+
+
+async def test_concurrent_certificate_returns_conflict(
+    monkeypatch, db_session: AsyncSession, test_user: User, course: Course
+):
+    user_id, course_id = test_user.id, course.id
+    insert_before_commit(
+        monkeypatch,
+        db_session,
+        lambda: Certificate(user_id=user_id, course_id=course_id, certificate_number="first"),
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await CertificateService().issue_certificate(db_session, user_id, course_id)
+    assert exc_info.value.status_code == 409
+
+
+async def test_concurrent_lesson_progress_updates_existing_row(
+    monkeypatch, db_session: AsyncSession, test_user: User, course: Course
+):
+    lesson = Lesson(title="intro", content="", order=1, video_url="", course_id=course.id)
+    db_session.add(lesson)
+    await db_session.commit()
+    user_id, lesson_id = test_user.id, lesson.id
+
+    insert_before_commit(
+        monkeypatch,
+        db_session,
+        lambda: LessonProgress(lesson_id=lesson_id, user_id=user_id, last_watched_position=5),
+    )
+    progress = await CourseService().update_lesson_progress(
+        db_session, lesson_id, user_id,
+        LessonProgressUpdate(last_watched_position=42, is_completed=True),
+    )
+    assert progress.last_watched_position == 42
+    assert progress.is_completed
+    assert await count(db_session, LessonProgress, LessonProgress.lesson_id == lesson_id) == 1
+
+
+async def test_concurrent_test_case_save_reuses_existing_rows(
+    monkeypatch, db_session: AsyncSession
+):
+    test_cases = [{"input": "1 2", "expected_output": "3"}]
+    suite_hash = await mission_test_cases.save(db_session, test_cases)
+    await db_session.commit()
+
+    # 다른 요청이 같은 묶음을 먼저 저장했지만 이 요청의 확인 쿼리는 그 전에 실행된 상황입니다.
+    async def missed_scalar(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(db_session, "scalar", missed_scalar)
+    assert await mission_test_cases.save(db_session, test_cases) == suite_hash
+    await db_session.commit()
+    monkeypatch.undo()
+    assert await count(db_session, MissionTestCase, MissionTestCase.suite_hash == suite_hash) == 1
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.engine import InstrumentedQueuePool, create_engine_from_settings, engine_options, pool_options, pool_stats
+
+
+def test_echo_is_off_by_default():
+    assert engine_options("sqlite+aiosqlite:///./test.db")["echo"] is False
+
+
+def test_postgres_options(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr(settings, "DB_PREPARED_STATEMENT_CACHE_SIZE", 0)
+    options = engine_options("postgresql+asyncpg://user:pw@localhost/db")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {
+        "prepared_statement_cache_size": 0,
+        "server_settings": {"statement_timeout": "5000"},
+    }
+
+
+def test_pool_size_follows_environment_and_worker_budget(monkeypatch):
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    assert pool_options() == {"pool_size": 10, "max_overflow": 10}
+
+    # 4 개 워커가 연결 30 개를 나눠 쓰면 워커당 7 개입니다.
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 30)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    assert pool_options() == {"pool_size": 7, "max_overflow": 0}
+
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    assert pool_options() == {"pool_size": 3, "max_overflow": 4}
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_record_checkout_wait(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_SLOW_CHECKOUT_MS", 50)
+    engine = create_engine_from_settings(f"sqlite+aiosqlite:///{tmp_path}/pool.db", name="test")
+    try:
+        async def hold():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await asyncio.sleep(0.1)
+
+        # 연결이 하나뿐이므로 두 번째 요청은 첫 번째가 끝날 때까지 기다립니다.
+        await asyncio.gather(hold(), hold())
+        stats = pool_stats(engine)
+        assert stats["size"] == 1
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["slow_checkouts"] == 1
+        assert stats["wait_max_ms"] >= 50
+    finally:
+        await engine.dispose()
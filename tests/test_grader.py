@@ -0,0 +1,280 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.core.grader import CodeGrader, _Worker
+
+pytestmark = pytest.mark.asyncio
+
+TEST_CASES = [
+    {"input": "1 2", "expected_output": "3"},
+    {"input": "10 20", "expected_output": "30"},
+]
+
+
+@pytest.fixture
+async def code_grader():
+    grader = CodeGrader(max_workers=2, wall_time_limit=1.0, cpu_time_limit=1.0, memory_limit_mb=256)
+    yield grader
+    await grader.stop()
+
+
+async def test_grade_correct_submission(code_grader: CodeGrader):
+    code = "a, b = map(int, input().split())\nprint(a + b)"
+    result = await code_grader.grade(TEST_CASES, code)
+    assert result.is_correct, result.output
+
+
+async def test_grade_wrong_submission(code_grader: CodeGrader):
+    code = "a, b = map(int, input().split())\nprint(a - b)"
+    result = await code_grader.grade(TEST_CASES, code)
+    assert not result.is_correct
+    assert "Test case failed" in result.output
+
+
+async def test_grade_infinite_loop_times_out(code_grader: CodeGrader):
+    code = "try:\n    while True:\n        pass\nexcept Exception:\n    print(3)"
+    result = await code_grader.grade(TEST_CASES, code)
+    assert not result.is_correct
+    assert "time limit exceeded" in result.output
+
+
+async def test_concurrent_submissions_do_not_share_output(code_grader: CodeGrader):
+    correct = "a, b = map(int, input().split())\nprint(a + b)"
+    noisy = "print('noise')\nprint('noise')"
+    results = await asyncio.gather(
+        *[code_grader.grade(TEST_CASES, correct if i % 2 == 0 else noisy) for i in range(6)]
+    )
+    assert [r.is_correct for r in results] == [i % 2 == 0 for i in range(6)]
+
+
+async def test_syntax_error_is_reported_without_running(code_grader: CodeGrader):
+    result = await code_grader.grade(TEST_CASES, "print(")
+    assert not result.is_correct
+    assert result.output.startswith("Error occurred")
+    assert code_grader.stats()["workers"] == 0
+
+
+async def test_fail_fast_skips_remaining_test_cases():
+    grader = CodeGrader(max_workers=1, wall_time_limit=1.0, cpu_time_limit=1.0, memory_limit_mb=256, parallel=False)
+    code = "a, b = map(int, input().split())\nif a == 1:\n    print(0)\nelse:\n    while True:\n        pass"
+    try:
+        result = await grader.grade(TEST_CASES, code, fail_fast=True)
+    finally:
+        await grader.stop()
+    assert not result.is_correct
+    assert "Test case failed" in result.output
+    assert "time limit" not in result.output
+
+
+async def test_worker_is_recycled_after_max_jobs():
+    grader = CodeGrader(max_workers=1, wall_time_limit=1.0, cpu_time_limit=1.0, memory_limit_mb=256, max_jobs_per_worker=1)
+    code = "a, b = map(int, input().split())\nprint(a + b)"
+    try:
+        await grader.start()
+        first_pid = grader._workers[0].process.pid
+        assert (await grader.grade(TEST_CASES[:1], code)).is_correct
+        assert (await grader.grade(TEST_CASES[:1], code)).is_correct
+        # 교체 워커는 백그라운드에서 뜨므로 풀에 들어올 때까지 기다립니다.
+        while not grader._workers:
+            await asyncio.sleep(0.05)
+        assert grader._workers[0].process.pid != first_pid
+        stats = grader.stats()
+        assert stats["recycled"] == 2
+        assert stats["jobs"] == 2
+    finally:
+        await grader.stop()
+
+
+async def test_hung_worker_is_killed_and_replaced():
+    grader = CodeGrader(max_workers=1, wall_time_limit=0.2, cpu_time_limit=0.2, memory_limit_mb=256)
+    # 시그널 핸들러를 무력화해도 부모 쪽 제한 시간에 걸려 워커가 교체되어야 합니다.
+    code = "import signal, time\nsignal.signal(signal.SIGALRM, signal.SIG_IGN)\nsignal.signal(signal.SIGPROF, signal.SIG_IGN)\ntime.sleep(60)"
+    try:
+        result = await grader.grade(TEST_CASES[:1], code)
+        assert not result.is_correct
+        assert "time limit exceeded" in result.output
+        assert not result.cacheable
+
+        ok = await grader.grade(TEST_CASES[:1], "print(3)")
+        assert ok.is_correct
+        assert grader.stats()["timeouts"] == 1
+    finally:
+        await grader.stop()
+
+
+async def test_grading_reports_resource_usage(code_grader: CodeGrader):
+    code = "a, b = map(int, input().split())\nprint(sum(range(200000)) * 0 + a + b)"
+    result = await code_grader.grade(TEST_CASES, code)
+    assert result.is_correct, result.output
+    assert [t["index"] for t in result.test_case_timings] == [0, 1]
+    assert result.cpu_time > 0
+    assert result.wall_time >= result.test_case_timings[0]["wall_ms"] / 1000
+    assert result.peak_rss_kb > 0
+
+
+async def test_submission_cpu_budget_is_enforced():
+    grader = CodeGrader(
+        max_workers=1, wall_time_limit=2.0, cpu_time_limit=2.0, memory_limit_mb=256,
+        parallel=False, cpu_budget=0.3,
+    )
+    code = "import time\nend = time.process_time() + 0.2\nwhile time.process_time() < end:\n    pass\nprint(3)"
+    try:
+        result = await grader.grade(TEST_CASES * 3, code)
+    finally:
+        await grader.stop()
+    assert not result.is_correct
+    assert not result.cacheable
+    assert len(result.test_case_timings) < 6
+
+
+async def test_grade_accepts_streamed_test_cases():
+    grader = CodeGrader(max_workers=1, wall_time_limit=1.0, cpu_time_limit=1.0, memory_limit_mb=256, parallel=False)
+    pulled = []
+    closed = []
+
+    async def stream():
+        try:
+            for test_case in TEST_CASES * 40:
+                pulled.append(test_case)
+                yield test_case
+        finally:
+            closed.append(True)
+
+    try:
+        ok = await grader.grade(stream(), "a, b = map(int, input().split())\nprint(a + b)")
+        assert ok.is_correct, ok.output
+        assert len(ok.test_case_timings) == 80
+        assert ok.test_case_timings[-1]["index"] == 79
+
+        # 첫 배치에서 실패하면 나머지 케이스는 읽지도 않습니다.
+        pulled.clear()
+        wrong = await grader.grade(stream(), "print(0)", fail_fast=True)
+        assert not wrong.is_correct
+        assert len(pulled) < 80
+        # 다 읽지 않은 스트림도 채점이 끝나면 바로 닫혀야 합니다.
+        assert len(closed) == 2
+    finally:
+        await grader.stop()
+
+
+async def test_submission_cannot_read_environment_or_raise_memory_limit(code_grader: CodeGrader, monkeypatch):
+    monkeypatch.setenv("GRADER_TEST_SECRET", "do-not-leak")
+    code = (
+        "import os, resource\n"
+        "print(os.environ.get('GRADER_TEST_SECRET'))\n"
+        "soft, hard = resource.getrlimit(resource.RLIMIT_AS)\n"
+        "try:\n"
+        "    resource.setrlimit(resource.RLIMIT_AS, (-1, -1))\n"
+        "    print('raised')\n"
+        "except (ValueError, OSError):\n"
+        "    print(soft == hard)"
+    )
+    result = await code_grader.grade([{"input": "", "expected_output": "None\nTrue"}], code)
+    assert result.is_correct, result.output
+
+
+async def test_submission_cannot_tamper_with_the_next_submission():
+    grader = CodeGrader(max_workers=1, wall_time_limit=1.0, cpu_time_limit=1.0, memory_limit_mb=256)
+    # 다음 제출의 출력이 무엇이든 정답("3")이 되도록 print 와 math 모듈을 바꿔 둡니다.
+    tamper = (
+        "import builtins, math, sys\n"
+        "builtins.print = lambda *args, **kwargs: sys.stdout.write('3\\n')\n"
+        "math.sqrt = lambda x: 3\n"
+    )
+    try:
+        await grader.grade(TEST_CASES[:1], tamper)
+        wrong = await grader.grade(TEST_CASES[:1], "print('wrong answer')")
+        assert not wrong.is_correct
+        math_check = await grader.grade([{"input": "", "expected_output": "2.0"}], "import math\nprint(math.sqrt(4))")
+        assert math_check.is_correct, math_check.output
+        assert grader.stats()["crashes"] == 0
+    finally:
+        await grader.stop()
+
+
+async def test_forged_result_from_submission_is_rejected(tmp_path):
+    grader = CodeGrader(max_workers=1, wall_time_limit=1.0, cpu_time_limit=1.0, memory_limit_mb=256)
+    marker = tmp_path / "pwned"
+    # 결과 파이프에 pickle 과 정답처럼 꾸민 JSON 을 쓰고 바로 끝내는 제출입니다.
+    code = (
+        "import os, pickle, stat, json\n"
+        "class Exploit:\n"
+        f"    def __reduce__(self): return (open, ({str(marker)!r}, 'w'))\n"
+        "forged = json.dumps({'is_correct': True, 'output': ''}).encode()\n"
+        "for fd in range(3, 256):\n"
+        "    try:\n"
+        "        if stat.S_ISFIFO(os.fstat(fd).st_mode):\n"
+        "            os.write(fd, pickle.dumps(Exploit()) + forged)\n"
+        "    except OSError:\n"
+        "        pass\n"
+        "os._exit(0)"
+    )
+    try:
+        result = await grader.grade(TEST_CASES[:1], code)
+        assert not result.is_correct
+        assert not result.cacheable
+        assert not marker.exists()
+        assert (await grader.grade(TEST_CASES[:1], "print(3)")).is_correct
+        assert grader.stats()["crashes"] == 0
+    finally:
+        await grader.stop()
+
+
+async def test_unexpected_worker_error_replaces_the_worker(monkeypatch):
+    grader = CodeGrader(max_workers=1, wall_time_limit=1.0, cpu_time_limit=1.0, memory_limit_mb=256)
+    run = _Worker.run
+    calls = []
+
+    def broken_run(self, job, timeout):
+        calls.append(job)
+        if len(calls) == 1:
+            raise TypeError("boom")
+        return run(self, job, timeout)
+
+    monkeypatch.setattr(_Worker, "run", broken_run)
+    try:
+        result = await grader.grade(TEST_CASES[:1], "print(3)")
+        assert not result.is_correct
+        assert not result.cacheable
+        # 하나뿐인 워커를 잃지 않고 교체해야 다음 채점이 멈추지 않습니다.
+        ok = await asyncio.wait_for(grader.grade(TEST_CASES[:1], "print(3)"), 30)
+        assert ok.is_correct
+        assert grader.stats()["crashes"] == 1
+        assert grader.stats()["workers"] == 1
+    finally:
+        await grader.stop()
+
+
+async def test_grade_fails_fast_when_no_worker_can_be_spawned(monkeypatch):
+    grader = CodeGrader(max_workers=1, wall_time_limit=1.0, cpu_time_limit=1.0, memory_limit_mb=256)
+    spawn = grader._spawn
+    try:
+        await grader.start()
+
+        def broken_spawn():
+            raise RuntimeError("grader worker failed to start")
+
+        monkeypatch.setattr(grader, "_spawn", broken_spawn)
+        grader._workers[0].process.kill()
+        crashed = await grader.grade(TEST_CASES[:1], "print(3)")
+        assert not crashed.is_correct
+        for _ in range(100):
+            if grader.stats()["respawn_failures"]:
+                break
+            await asyncio.sleep(0.05)
+
+        # 빈 대기열에서 멈추지 않고 바로 503 으로 거절해야 합니다.
+        with pytest.raises(HTTPException) as exc_info:
+            await asyncio.wait_for(grader.grade(TEST_CASES[:1], "print(3)"), 5)
+        assert exc_info.value.status_code == 503
+
+        # 다시 띄울 수 있게 되면 백오프 후 풀이 회복됩니다.
+        monkeypatch.setattr(grader, "_spawn", spawn)
+        for _ in range(200):
+            if grader.stats()["workers"]:
+                break
+            await asyncio.sleep(0.05)
+        ok = await asyncio.wait_for(grader.grade(TEST_CASES[:1], "print(3)"), 30)
+        assert ok.is_correct
+    finally:
+        await grader.stop()
@@ -0,0 +1,48 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import password_hasher as hasher_module
+from app.core.login_limiter import LoginLimiter, SlidingWindowLimiter, login_limiter
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_sliding_window_reopens_after_window():
+    limiter = SlidingWindowLimiter("test", limit=2, window=60)
+    assert limiter._hit_local("k", 0) is None
+    assert limiter._hit_local("k", 10) is None
+    assert limiter._hit_local("k", 20) == 40
+    assert limiter._hit_local("k", 61) is None
+
+
+async def test_ip_and_username_limits_are_counted():
+    limiter = LoginLimiter(username_limit=2, ip_limit=3, window=60)
+    await limiter.check("alice", "10.0.0.1")
+    await limiter.check("alice", "10.0.0.1")
+    with pytest.raises(HTTPException) as exc_info:
+        await limiter.check("Alice", "10.0.0.1")
+    assert exc_info.value.status_code == 429
+    assert "Retry-After" in exc_info.value.headers
+
+    with pytest.raises(HTTPException):
+        await limiter.check("bob", "10.0.0.1")
+    assert limiter.stats() == {"allowed": 2, "blocked_username": 1, "blocked_ip": 1}
+
+
+async def test_blocked_login_does_no_hashing(db_session: AsyncSession, test_user: User, monkeypatch):
+    login_limiter.clear()
+    monkeypatch.setattr(login_limiter.by_username, "limit", 2)
+    service = AuthService()
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await service.authenticate_user(db_session, test_user.username, "wrong", client_ip="10.0.0.2")
+        assert exc_info.value.status_code == 401
+
+    jobs = hasher_module.password_hasher.metrics.jobs
+    with pytest.raises(HTTPException) as exc_info:
+        await service.authenticate_user(db_session, test_user.username, "strongpassword", client_ip="10.0.0.2")
+    assert exc_info.value.status_code == 429
+    assert hasher_module.password_hasher.metrics.jobs == jobs
+    login_limiter.clear()
@@ -1,12 +1,26 @@
 import pytest
 import uuid
 from httpx import AsyncClient
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.models.courses import Course
-from app.models.mission import Mission, MultipleChoiceMission, MissionSubmission
+from app.models.mission import Mission, MultipleChoiceMission, MissionSubmission, MissionTestCase
+import json
+from app.schemas.mission import ExamSubmissionCreate, MissionCreate
+from app.services.mission_service import MissionService
+from app.services.answer_key_index import answer_key_index
+from app.services.mission_catalog import mission_catalog, etag_matches
+from app.services.mission_test_cases import mission_test_cases
 from tests.conftest import admin_authorized_client
 
+@pytest.fixture(autouse=True)
+def clear_answer_key_index():
+    # 테스트마다 DB 를 새로 만들어 미션 id 가 재사용되므로 색인을 비웁니다.
+    answer_key_index.clear()
+    mission_catalog.clear()
+
+
 @pytest.fixture
 async def test_course(db_session: AsyncSession):
     course = Course(
@@ -112,4 +126,80 @@ async def test_submit_mission(authorized_client: AsyncClient, test_mission: Miss
     
     assert submission is not None
     assert submission.is_correct == True
-    assert submission.submitted_answer == "A"
\ No newline at end of file
+    assert submission.submitted_answer == "A"
+
+@pytest.mark.asyncio
+async def test_submit_exam_batch(db_session: AsyncSession, test_user: User):
+    missions = []
+    for correct_answer in ["A", "B", "C"]:
+        mission = Mission(course="EXAM101", question="Exam question", type="multiple_choice", exam_type="EXAM")
+        db_session.add(mission)
+        await db_session.flush()
+        db_session.add(MultipleChoiceMission(mission_id=mission.id, options=["A", "B", "C", "D"], correct_answer=correct_answer))
+        missions.append(mission)
+    await db_session.commit()
+
+    exam = ExamSubmissionCreate(answers=[
+        {"mission_id": missions[0].id, "selected_option": "A"},
+        {"mission_id": missions[1].id, "selected_option": "D"},
+        {"mission_id": missions[2].id, "selected_option": "C"},
+    ])
+    result = await MissionService().submit_exam(db_session, test_user.id, exam)
+
+    assert result.total == 3
+    assert result.correct == 2
+    assert [item.mission_id for item in result.results] == [mission.id for mission in missions]
+    assert [item.is_correct for item in result.results] == [True, False, True]
+
+    rows = await db_session.execute(select(MissionSubmission).where(MissionSubmission.user_id == test_user.id))
+    assert len(rows.scalars().all()) == 3
+
+
+@pytest.mark.asyncio
+async def test_mission_catalog_is_cached_and_invalidated(db_session: AsyncSession):
+    service = MissionService()
+    for i in range(3):
+        db_session.add(Mission(course="CAT101", question=f"Question {i}", type="multiple_choice", exam_type="QUIZ"))
+    await db_session.commit()
+
+    page = await service.get_mission_catalog_page(db_session, skip=0, limit=2)
+    assert page.total == 3
+    assert [m["question"] for m in json.loads(page.body)] == ["Question 0", "Question 1"]
+    assert await service.get_mission_catalog_page(db_session, skip=0, limit=2) is page
+    assert etag_matches(f'W/{page.etag}', page.etag)
+
+    await service.create_mission(db_session, MissionCreate(
+        course="CAT101", question="Question 3", type="multiple_choice", exam_type="QUIZ",
+        multiple_choice={"options": ["A", "B"], "correct_answer": "A"},
+    ))
+    refreshed = await service.get_mission_catalog_page(db_session, skip=0, limit=2)
+    assert refreshed is not page
+    assert refreshed.total == 4
+    assert refreshed.etag == page.etag
+    assert json.loads((await service.get_mission_catalog_page(db_session, skip=2, limit=2)).body)[1]["question"] == "Question 3"
+
+
+@pytest.mark.asyncio
+async def test_code_mission_test_cases_are_stored_out_of_row(db_session: AsyncSession):
+    service = MissionService()
+    test_cases = [{"input": str(i), "expected_output": str(i * 2)} for i in range(5)]
+    created = []
+    for question in ["Double it", "Double it again"]:
+        created.append(await service.create_mission(db_session, MissionCreate(
+            course="CODE101", question=question, type="code_submission", exam_type="QUIZ",
+            code_submission={"problem_description": "double", "test_cases": test_cases},
+        )))
+
+    # 같은 테스트 케이스 묶음은 한 번만 저장됩니다.
+    first, second = (mission.code_submission for mission in created)
+    assert first.test_cases_hash == second.test_cases_hash
+    assert first.test_case_count == 5
+    assert await db_session.scalar(select(func.count(MissionTestCase.id))) == 5
+
+    page = await service.get_mission_catalog_page(db_session)
+    listed = json.loads(page.body)[0]["code_submission"]
+    assert "test_cases" not in listed
+    assert listed["test_case_count"] == 5
+
+    streamed = [case async for case in mission_test_cases.stream(db_session, first.test_cases_hash)]
+    assert streamed == test_cases
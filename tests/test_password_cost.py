@@ -0,0 +1,85 @@
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core import password_cost as password_cost_module
+from app.core.config import settings
+from app.core.password_cost import (
+    apply_bcrypt_rounds, calibrate_bcrypt_rounds, configure_password_cost, current_bcrypt_rounds,
+)
+from app.core.security import password_needs_rehash, pwd_context, verify_password
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def restore_rounds():
+    rounds = current_bcrypt_rounds()
+    yield
+    apply_bcrypt_rounds(rounds)
+
+
+async def test_calibration_stays_within_bounds():
+    assert calibrate_bcrypt_rounds(target_ms=0, min_rounds=4, max_rounds=8) == 4
+    assert calibrate_bcrypt_rounds(target_ms=60_000, min_rounds=4, max_rounds=8) == 8
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = {}
+        self.expires = {}
+
+    async def get(self, key):
+        return self.keys.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = str(value).encode()
+        self.expires[key] = ex
+        return True
+
+
+async def test_shared_calibration_expires_and_follows_settings(monkeypatch, restore_rounds):
+    redis = FakeRedis()
+    monkeypatch.setattr(password_cost_module, "get_redis", lambda: redis)
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", None)
+    monkeypatch.setattr(settings, "BCRYPT_CALIBRATE_ON_STARTUP", True)
+    monkeypatch.setattr(settings, "BCRYPT_TARGET_MS", 0)
+    monkeypatch.setattr(settings, "BCRYPT_MIN_ROUNDS", 4)
+    monkeypatch.setattr(settings, "BCRYPT_MAX_ROUNDS", 5)
+
+    assert await configure_password_cost() == 4
+    [key] = redis.keys
+    assert redis.expires[key] == settings.BCRYPT_CALIBRATION_TTL
+
+    # 보정 조건이 바뀌면 이전에 공유한 값을 따르지 않고 다시 보정합니다.
+    monkeypatch.setattr(settings, "BCRYPT_MIN_ROUNDS", 5)
+    assert await configure_password_cost() == 5
+    assert len(redis.keys) == 2
+
+
+async def test_login_rehashes_outdated_hash_in_background(db_session: AsyncSession, restore_rounds):
+    apply_bcrypt_rounds(4)
+    user = User(username="rehash_user", email="rehash@example.com", hashed_password=pwd_context.hash("pw"))
+    db_session.add(user)
+    await db_session.commit()
+
+    apply_bcrypt_rounds(5)
+    assert password_needs_rehash(user.hashed_password)
+
+    background_tasks = BackgroundTasks()
+    await AuthService().authenticate_user(db_session, "rehash_user", "pw", background_tasks)
+    assert len(background_tasks.tasks) == 1
+
+    # 응답 뒤에 실행되는 작업을 별도 세션으로 직접 돌립니다.
+    task = background_tasks.tasks[0]
+    session_factory = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    await task.func(*task.args, session_factory=session_factory)
+
+    await db_session.refresh(user)
+    assert not password_needs_rehash(user.hashed_password)
+    assert user.hashed_password.startswith("$2b$05$")
+    assert verify_password("pw", user.hashed_password)
@@ -0,0 +1,51 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from app.core.password_hasher import PasswordHasher
+from app.core.security import get_password_hash, get_password_hash_async, verify_password, verify_password_async
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_async_hash_round_trip():
+    hashed = await get_password_hash_async("secret")
+    assert await verify_password_async("secret", hashed)
+    assert not await verify_password_async("wrong", hashed)
+
+
+async def test_hashing_does_not_block_event_loop():
+    hashed = get_password_hash("secret")
+    hasher = PasswordHasher(max_workers=2, max_pending=10)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.ensure_future(ticker())
+    try:
+        await asyncio.gather(*[hasher.run(verify_password, "secret", hashed) for _ in range(4)])
+    finally:
+        task.cancel()
+        hasher.shutdown()
+    assert ticks > 1
+    stats = hasher.stats()
+    assert stats["jobs"] == 4
+    assert stats["queue_wait_max_ms"] > 0
+
+
+async def test_requests_beyond_pending_limit_are_rejected():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    try:
+        first = asyncio.ensure_future(hasher.run(time.sleep, 0.2))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher.run(time.sleep, 0)
+        assert exc_info.value.status_code == 503
+        await first
+    finally:
+        hasher.shutdown()
+    assert hasher.stats()["rejected"] == 1
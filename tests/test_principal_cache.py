@@ -0,0 +1,72 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import DetachedInstanceError
+from app.api.dependencies import get_current_user
+from app.core.principal_cache import PrincipalCache, _dump_user, _load_user, principal_cache
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+from app.schemas.user import UserUpdate
+from app.services.admin_service import AdminService
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+
+
+async def test_cached_user_keeps_column_values(test_user: User):
+    cache = PrincipalCache(max_size=10, ttl=60)
+    await cache.set(test_user)
+    cached = await cache.get(test_user.username)
+    assert cached is not test_user
+    assert cached.id == test_user.id
+    assert cached.role == UserRole.STUDENT
+    assert "hashed_password" not in inspect(cached).dict
+    with pytest.raises(DetachedInstanceError):
+        cached.hashed_password
+
+
+async def test_password_hash_is_not_cached(test_user: User):
+    values = _dump_user(test_user)
+    assert "hashed_password" not in values
+    assert values["username"] == test_user.username
+    # 이전에 저장된 항목에 해시가 있어도 불러온 객체에는 들어가지 않습니다.
+    loaded = _load_user({**values, "hashed_password": test_user.hashed_password})
+    assert "hashed_password" not in inspect(loaded).dict
+
+
+async def test_expired_entries_are_dropped(test_user: User):
+    cache = PrincipalCache(max_size=10, ttl=0)
+    await cache.set(test_user)
+    assert await cache.get(test_user.username) is None
+
+
+async def test_current_user_is_served_from_cache(db_session: AsyncSession, test_user: User):
+    token = create_access_token(test_user.username)
+    await get_current_user(token, db_session)
+
+    # DB 를 직접 바꿔도 캐시된 값이 쓰이므로 조회가 일어나지 않았음을 알 수 있습니다.
+    await db_session.execute(update(User).where(User.id == test_user.id).values(nickname="changed"))
+    await db_session.commit()
+    user = await get_current_user(token, db_session)
+    assert user.nickname == test_user.nickname
+    assert principal_cache.stats()["hits"] >= 1
+
+
+async def test_update_and_delete_invalidate_cache(db_session: AsyncSession, admin_user: User, test_user: User):
+    token = create_access_token(test_user.username)
+    await get_current_user(token, db_session)
+
+    await AdminService().update_user(db_session, test_user.id, UserUpdate(nickname="renamed"))
+    assert (await get_current_user(token, db_session)).nickname == "renamed"
+
+    user = await get_current_user(token, db_session)
+    await UserService().delete_user(db_session, user)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(token, db_session)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,106 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.courses import Certificate, Course, Enrollment, LessonProgress
+from app.models.payment import Payment
+from app.schemas.courses import LessonProgressUpdate
+from app.services.certificate_service import CertificateService
+from app.services.course_service import CourseService
+from app.services.payment_service import PaymentService
+
+pytestmark = pytest.mark.asyncio
+
+USERS = 500
+COURSES = 10
+# 이 테이블들은 사용자별 조회만 하므로 전체 스캔이 나오면 인덱스가 빠진 것입니다.
+HOT_TABLES = {"enrollments", "lesson_progress", "certificates", "payments"}
+
+
+@pytest.fixture
+async def seeded(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/plans.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Course), [
+            {"id": course_id, "title": f"Course {course_id}", "description": "", "order": course_id}
+            for course_id in range(1, COURSES + 1)
+        ])
+        pairs = [(user_id, course_id) for user_id in range(1, USERS + 1) for course_id in range(1, COURSES + 1)]
+        await conn.execute(insert(Enrollment), [{"user_id": u, "course_id": c} for u, c in pairs])
+        await conn.execute(insert(LessonProgress), [{"user_id": u, "lesson_id": c} for u, c in pairs])
+        await conn.execute(insert(Certificate), [
+            {"user_id": u, "course_id": c, "issue_date": datetime.utcnow(), "certificate_number": uuid.uuid4().hex}
+            for u, c in pairs
+        ])
+        await conn.execute(insert(Payment), [
+            {
+                "user_id": u,
+                "course_id": c,
+                "amount": 1000,
+                "method": "card",
+                "created_at": datetime.utcnow() - timedelta(minutes=c),
+                "imp_uid": uuid.uuid4().hex,
+                "merchant_uid": uuid.uuid4().hex,
+            }
+            for u, c in pairs
+        ])
+        await conn.exec_driver_sql("ANALYZE")
+    yield engine
+    await engine.dispose()
+
+
+async def capture_plans(engine, call) -> list:
+    """서비스 호출이 실행한 SELECT 마다 EXPLAIN QUERY PLAN 결과를 모읍니다."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+            try:
+                await call(db)
+            except HTTPException:
+                pass
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append((statement, [row[-1] for row in result]))
+    return plans
+
+
+def full_scans(plans) -> list:
+    return [
+        (statement, detail)
+        for statement, details in plans
+        for detail in details
+        if detail.startswith("SCAN ") and "INDEX" not in detail and detail.split()[1] in HOT_TABLES
+    ]
+
+
+@pytest.mark.parametrize("name, call", [
+    ("enroll_course", lambda db: CourseService().enroll_course(db, 5, 1)),
+    ("get_course_roadmap", lambda db: CourseService().get_course_roadmap(db, 5)),
+    (
+        "update_lesson_progress",
+        lambda db: CourseService().update_lesson_progress(db, 1, 5, LessonProgressUpdate(last_watched_position=30)),
+    ),
+    ("get_lesson_progress", lambda db: CourseService().get_lesson_progress(db, 1, 5)),
+    ("issue_certificate", lambda db: CertificateService().issue_certificate(db, 5, 1)),
+    ("get_payment_history", lambda db: PaymentService().get_payment_history(db, 5)),
+])
+async def test_hot_lookups_use_indexes(seeded, name, call):
+    plans = await capture_plans(seeded, call)
+    assert plans, f"{name} ran no queries"
+    assert full_scans(plans) == [], f"{name} fell back to a full table scan"
@@ -0,0 +1,90 @@
+import uuid
+from datetime import datetime
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.db.query_stats import count_queries, query_budget, query_stats_middleware, route_query_metrics
+from app.models.courses import Certificate, Course
+from app.models.user import User
+from app.services.certificate_service import CertificateService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_verify_certificate_uses_one_query(db_session: AsyncSession, test_user: User):
+    course = Course(title="Budget", description="", order=1)
+    db_session.add(course)
+    await db_session.flush()
+    certificate = Certificate(
+        user_id=test_user.id, course_id=course.id, issue_date=datetime.utcnow(), certificate_number=uuid.uuid4().hex
+    )
+    db_session.add(certificate)
+    await db_session.commit()
+
+    with query_budget(1):
+        verification = await CertificateService().verify_certificate(db_session, certificate.certificate_number)
+    assert verification.course_title == "Budget"
+    assert verification.user_name == test_user.nickname
+
+
+async def test_query_budget_reports_statements(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/budget.db")
+    try:
+        with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+            with query_budget(1):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                    await conn.execute(text("SELECT 2"))
+    finally:
+        await engine.dispose()
+
+
+async def test_failed_statements_do_not_leak_start_times(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/errors.db")
+    try:
+        with count_queries() as stats:
+            async with engine.connect() as conn:
+                for _ in range(3):
+                    with pytest.raises(OperationalError):
+                        await conn.execute(text("SELECT * FROM missing"))
+                await conn.execute(text("SELECT 1"))
+                raw = await conn.get_raw_connection()
+                assert raw.info.get("query_started_at") == []
+        assert stats.count == 4
+    finally:
+        await engine.dispose()
+
+
+async def test_middleware_counts_queries_and_flags_repeats(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/middleware.db")
+    app = FastAPI()
+    app.middleware("http")(query_stats_middleware)
+    route_query_metrics.clear()
+
+    @app.get("/items/{count}")
+    async def items(count: int):
+        async with engine.connect() as conn:
+            for i in range(count):
+                await conn.execute(text("SELECT :i"), {"i": i})
+        return {}
+
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/items/2")
+            assert response.headers["X-DB-Query-Count"] == "2"
+            assert float(response.headers["X-DB-Time-Ms"]) >= 0
+            assert "X-DB-N-Plus-One" not in response.headers
+
+            response = await client.get("/items/6")
+            assert response.headers["X-DB-N-Plus-One"] == "6"
+
+        metrics = route_query_metrics.snapshot()["GET /items/{count}"]
+        assert metrics["requests"] == 2
+        assert metrics["max_queries"] == 6
+        assert metrics["n_plus_one"] == 1
+    finally:
+        await engine.dispose()
+
@@ -0,0 +1,112 @@
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.routing import STICKY_COOKIE, PrimarySession, ReplicaRouter, is_replica_session, read_your_writes_middleware
+from app.models.courses import Course
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    """같은 스키마를 가진 SQLite 두 개를 주 DB 와 복제본으로 씁니다. 과정은 주 DB 에만 있습니다."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/primary.db")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    primary_sessions = sessionmaker(primary, class_=AsyncSession, sync_session_class=PrimarySession, expire_on_commit=False)
+    async with primary_sessions() as db:
+        db.add(Course(title="Primary only", description="", order=1))
+        await db.commit()
+    yield primary_sessions, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+async def read_titles(router: ReplicaRouter, primary_sessions) -> list:
+    async with primary_sessions() as primary:
+        async with router.session_for_read(primary) as db:
+            return list((await db.scalars(select(Course.title))).all())
+
+
+async def test_reads_go_to_healthy_replica(databases):
+    primary_sessions, replica = databases
+    router = ReplicaRouter(replica, max_lag=5, check_interval=60)
+    assert await read_titles(router, primary_sessions) == []
+    assert router.stats()["replica_reads"] == 1
+
+
+async def test_without_replica_reads_use_primary(databases):
+    primary_sessions, _ = databases
+    router = ReplicaRouter(None, max_lag=5, check_interval=60)
+    assert await read_titles(router, primary_sessions) == ["Primary only"]
+
+
+async def test_lagging_or_failing_replica_falls_back_to_primary(databases, tmp_path):
+    primary_sessions, replica = databases
+    router = ReplicaRouter(replica, max_lag=5, check_interval=60)
+    await router.check()
+    router.lag = 30.0
+    assert await read_titles(router, primary_sessions) == ["Primary only"]
+
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+    router = ReplicaRouter(broken, max_lag=5, check_interval=60)
+    assert await read_titles(router, primary_sessions) == ["Primary only"]
+    assert router.stats()["healthy"] is False
+    await broken.dispose()
+
+
+async def test_replica_failure_during_read_retries_on_primary(databases, tmp_path):
+    primary_sessions, _ = databases
+    # 연결과 상태 확인은 되지만 테이블이 없어 조회가 실패하는 복제본입니다.
+    empty = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/empty.db")
+    router = ReplicaRouter(empty, max_lag=5, check_interval=60)
+    async with primary_sessions() as primary:
+        async with router.session_for_read(primary) as db:
+            assert is_replica_session(db)
+            assert list((await db.scalars(select(Course.title))).all()) == ["Primary only"]
+            assert not is_replica_session(db)
+            assert await db.scalar(select(Course.title)) == "Primary only"
+    stats = router.stats()
+    assert stats["healthy"] is False
+    assert stats["fallbacks"] == 1
+    assert await read_titles(router, primary_sessions) == ["Primary only"]
+    await empty.dispose()
+
+
+async def test_commit_makes_following_reads_sticky_to_primary(databases):
+    primary_sessions, replica = databases
+    router = ReplicaRouter(replica, max_lag=5, check_interval=60)
+    app = FastAPI()
+    app.middleware("http")(read_your_writes_middleware)
+
+    async def get_db():
+        async with primary_sessions() as db:
+            yield db
+
+    async def get_read_db(db: AsyncSession = Depends(get_db)):
+        async with router.session_for_read(db) as session:
+            yield session
+
+    @app.post("/courses")
+    async def create_course(db: AsyncSession = Depends(get_db)):
+        db.add(Course(title="Just written", description="", order=1))
+        await db.commit()
+
+    @app.get("/courses")
+    async def list_courses(db: AsyncSession = Depends(get_read_db)):
+        return {"replica": is_replica_session(db)}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/courses")).json() == {"replica": True}
+        response = await client.post("/courses")
+        assert STICKY_COOKIE in response.cookies
+        assert (await client.get("/courses")).json() == {"replica": False}
+
+        client.cookies.clear()
+        assert (await client.get("/courses")).json() == {"replica": True}
@@ -0,0 +1,108 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_current_principal
+from app.core.session_store import session_store
+from app.core.token_blacklist import token_blacklist
+from app.core.token_versions import token_versions
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def clear_sessions():
+    session_store.clear()
+    token_versions.clear()
+    token_blacklist.clear()
+
+
+async def login(db_session: AsyncSession, user: User) -> dict:
+    return await AuthService().authenticate_user(db_session, user.username, "strongpassword", user_agent="pytest")
+
+
+async def test_refresh_rotates_refresh_token(db_session: AsyncSession, test_user: User):
+    tokens = await login(db_session, test_user)
+    rotated = await AuthService().refresh_token(db_session, tokens["refresh_token"])
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    principal = await get_current_principal(rotated["access_token"], db_session)
+    assert principal.id == test_user.id
+    assert principal.session_id is not None
+
+    # 새 토큰은 다시 교체할 수 있습니다.
+    await AuthService().refresh_token(db_session, rotated["refresh_token"])
+
+
+async def test_reused_refresh_token_ends_session(db_session: AsyncSession, test_user: User):
+    tokens = await login(db_session, test_user)
+    rotated = await AuthService().refresh_token(db_session, tokens["refresh_token"])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await AuthService().refresh_token(db_session, tokens["refresh_token"])
+    assert exc_info.value.status_code == 401
+
+    # 재사용이 감지되면 정상 토큰을 가진 쪽도 세션을 잃습니다.
+    with pytest.raises(HTTPException):
+        await AuthService().refresh_token(db_session, rotated["refresh_token"])
+    assert await session_store.list_sessions(test_user.id) == []
+
+
+async def test_access_token_is_not_a_refresh_token(db_session: AsyncSession, test_user: User):
+    tokens = await login(db_session, test_user)
+    with pytest.raises(HTTPException) as exc_info:
+        await AuthService().refresh_token(db_session, tokens["access_token"])
+    assert exc_info.value.status_code == 401
+
+
+async def test_list_and_revoke_sessions(db_session: AsyncSession, test_user: User):
+    first = await login(db_session, test_user)
+    second = await login(db_session, test_user)
+    principal = await get_current_principal(second["access_token"], db_session)
+
+    sessions = await AuthService().list_sessions(test_user.id, principal.session_id)
+    assert len(sessions) == 2
+    assert sessions[0].current and sessions[0].user_agent == "pytest"
+    assert not sessions[1].current
+
+    await AuthService().revoke_session(test_user.id, sessions[1].id)
+    with pytest.raises(HTTPException):
+        await AuthService().refresh_token(db_session, first["refresh_token"])
+    with pytest.raises(HTTPException) as exc_info:
+        await AuthService().revoke_session(test_user.id, sessions[1].id)
+    assert exc_info.value.status_code == 404
+
+
+async def test_revoked_session_access_token_is_rejected(db_session: AsyncSession, test_user: User):
+    revoked = await login(db_session, test_user)
+    kept = await login(db_session, test_user)
+    # 같은 세션에서 refresh 로 받은 이전 액세스 토큰도 함께 거부되어야 합니다.
+    rotated = await AuthService().refresh_token(db_session, revoked["refresh_token"])
+    principal = await get_current_principal(rotated["access_token"], db_session)
+
+    await AuthService().revoke_session(test_user.id, principal.session_id)
+    for token in (revoked["access_token"], rotated["access_token"]):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_principal(token, db_session)
+        assert exc_info.value.status_code == 401
+    [introspection] = await AuthService().introspect_tokens(db_session, [rotated["access_token"]])
+    assert not introspection.active
+
+    # 다른 세션의 토큰은 그대로 쓸 수 있습니다.
+    assert (await get_current_principal(kept["access_token"], db_session)).id == test_user.id
+
+
+async def test_logout_all_revokes_sessions_and_access_tokens(db_session: AsyncSession, test_user: User):
+    tokens = await login(db_session, test_user)
+    await AuthService().logout_all(test_user.id)
+
+    assert await session_store.list_sessions(test_user.id) == []
+    with pytest.raises(HTTPException):
+        await AuthService().refresh_token(db_session, tokens["refresh_token"])
+    with pytest.raises(HTTPException):
+        await get_current_principal(tokens["access_token"], db_session)
+
+    # 이후 로그인은 새 버전으로 정상 동작합니다.
+    fresh = await login(db_session, test_user)
+    assert (await get_current_principal(fresh["access_token"], db_session)).id == test_user.id
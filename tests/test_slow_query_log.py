@@ -0,0 +1,104 @@
+import json
+import logging
+import uuid
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.query_stats import count_queries
+from app.db.slow_query_log import SlowQueryLog, redact, slow_query_log
+from app.models.payment import Payment
+from app.services.payment_service import PaymentService
+
+
+@pytest.fixture
+async def payments_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/slow.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Payment), [{
+            "user_id": 7, "course_id": 1, "amount": 1000, "method": "card",
+            "imp_uid": uuid.uuid4().hex, "merchant_uid": uuid.uuid4().hex,
+        }])
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def log_everything(monkeypatch):
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    slow_query_log.start()
+    yield slow_query_log
+    await slow_query_log.stop()
+
+
+def slow_entries(caplog) -> list:
+    return [
+        json.loads(record.getMessage()[len("Slow query "):])
+        for record in caplog.records
+        if record.name == "app.db.slow_query_log" and record.getMessage().startswith("Slow query ")
+    ]
+
+
+def test_redact_keeps_only_numbers():
+    assert redact((7, "secret", None, b"xx", 1.5)) == [7, "<str len=6>", None, "<bytes len=2>", 1.5]
+
+
+@pytest.mark.asyncio
+async def test_slow_query_entry_has_service_route_and_plan(payments_engine, log_everything, caplog):
+    caplog.set_level(logging.WARNING, logger="app.db.slow_query_log")
+    async with sessionmaker(payments_engine, class_=AsyncSession)() as db:
+        with count_queries(route="GET /payments/history"):
+            payments = await PaymentService().get_payment_history(db, 7)
+    assert len(payments) == 1
+    await log_everything.drain()
+
+    entry = next(entry for entry in slow_entries(caplog) if "FROM payments" in entry["statement"])
+    assert entry["service"] == "PaymentService.get_payment_history"
+    assert entry["route"] == "GET /payments/history"
+    assert entry["parameters"] == [7]
+    assert "ix_payments_user_id_created_at" in entry["plan"]
+    assert entry["duration_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_parameters_are_redacted_and_explain_is_not_logged(payments_engine, log_everything, caplog):
+    caplog.set_level(logging.WARNING, logger="app.db.slow_query_log")
+    async with payments_engine.connect() as conn:
+        await conn.execute(text("SELECT :password AS p"), {"password": "hunter2"})
+    await log_everything.drain()
+
+    entries = slow_entries(caplog)
+    assert [entry["parameters"] for entry in entries] == [["<str len=7>"]]
+    assert "hunter2" not in caplog.text
+    assert entries[0]["service"] is None
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_entries(payments_engine):
+    log = SlowQueryLog(threshold_ms=0, explain=False, queue_size=1)
+    log.start()
+    try:
+        log.record(payments_engine.sync_engine, "SELECT 1", (), 0.1)
+        log.record(payments_engine.sync_engine, "SELECT 2", (), 0.1)
+        assert log.dropped == 1
+        await log.drain()
+        assert log.stats()["recorded"] == 1
+    finally:
+        await log.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_is_logged_without_leaking_start_time(payments_engine, log_everything, caplog):
+    caplog.set_level(logging.WARNING, logger="app.db.slow_query_log")
+    async with payments_engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("SELECT * FROM missing WHERE id = :id"), {"id": 1})
+        raw = await conn.get_raw_connection()
+        assert raw.info.get("slow_query_started_at") == []
+    await log_everything.drain()
+
+    entry = next(entry for entry in slow_entries(caplog) if "FROM missing" in entry["statement"])
+    assert entry["error"] == "OperationalError"
@@ -0,0 +1,179 @@
+import pytest
+from fastapi import HTTPException
+from app.services.submission_queue import SubmissionQueue, SubmissionJob
+
+pytestmark = pytest.mark.asyncio
+
+
+def enqueue(queue: SubmissionQueue, submission_id: int, user_id: int):
+    queue.reserve(user_id)
+    queue.put(SubmissionJob(submission_id=submission_id, user_id=user_id))
+
+
+async def test_queue_is_fair_across_users():
+    queue = SubmissionQueue(max_depth=100, max_per_user=10)
+    # user 1 이 먼저 여러 건을 몰아서 넣어도 user 2 의 작업이 바로 뒤따라야 합니다.
+    for submission_id in range(1, 5):
+        enqueue(queue, submission_id, user_id=1)
+    enqueue(queue, 100, user_id=2)
+
+    processed = []
+
+    async def handler(submission_id: int):
+        processed.append(submission_id)
+
+    queue.start(handler, concurrency=1)
+    assert await queue.wait(4, timeout=1.0)
+    await queue.stop()
+
+    assert processed == [1, 100, 2, 3, 4]
+    assert queue.depth == 0
+
+
+async def test_queue_rejects_when_user_limit_reached():
+    queue = SubmissionQueue(max_depth=100, max_per_user=2)
+    enqueue(queue, 1, user_id=1)
+    enqueue(queue, 2, user_id=1)
+    with pytest.raises(HTTPException) as exc_info:
+        queue.reserve(1)
+    assert exc_info.value.status_code == 429
+
+    # 다른 사용자는 여전히 제출할 수 있어야 합니다.
+    enqueue(queue, 3, user_id=2)
+
+
+async def test_queue_rejects_when_full():
+    queue = SubmissionQueue(max_depth=2, max_per_user=10)
+    enqueue(queue, 1, user_id=1)
+    enqueue(queue, 2, user_id=2)
+    with pytest.raises(HTTPException) as exc_info:
+        queue.reserve(3)
+    assert exc_info.value.status_code == 503
+
+
+async def test_requeue_ignores_limits_for_already_accepted_jobs():
+    queue = SubmissionQueue(max_depth=1, max_per_user=1)
+    queue.requeue(SubmissionJob(submission_id=1, user_id=1))
+    queue.requeue(SubmissionJob(submission_id=2, user_id=1))
+    assert queue.depth == 2
+
+    processed = []
+
+    async def handler(submission_id: int):
+        processed.append(submission_id)
+
+    queue.start(handler, concurrency=1)
+    assert await queue.wait(2, timeout=1.0)
+    await queue.stop()
+    assert processed == [1, 2]
+    assert queue.depth == 0
+
+
+async def test_pending_submissions_are_requeued_on_startup(db_session, monkeypatch):
+    from app.models.mission import MissionSubmission
+    from app.services import mission_service
+    from app.services.mission_service import MissionService
+
+    queue = SubmissionQueue(max_depth=10, max_per_user=10)
+    monkeypatch.setattr(mission_service, "submission_queue", queue)
+    db_session.add_all([
+        MissionSubmission(user_id=1, mission_id=1, submitted_answer="print(1)", status="pending"),
+        MissionSubmission(user_id=1, mission_id=1, submitted_answer="print(2)", status="completed"),
+        MissionSubmission(user_id=2, mission_id=1, submitted_answer="print(3)", status="pending"),
+    ])
+    await db_session.commit()
+
+    assert await MissionService().requeue_pending_submissions(db_session) == 2
+    assert queue.depth == 2
+    assert [queue._pop().submission_id for _ in range(2)] == [1, 3]
+
+
+@pytest.fixture
+async def queued_service(db_session, monkeypatch):
+    """테스트 DB 를 쓰는 대기열 워커와 코드 제출 미션을 준비합니다."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import sessionmaker
+    from app.models.mission import CodeSubmissionMission, Mission
+    from app.services import mission_service
+    from app.services.mission_service import MissionService
+
+    queue = SubmissionQueue(max_depth=10, max_per_user=10)
+    sessions = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(mission_service, "submission_queue", queue)
+    monkeypatch.setattr(mission_service, "AsyncSessionLocal", sessions)
+    mission = Mission(course="python", question="add", type="code_submission", exam_type="final")
+    db_session.add(mission)
+    await db_session.flush()
+    db_session.add(
+        CodeSubmissionMission(
+            mission_id=mission.id, problem_description="add", test_cases_hash="0" * 64
+        )
+    )
+    await db_session.commit()
+
+    service = MissionService()
+    queue.start(service.process_queued_submission, concurrency=1)
+    yield service, mission.id, queue, sessions
+    await queue.stop()
+
+
+async def test_queued_submission_is_graded_end_to_end(queued_service, monkeypatch):
+    from app.core import grader as grader_module
+    from app.core.grader import GradingResult
+    from app.core.verdict_cache import verdict_cache
+    from app.schemas.mission import MissionSubmissionCreate
+
+    service, mission_id, queue, sessions = queued_service
+    verdict_cache.clear()
+
+    async def fake_grade(test_cases, submitted_code, fail_fast=False):
+        return GradingResult(submitted_code == "print(3)", "")
+
+    monkeypatch.setattr(grader_module.grader, "grade", fake_grade)
+    async with sessions() as db:
+        submission = MissionSubmissionCreate(submitted_answer="print(3)")
+        accepted = await service.enqueue_code_submission(db, mission_id, 1, submission)
+        assert accepted.status == "pending" and accepted.is_correct is None
+        final = await service.get_submission_status(db, accepted.id, 1, wait=5)
+    assert final.status == "completed"
+    assert final.is_correct is True
+    assert queue.depth == 0
+
+
+async def test_failed_grading_marks_submission_as_error(queued_service, monkeypatch):
+    from app.core import grader as grader_module
+    from app.core.verdict_cache import verdict_cache
+    from app.schemas.mission import MissionSubmissionCreate
+
+    service, mission_id, queue, sessions = queued_service
+    verdict_cache.clear()
+
+    async def broken_grade(test_cases, submitted_code, fail_fast=False):
+        raise RuntimeError("grader is down")
+
+    monkeypatch.setattr(grader_module.grader, "grade", broken_grade)
+    async with sessions() as db:
+        submission = MissionSubmissionCreate(submitted_answer="print(4)")
+        accepted = await service.enqueue_code_submission(db, mission_id, 1, submission)
+        final = await service.get_submission_status(db, accepted.id, 1, wait=5)
+    assert final.status == "error"
+    assert final.is_correct is False
+    assert queue.depth == 0
+
+
+async def test_submission_is_graded_by_only_one_worker(db_session, monkeypatch):
+    from app.models.mission import MissionSubmission
+    from app.services.mission_service import MissionService
+
+    submission = MissionSubmission(
+        user_id=1, mission_id=1, submitted_answer="print(1)", status="pending"
+    )
+    db_session.add(submission)
+    await db_session.commit()
+
+    service = MissionService()
+    # 여러 워커가 시작하며 같은 제출을 다시 넣어도 차지는 한 번만 성공합니다.
+    assert await service._claim_submission(db_session, submission.id)
+    assert not await service._claim_submission(db_session, submission.id)
+    await db_session.refresh(submission)
+    assert submission.status == "grading"
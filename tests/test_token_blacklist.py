@@ -0,0 +1,103 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_current_user
+from app.core import token_blacklist as blacklist_module
+from app.core.token_blacklist import BloomFilter, TokenBlacklist, token_blacklist
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+pytestmark = pytest.mark.asyncio
+
+
+class UnreachableRedis:
+    async def exists(self, key):
+        raise ConnectionError("redis is down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("redis is down")
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = {}
+
+    async def set(self, key, value, ex=None):
+        self.keys[key] = value
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+    async def scan_iter(self, match, count):
+        for key in list(self.keys):
+            if key.startswith(match.rstrip("*")):
+                yield key.encode()
+
+
+async def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(size_bits=1 << 16, hash_count=5)
+    values = [f"jti-{i}" for i in range(1000)]
+    for value in values:
+        bloom.add(value)
+    assert all(value in bloom for value in values)
+    assert sum(f"other-{i}" in bloom for i in range(1000)) < 50
+
+
+async def test_unknown_tokens_skip_the_lookup():
+    blacklist = TokenBlacklist(bloom_size_bits=1 << 16, bloom_hash_count=5, fail_hard=False)
+    await blacklist.revoke("revoked", expires_in=60)
+    assert await blacklist.is_revoked("revoked")
+    assert not await blacklist.is_revoked("fresh")
+    assert blacklist.stats()["lookups"] == 1
+
+
+@pytest.mark.parametrize("fail_hard", [True, False])
+async def test_redis_failure_follows_configuration(monkeypatch, fail_hard):
+    blacklist = TokenBlacklist(bloom_size_bits=1 << 16, bloom_hash_count=5, fail_hard=fail_hard)
+    blacklist._bloom.add("maybe-revoked")
+    # 구독과 함께 필터를 채운 상태를 흉내 냅니다.
+    blacklist._filter_synced = True
+    monkeypatch.setattr(blacklist_module, "get_redis", lambda: UnreachableRedis())
+    assert await blacklist.is_revoked("maybe-revoked") is fail_hard
+    # 필터에 없는 토큰은 Redis 장애와 상관없이 통과합니다.
+    assert not await blacklist.is_revoked("fresh")
+
+
+async def test_filter_is_bypassed_until_rewarmed_after_lost_subscription(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(blacklist_module, "get_redis", lambda: redis)
+    blacklist = TokenBlacklist(bloom_size_bits=1 << 16, bloom_hash_count=5, fail_hard=False)
+    await blacklist.warm()
+    assert blacklist.stats()["filter_synced"]
+
+    # 구독이 끊긴 사이 다른 워커가 폐기한 토큰은 pub/sub 으로 받지 못합니다.
+    blacklist._on_lost()
+    await redis.set(blacklist.prefix + "missed", "blacklisted")
+    assert await blacklist.is_revoked("missed")
+    assert blacklist.stats()["filtered"] == 0
+
+    # 다시 구독하며 채운 뒤에는 필터가 놓친 폐기를 알고 있습니다.
+    await blacklist.warm()
+    assert await blacklist.is_revoked("missed")
+    assert not await blacklist.is_revoked("fresh")
+    assert blacklist.stats()["filtered"] == 1
+
+
+async def test_revoke_reports_unavailable_when_redis_is_down(monkeypatch):
+    blacklist = TokenBlacklist(bloom_size_bits=1 << 16, bloom_hash_count=5, fail_hard=False)
+    monkeypatch.setattr(blacklist_module, "get_redis", lambda: UnreachableRedis())
+    with pytest.raises(HTTPException) as exc_info:
+        await blacklist.revoke("jti", expires_in=60)
+    assert exc_info.value.status_code == 503
+
+
+async def test_logout_revokes_access_token(db_session: AsyncSession, test_user: User):
+    token_blacklist.clear()
+    tokens = await AuthService().authenticate_user(db_session, test_user.username, "strongpassword")
+    access_token = tokens["access_token"]
+    assert (await get_current_user(access_token, db_session)).id == test_user.id
+
+    await AuthService().logout(access_token)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(access_token, db_session)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+import pytest
+from jose import JWTError
+from app.core.config import settings
+from app.core.security import create_access_token, decode_token
+from app.core.token_cache import VerifiedTokenCache
+
+
+def make_cache() -> VerifiedTokenCache:
+    return VerifiedTokenCache(settings.SECRET_KEY, [settings.ALGORITHM], max_size=2)
+
+
+def test_repeated_tokens_are_served_from_cache():
+    cache = make_cache()
+    token = create_access_token("cached-user")
+    first = cache.decode(token)
+    first["sub"] = "mutated"
+    assert cache.decode(token)["sub"] == "cached-user"
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_cache_is_bounded():
+    cache = make_cache()
+    for i in range(3):
+        cache.decode(create_access_token(f"user-{i}"))
+    assert cache.stats()["size"] == 2
+
+
+def test_expired_and_tampered_tokens_are_rejected():
+    cache = make_cache()
+    expiring = create_access_token("expiring-user", expires_delta=timedelta(seconds=1))
+    cache.decode(expiring)
+    # python-jose 는 초 단위로 비교하므로 만료 후 1초 넘게 기다립니다.
+    time.sleep(2.1)
+    with pytest.raises(JWTError):
+        cache.decode(expiring)
+
+    token = create_access_token("tampered-user")
+    cache.decode(token)
+    with pytest.raises(JWTError):
+        cache.decode(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+
+
+def test_decode_token_uses_shared_cache():
+    assert decode_token(create_access_token("shared-user")) == "shared-user"
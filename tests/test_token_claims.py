@@ -0,0 +1,60 @@
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import admin_required, get_current_principal, get_current_user
+from app.core.config import settings
+from app.core.security import create_access_token, principal_claims
+from app.core.token_versions import token_versions
+from app.models.user import User, UserRole
+from app.services.admin_service import AdminService
+from app.services.auth_service import AuthService
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def clear_token_versions():
+    token_versions.clear()
+
+
+async def test_login_embeds_principal_claims(db_session: AsyncSession, admin_user: User):
+    tokens = await AuthService().authenticate_user(db_session, admin_user.username, "adminpassword")
+    payload = jwt.decode(tokens["access_token"], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    assert payload["uid"] == admin_user.id
+    assert payload["role"] == "ADMIN"
+    assert payload["active"] is True
+    assert payload["ver"] == 0
+
+
+async def test_principal_is_built_from_claims_without_db(admin_user: User):
+    token = create_access_token(admin_user.username, claims=principal_claims(admin_user))
+    # 세션 없이도 인증이 끝나야 합니다.
+    principal = await get_current_principal(token, db=None)
+    assert principal.id == admin_user.id
+    assert principal.role == UserRole.ADMIN
+    assert await admin_required(principal) is principal
+
+
+async def test_tokens_without_claims_fall_back_to_user_lookup(db_session: AsyncSession, test_user: User):
+    token = create_access_token(test_user.username)
+    principal = await get_current_principal(token, db_session)
+    assert principal.id == test_user.id
+    with pytest.raises(HTTPException) as exc_info:
+        await admin_required(principal)
+    assert exc_info.value.status_code == 403
+
+
+async def test_revoking_tokens_rejects_older_versions(db_session: AsyncSession, test_user: User):
+    old_token = create_access_token(test_user.username, claims=principal_claims(test_user))
+    await AdminService().revoke_user_tokens(db_session, test_user.id)
+
+    for dependency in (get_current_principal, get_current_user):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependency(old_token, db_session)
+        assert exc_info.value.status_code == 401
+
+    new_token = create_access_token(
+        test_user.username, claims=principal_claims(test_user, await token_versions.get(test_user.id))
+    )
+    assert (await get_current_principal(new_token, db_session)).id == test_user.id
@@ -0,0 +1,82 @@
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import internal_key_required
+from app.core.config import settings
+from app.core.security import blacklist_token, create_access_token, create_refresh_token, principal_claims
+from app.core.token_blacklist import token_blacklist
+from app.core.token_versions import token_versions
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def clear_token_state():
+    token_blacklist.clear()
+    token_versions.clear()
+
+
+def access_token(user: User, **claims) -> str:
+    return create_access_token(user.username, claims={**principal_claims(user), **claims})
+
+
+async def test_introspects_batch_in_request_order(db_session: AsyncSession, test_user: User, admin_user: User):
+    revoked = access_token(test_user, sid="revoked")
+    await blacklist_token(jwt.get_unverified_claims(revoked)["jti"])
+    tokens = [
+        access_token(admin_user),
+        "not-a-token",
+        revoked,
+        create_refresh_token(test_user.username),
+        create_access_token(test_user.username),
+        access_token(test_user, sid="abc"),
+    ]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+    try:
+        results = await AuthService().introspect_tokens(db_session, tokens)
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+
+    assert [result.active for result in results] == [True, False, False, False, True, True]
+    assert results[0].uid == admin_user.id and results[0].role == "ADMIN"
+    assert results[4].uid == test_user.id
+    assert results[5].sid == "abc"
+    # 토큰 수와 상관없이 사용자는 쿼리 한 번으로 읽습니다.
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 1
+
+
+async def test_outdated_version_and_inactive_user_are_rejected(db_session: AsyncSession, test_user: User):
+    token = access_token(test_user)
+    await token_versions.bump(test_user.id)
+    assert not (await AuthService().introspect_tokens(db_session, [token]))[0].active
+
+    test_user.is_active = False
+    await db_session.commit()
+    fresh = create_access_token(test_user.username, claims=principal_claims(test_user, 1))
+    assert not (await AuthService().introspect_tokens(db_session, [fresh]))[0].active
+
+
+async def test_batch_size_is_limited(db_session: AsyncSession, test_user: User):
+    tokens = [access_token(test_user)] * (settings.INTROSPECTION_MAX_BATCH + 1)
+    with pytest.raises(HTTPException) as exc_info:
+        await AuthService().introspect_tokens(db_session, tokens)
+    assert exc_info.value.status_code == 413
+
+
+async def test_internal_key_is_required(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_KEY", None)
+    with pytest.raises(HTTPException):
+        await internal_key_required("anything")
+
+    monkeypatch.setattr(settings, "INTERNAL_API_KEY", "secret")
+    with pytest.raises(HTTPException) as exc_info:
+        await internal_key_required("wrong")
+    assert exc_info.value.status_code == 403
+    await internal_key_required("secret")
@@ -0,0 +1,45 @@
+import pytest
+from app.core import token_versions as versions_module
+from app.core.token_versions import TokenVersions
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = {}
+        self.reads = 0
+
+    async def get(self, key):
+        self.reads += 1
+        return self.keys.get(key)
+
+    async def mget(self, keys):
+        self.reads += 1
+        return [self.keys.get(key) for key in keys]
+
+
+async def test_versions_are_reloaded_after_lost_subscription(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(versions_module, "get_redis", lambda: redis)
+    versions = TokenVersions()
+    await versions.resync()
+    assert await versions.get(1) == 0
+
+    # 다른 워커가 버전을 올렸지만 이 워커는 메시지를 받지 못했습니다.
+    redis.keys[versions.prefix + "1"] = b"1"
+    assert await versions.get(1) == 0
+    # refresh 경로는 로컬 사본과 관계없이 Redis 의 값을 봅니다.
+    assert await versions.get(1, fresh=True) == 1
+
+    # 구독이 끊긴 동안에는 로컬 사본을 쓰지 않습니다.
+    versions._on_lost()
+    redis.keys[versions.prefix + "1"] = b"2"
+    assert await versions.get(1) == 2
+
+    # 다시 구독하면 Redis 에서 새로 읽은 값을 로컬 사본으로 씁니다.
+    await versions.resync()
+    reads = redis.reads
+    assert await versions.get(1) == 2
+    assert await versions.get_many([1]) == {1: 2}
+    assert redis.reads == reads
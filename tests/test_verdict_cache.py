@@ -0,0 +1,70 @@
+import pytest
+from app.core import grader as grader_module
+from app.core.grader import GradingResult
+from app.core.verdict_cache import VerdictCache, verdict_cache, verdict_key
+from app.core.verdict_cache import test_cases_version as suite_version
+from app.models.mission import CodeSubmissionMission
+from app.services.mission_service import MissionService
+
+pytestmark = pytest.mark.asyncio
+
+TEST_CASES = [{"input": "1 2", "expected_output": "3"}]
+
+
+async def test_key_ignores_line_endings_but_tracks_test_cases():
+    version = suite_version(TEST_CASES)
+    assert verdict_key("print(3)\r\n", version) == verdict_key("print(3)\n", version)
+
+    changed = suite_version([{"input": "1 2", "expected_output": "4"}])
+    assert verdict_key("print(3)", version) != verdict_key("print(3)", changed)
+
+
+async def test_cache_evicts_least_recently_used():
+    cache = VerdictCache(max_size=2, ttl=60)
+    await cache.set("a", GradingResult(True, ""))
+    await cache.set("b", GradingResult(True, ""))
+    assert await cache.get("a") is not None
+    await cache.set("c", GradingResult(False, ""))
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert await cache.get("c") is not None
+
+
+async def test_cache_skips_uncacheable_results():
+    cache = VerdictCache(max_size=2, ttl=60)
+    await cache.set("a", GradingResult(False, "Error occurred: time limit exceeded", cacheable=False))
+    assert await cache.get("a") is None
+
+
+async def test_resubmission_is_served_from_cache(monkeypatch, db_session):
+    calls = []
+
+    async def fake_grade(test_cases, submitted_code, fail_fast=False):
+        calls.append(submitted_code)
+        return GradingResult(True, "")
+
+    monkeypatch.setattr(grader_module.grader, "grade", fake_grade)
+    verdict_cache.clear()
+    code_mission = CodeSubmissionMission(problem_description="add", test_cases_hash=suite_version(TEST_CASES))
+    service = MissionService()
+
+    result, cached = await service._execute_and_grade_code(db_session, code_mission, "print(3)")
+    assert result.is_correct and not cached
+    result, cached = await service._execute_and_grade_code(db_session, code_mission, "print(3)\r\n")
+    assert result.is_correct and cached
+    assert len(calls) == 1
+
+
+async def test_local_entries_expire_after_ttl(monkeypatch):
+    from app.core import verdict_cache as verdict_cache_module
+
+    now = [1000.0]
+    monkeypatch.setattr(verdict_cache_module.time, "monotonic", lambda: now[0])
+    cache = VerdictCache(max_size=2, ttl=60)
+    await cache.set("a", GradingResult(True, ""))
+    now[0] += 59
+    assert await cache.get("a") is not None
+    now[0] += 2
+    assert await cache.get("a") is None
+    assert cache.stats()["size"] == 0